@@ -1,9 +1,13 @@
 from flask import Flask, request, Response
 from flask_cors import CORS
-from api.src.UAVPathPlanner import UAVPathPlanner
-from api.src.area_detection.PointData import PointData
-import ee
+from api.src.UAVPathPlanner import UAVPathPlanner, STRATEGIES
+from api.src.area_detection.PointBatch import PointBatch
+from api.src.area_detection.Projection import Projection
+from api.src.artifacts.ArtifactVerbosity import ArtifactVerbosity
+from api.src.area_detection.LocalEdgeDetector import LocalEdgeDetector
+from api.src.area_detection.AreaDetectionController import DEFAULT_TILE_CACHE_DIRECTORY
 import os
+import math
 import matplotlib
 import json
 
@@ -15,7 +19,43 @@ CORS(app, origins=["http://localhost:3000"])
 
 os.makedirs('static', exist_ok=True)
 
-uav_path_planner = UAVPathPlanner()
+# debug images can be enabled with ARTIFACT_VERBOSITY=summary or ARTIFACT_VERBOSITY=per_tile
+# edge map fragments are cached in ~/.cache/uav-route-planning/tiles unless TILE_CACHE_DIRECTORY is set
+# edges can be detected offline from Sentinel-2 scenes on disk with LOCAL_EDGE_SCENES=<path of JSON file> containing
+# {"periods": [[scene paths of the period]], "origin_x": meters, "origin_y": meters, "resolution": 10}
+local_edge_detector = None
+if os.environ.get('LOCAL_EDGE_SCENES'):
+    with open(os.environ['LOCAL_EDGE_SCENES']) as scenes_file:
+        scenes = json.load(scenes_file)
+    local_edge_detector = LocalEdgeDetector(scenes['periods'], scenes['origin_x'], scenes['origin_y'],
+                                            scenes.get('resolution', 10))
+uav_path_planner = UAVPathPlanner(ArtifactVerbosity[os.environ.get('ARTIFACT_VERBOSITY', 'none').upper()],
+                                  local_edge_detector,
+                                  os.environ.get('TILE_CACHE_DIRECTORY', DEFAULT_TILE_CACHE_DIRECTORY))
+
+def get_fleet_error(fleet) -> str:
+    """ Returns why the fleet of the request can't be planned, None if every vehicle can fly """
+    if not isinstance(fleet, list) or len(fleet) == 0:
+        return "Fleet has to contain at least one vehicle"
+    for index, vehicle in enumerate(fleet):
+        try:
+            velocity, travel_time = float(vehicle['velocity']), float(vehicle['time'])
+        except (KeyError, TypeError, ValueError):
+            return "Vehicle " + str(index) + " needs numeric velocity and time"
+        # zero velocity or time would give NaN times of the paths
+        if not (math.isfinite(velocity) and velocity > 0 and math.isfinite(travel_time) and travel_time > 0):
+            return "Vehicle " + str(index) + " needs positive velocity and time"
+    return None
+
+def get_strategy_error(data: dict) -> str:
+    """ Returns why the coverage strategy of the request can't be used, None if it can """
+    strategy = data.get('strategy', 'greedy')
+    if strategy not in STRATEGIES:
+        return "Unknown coverage strategy " + json.dumps(strategy) + ", expected one of " + ", ".join(STRATEGIES)
+    # parameters are swept only for the greedy planner
+    if data.get('sweep') is not None and strategy != 'greedy':
+        return "Parameter sweep can be used only with greedy strategy"
+    return None
 
 @app.route('/')
 def hello_world():
@@ -24,26 +64,58 @@ def hello_world():
 @app.route('/waypoints', methods=['POST'])
 def start_area_detection():
     data = request.get_json()
+    # fleet and strategy are checked before the area is detected, so the request fails fast
+    request_error = get_fleet_error(data['fleet']) if 'fleet' in data else get_strategy_error(data)
+    if request_error is not None:
+        return Response(json.dumps({"error": request_error}), status=400, mimetype='application/json')
     waypoints = [marker['position'] for marker in data['waypoints']]
 
-    points = []
-    
-    projection = ee.Projection('EPSG:3035')
+    projection = Projection('EPSG:3035')
+
+    # all waypoints are stored in one batch and transformed together
+    points = PointBatch([(waypoint['lng'], waypoint['lat']) for waypoint in waypoints], projection)
+    print(points.get_coordinates_degrees())
 
-    for waypoint in waypoints:
-        points.append(PointData(waypoint['lng'], waypoint['lat'], projection))
+    # tolerance in meters of the contour simplification, default of the planner is used if it isn't passed
+    detected_area_boundary = uav_path_planner.detect_area(points, data.get('simplification_tolerance'))
+    # optional zones with weights, waypoints with lower weight are visited earlier
+    priority_zones = [(PointBatch([(vertex['lng'], vertex['lat']) for vertex in zone['polygon']], projection),
+                       float(zone['weight'])) for zone in data.get('priority_zones', [])]
 
-    for point in points:
-        print(point.get_coordinates_degrees())
+    if 'fleet' in data:
+        # several UAVs given as [{velocity, time}], area is split between them
+        vehicle_paths = uav_path_planner.plan_fleet(points, [(float(vehicle['velocity']), float(vehicle['time']))
+                                                             for vehicle in data['fleet']], priority_zones)
+        vehicles = [{"path": path, "time_travelled": time_travelled} for path, time_travelled in vehicle_paths]
+        return_data = {
+            "area": detected_area_boundary,
+            "path": vehicles[0]["path"] if len(vehicles) > 0 else [],
+            "time_travelled": vehicles[0]["time_travelled"] if len(vehicles) > 0 else 0,
+            "vehicles": vehicles,
+            "vertices": dict(zip(("before", "after"), uav_path_planner.get_vertex_counts()))
+        }
+        return Response(json.dumps(return_data), mimetype='application/json')
 
-    detected_area_boundary = uav_path_planner.detect_area(points)
-    planned_path, time_travelled = uav_path_planner.plan_path(points, data['velocity'], data['time'])
+    # coverage strategy, greedy nearest waypoint search is used by default
+    # optional sweep: {budget: seconds, table: bool}, greedy planner is run with many parameters and the best is used
+    sweep = data.get('sweep')
+    planned_path, time_travelled = uav_path_planner.plan_path(points, data['velocity'], data['time'], priority_zones,
+                                                              data.get('strategy', 'greedy'),
+                                                              sweep_budget=None if sweep is None
+                                                              else float(sweep.get('budget', 10)))
 
     return_data = {
         "area": detected_area_boundary,
         "path": planned_path,
-        "time_travelled": time_travelled
+        "time_travelled": time_travelled,
+        "length_saved": uav_path_planner.get_saved_length(),
+        "grid_angles": uav_path_planner.get_grid_angles(),
+        "vertices": dict(zip(("before", "after"), uav_path_planner.get_vertex_counts()))
     }
+    sweep_table = uav_path_planner.get_sweep_table()
+    if sweep is not None and len(sweep_table) > 0:
+        # parameters of the best run, the whole trade-off table only if it is requested
+        return_data["sweep"] = {"best": sweep_table[0], "table": sweep_table if sweep.get('table', False) else None}
 
     return Response(json.dumps(return_data), mimetype='application/json')
 
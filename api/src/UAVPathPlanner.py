@@ -1,32 +1,90 @@
+import copy
 import ee
 import time
-from .area_detection.AreaDetectionController import AreaDetectionController
-from .area_detection.PointData import PointData
+from .area_detection.AreaDetectionController import AreaDetectionController, DEFAULT_TILE_CACHE_DIRECTORY
+from .area_detection.PointBatch import PointBatch
+from .area_detection.LocalEdgeDetector import LocalEdgeDetector
 import numpy as np
 from .path_planning.PathAlgorithm import PathAlgorithm
+from .path_planning.BoustrophedonAlgorithm import BoustrophedonAlgorithm
 from .path_planning.PathPlanner import PathPlanner
+from .path_planning.FleetPlanner import FleetPlanner
+from .path_planning.ParameterSweep import ParameterSweep
+from .path_planning.PriorityMap import PriorityMap
+from .artifacts.ArtifactWriter import ArtifactWriter
+from .artifacts.ArtifactVerbosity import ArtifactVerbosity
 
 """ Class that is responsible of handling path planning for UAV """
 
+STRATEGIES = ("greedy", "boustrophedon")  # coverage strategies that can be chosen in the request
+
 
 class UAVPathPlanner:
-    def __init__(self):
-        ee.Authenticate()
-        ee.Initialize(project="uav-route-planning")
-        self.__area_detection_controller = AreaDetectionController()
+    def __init__(self, artifact_verbosity: ArtifactVerbosity = ArtifactVerbosity.NONE,
+                 local_edge_detector: LocalEdgeDetector = None,
+                 tile_cache_directory: str = DEFAULT_TILE_CACHE_DIRECTORY):
+        if local_edge_detector is None:  # GEE isn't needed when edges are detected from rasters on disk
+            ee.Authenticate()
+            ee.Initialize(project="uav-route-planning")
+        # debug images are disabled by default, as they aren't needed to handle the request
+        self.__artifact_writer = ArtifactWriter(artifact_verbosity)
+        self.__area_detection_controller = AreaDetectionController(artifact_writer=self.__artifact_writer,
+                                                                   local_edge_detector=local_edge_detector,
+                                                                   tile_cache_directory=tile_cache_directory)
         self.__path_planner = PathPlanner()
+        self.__path_planner.artifact_writer = self.__artifact_writer
+        self.__sweep_table = []  # parameters and scores of the runs of the last parameter sweep
 
-    def detect_area(self, points: list[PointData]) -> list[tuple[float, float]]:
+    def detect_area(self, points: PointBatch, simplification_tolerance: float = None) -> list[tuple[float, float]]:
         start = time.time()
         self.__area_detection_controller.initialize_with_points(points)
-        self.__area_detection_controller.detect_areas()
+        self.__area_detection_controller.detect_areas(simplification_tolerance)
         points_coordinates = self.__area_detection_controller.get_boundary_coordinates()  # points of detected area
         # now coordinates need to be reversed before using them on map
         print("Area detection time:", str(time.time() - start), "seconds")
         return points_coordinates
 
-    def plan_path(self, points: list[PointData], velocity: float, travel_time: float):
-        """ Function that handles path planning for UAV """
+    def get_vertex_counts(self) -> tuple[int, int]:
+        """ Returns number of vertices of the detected contours before and after simplification """
+        return self.__area_detection_controller.get_vertex_counts()
+
+    def __create_priority_map(self, priority_field: np.array,
+                              priority_zones: list[tuple[PointBatch, float]] = None) -> PriorityMap:
+        area_detector = self.__area_detection_controller.area_detector
+        # polygon of the waypoints has weight 0.5, zones of the request are drawn over it
+        priority_map = PriorityMap(self.__area_detection_controller.get_merged_map().shape[:2])
+        priority_map.add_zone(priority_field, 0.5)
+        for zone_points, weight in priority_zones or []:
+            priority_map.add_zone(area_detector.get_points_img_merged_map(zone_points), weight)
+        return priority_map
+
+    def get_saved_length(self) -> float:
+        """ Returns meters by which the refinement shortened the last planned path """
+        return self.__path_planner.saved_length
+
+    def get_sweep_table(self) -> list[dict]:
+        """ Returns parameters and scores of the runs of the last parameter sweep, best runs first """
+        return self.__sweep_table
+
+    def get_grid_angles(self) -> list[float]:
+        """ Returns angles in degrees of the waypoint lattices of the detected areas, measured from the x axis of the
+        merged map, empty if the last path wasn't planned on a lattice. Angles are recorded when the grids are
+        created, so they are the ones of the planned path """
+        algorithm = self.__path_planner.algorithm
+        if not isinstance(algorithm, PathAlgorithm):
+            return []
+        return [float(np.degrees(grid_angle)) for grid_angle in algorithm.grid_angles]
+
+    def plan_path(self, points: PointBatch, velocity: float, travel_time: float,
+                  priority_zones: list[tuple[PointBatch, float]] = None, strategy: str = "greedy",
+                  refinement_time: float = 1, sweep_budget: float = None):
+        """ Function that handles path planning for UAV, priority zones are polygons with weights that multiply cost
+        of their waypoints. Strategy is "greedy" (cost-weighted nearest waypoint) or "boustrophedon" (parallel lanes
+        in cells of the area). If sweep_budget is given, greedy strategy is run with a grid of parameters for at most
+        that many seconds and the best path is used. Planned path is shortened by local search for at most
+        refinement_time seconds """
+        if strategy not in STRATEGIES:
+            raise ValueError("Unknown coverage strategy: " + str(strategy))
         start = time.time()
         self.__path_planner.resolution = 10
         scan_radius = 2000 / self.__path_planner.resolution
@@ -34,19 +92,86 @@ class UAVPathPlanner:
         # velocity needs to be converted from kmph to mps:
         velocity_in_m = velocity * 1000 / 3600
 
-        self.__path_planner.algorithm = PathAlgorithm(scan_radius=scan_radius, scan_accuracy=2, predator_weight=1.5, distance_weight=1.5, turn_weight=0, resolution=self.__path_planner.resolution, velocity=velocity_in_m, travel_time=travel_time)
-        self.__path_planner.priority_field = np.array([self.__area_detection_controller.area_detector.
-                                                      get_coordinates_img_merged_map(point) for point in points])
-        self.__path_planner.run_path_finding_detected_area(self.__area_detection_controller.get_contours(), self.__area_detection_controller.get_hierarchy(),
-                                                           self.__area_detection_controller.get_merged_map(),
-                                                           np.pi / 4)
+        if strategy == "boustrophedon":
+            self.__path_planner.algorithm = BoustrophedonAlgorithm(scan_radius=scan_radius,
+                                                                   resolution=self.__path_planner.resolution,
+                                                                   travel_time=travel_time, velocity=velocity_in_m)
+        else:
+            self.__path_planner.algorithm = PathAlgorithm(scan_radius=scan_radius, scan_accuracy=2, predator_weight=1.5, distance_weight=1.5, turn_weight=0, resolution=self.__path_planner.resolution, velocity=velocity_in_m, travel_time=travel_time)
+        area_detector = self.__area_detection_controller.area_detector
+        self.__path_planner.priority_field = area_detector.get_points_img_merged_map(points)
+        self.__path_planner.priority_map = self.__create_priority_map(self.__path_planner.priority_field, priority_zones)
+        self.__sweep_table = []
+        if sweep_budget is not None and strategy == "greedy":
+            self.__run_parameter_sweep(sweep_budget)
+        else:
+            self.__path_planner.run_path_finding_detected_area(self.__area_detection_controller.get_contours(),
+                                                               self.__area_detection_controller.get_hierarchy(),
+                                                               self.__area_detection_controller.get_merged_map(),
+                                                               np.pi / 4)
         if self.__path_planner._path is None:
             return []
+        self.__path_planner.refine_path(refinement_time)
         self.__path_planner.smoothen_path(velocity, np.pi/6, 100)
         self.__path_planner.draw_path(self.__area_detection_controller.get_merged_map())
         print("Path planning time:", str(time.time() - start), "seconds")
         return self.__area_detection_controller.area_detector.convert_path_points_to_degrees(self.__path_planner._path), self.__path_planner.time_travelled
 
+    def __run_parameter_sweep(self, sweep_budget: float):
+        """ Plans path with every configuration of the sweep from the first waypoint and keeps the best one """
+        algorithm = self.__path_planner.algorithm
+        components = algorithm.process_contours(self.__area_detection_controller.get_contours(),
+                                                self.__area_detection_controller.get_hierarchy())
+        parameter_sweep = ParameterSweep(algorithm, latency_budget=sweep_budget)
+        starting_point = self.__path_planner.priority_field[0, :]
+        result, parameters = parameter_sweep.plan(components, starting_point, np.pi / 4,
+                                                  self.__path_planner.priority_map)
+        self.__path_planner.starting_point = starting_point
+        self.__path_planner.starting_direction = np.pi / 4 if parameters is None else parameters["starting_direction"]
+        self.__path_planner._path, self.__path_planner._directions, self.__path_planner._turns, \
+            self.__path_planner.time_travelled = result
+        self.__sweep_table = parameter_sweep.get_table()
+        print("Best parameters of the sweep:", parameters)
+
+    def plan_fleet(self, points: PointBatch, vehicles: list[tuple[float, float]],
+                   priority_zones: list[tuple[PointBatch, float]] = None, refinement_time: float = 1) -> list:
+        """ Plans paths of several UAVs given as (velocity, travel_time) that start from the first waypoint, area is
+        split between them in proportion to the distance they can fly. Returns path and time of every vehicle """
+        start = time.time()
+        resolution = 10
+        scan_radius = 2000 / resolution
+        algorithm = PathAlgorithm(scan_radius=scan_radius, scan_accuracy=2, predator_weight=1.5, distance_weight=1.5,
+                                  turn_weight=0, resolution=resolution)
+        area_detector = self.__area_detection_controller.area_detector
+        priority_field = area_detector.get_points_img_merged_map(points)
+        priority_map = self.__create_priority_map(priority_field, priority_zones)
+        components = algorithm.process_contours(self.__area_detection_controller.get_contours(),
+                                                self.__area_detection_controller.get_hierarchy())
+
+        # velocity needs to be converted from kmph to mps:
+        results = FleetPlanner(algorithm).plan(components, [(velocity * 1000 / 3600, travel_time)
+                                                            for velocity, travel_time in vehicles],
+                                               priority_field[0, :], np.pi / 4, priority_map)
+        vehicle_paths = []
+        for (velocity, travel_time), (path, directions, turns, time_travelled) in zip(vehicles, results):
+            if path is None:
+                vehicle_paths.append(([], 0))
+                continue
+            # every vehicle gets its own planner, so its path is refined and smoothed with its velocity
+            path_planner = PathPlanner()
+            path_planner.resolution = resolution
+            path_planner.algorithm = copy.copy(algorithm)
+            path_planner.algorithm.velocity, path_planner.algorithm.travel_time = velocity * 1000 / 3600, travel_time
+            path_planner.starting_point, path_planner.starting_direction = priority_field[0, :], np.pi / 4
+            path_planner._path, path_planner._directions, path_planner._turns = path, directions, turns
+            path_planner.time_travelled = time_travelled
+            path_planner.refine_path(refinement_time)
+            path_planner.smoothen_path(velocity, np.pi / 6, 100)
+            vehicle_paths.append((area_detector.convert_path_points_to_degrees(path_planner._path),
+                                  path_planner.time_travelled))
+        print("Fleet path planning time:", str(time.time() - start), "seconds")
+        return vehicle_paths
+
 
 
 # code to execute
@@ -1,46 +1,80 @@
-import ee
+import os
 from .AreaDetector import AreaDetector
 from .EdgeDetector import EdgeDetector
-from .PointData import PointData
+from .PointBatch import PointBatch
+from .Projection import Projection
+from .TileCache import TileCache
+from .CachedEdgeMapSource import CachedEdgeMapSource
+from .EarthEngineEdgeMapSource import EarthEngineEdgeMapSource
+from .BulkEdgeMapSource import BulkEdgeMapSource
+from .EdgeMapSource import EdgeMapSource
+from .PeriodEdgeMapSource import PeriodEdgeMapSource
+from .ContourSimplifier import ContourSimplifier
+from .LocalEdgeDetector import LocalEdgeDetector
+from ..artifacts.ArtifactWriter import ArtifactWriter
 
 """ Class that controls detection of areas and returns results of it as a polygon points """
 
+# edge map fragments are cached in the cache directory of the user, outside of the source tree
+DEFAULT_TILE_CACHE_DIRECTORY = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+                                            'uav-route-planning', 'tiles')
+
 
 class AreaDetectionController:
 
-    def __init__(self):
+    def __init__(self, tile_cache_size: int = 1024 ** 3, artifact_writer: ArtifactWriter = None,
+                 bulk_download_margin: float = 2550, local_edge_detector: LocalEdgeDetector = None,
+                 simplification_tolerance: float = 10, tile_cache_directory: str = DEFAULT_TILE_CACHE_DIRECTORY):
         self.area_detector: AreaDetector = None
-        self.__projection = ee.Projection('EPSG:3035')  # projection that is accurate only to Europe!
-        self.__points_list = None
+        self.__projection = Projection('EPSG:3035')  # projection that is accurate only to Europe!
+        self.__points: PointBatch = None
         self.__points_feature_collection = None
         self.__map_center = None
         self.__edge_detector = None
         self.__hierarchy = None
         self.__contours = None
+        # edge map fragments are cached between requests as missions are often repeated over the same fields
+        self.__tile_cache = TileCache(tile_cache_directory, tile_cache_size)
+        self.__artifact_writer = artifact_writer
+        # region around the points that is downloaded at once, None disables bulk download
+        self.__bulk_download_margin = bulk_download_margin
+        # edges can be detected offline from rasters on disk instead of GEE
+        self.__local_edge_detector = local_edge_detector
+        self.__local_edge_map_source: EdgeMapSource = None
+        # default tolerance in meters of the contour simplification, 0 disables it
+        self.__simplification_tolerance = simplification_tolerance
+        self.__vertex_counts = (0, 0)
 
-    def initialize_with_points(self, points_list: list[PointData]):
+    def initialize_with_points(self, points: PointBatch):
         """ Initializes area detection with passed points """
-        self.__points_list = points_list
-        self.__points_feature_collection = ee.FeatureCollection(
-            [ee.Feature(point.get_gee_point().transform(self.__projection)) for point in
-             points_list])  # point is created as EPSG:4326 projection by default
-        self.__map_center = PointData.from_gee_point(self.__points_feature_collection.geometry().centroid(), self.__projection)
+        self.__points = points
+        # center of the map is calculated locally as a centroid of points in meters
+        self.__map_center = points.get_centroid()
+        if self.__local_edge_detector is not None:
+            return
+        self.__points_feature_collection = points.get_gee_feature_collection()
         self.__edge_detector = EdgeDetector(self.__points_feature_collection, self.__map_center)
 
-    def detect_areas(self) -> tuple[list[int], list[int]]:
-        """ Detects area for all points that were provided to class """
-        print("Detection of edges is starting")
-        detected_edges_map = self.__edge_detector.detect_and_return_merged_bands()
-        print("Detection of edges is finished")
-        self.area_detector = AreaDetector(detected_edges_map, self.__map_center, self.__projection)
+    def detect_areas(self, simplification_tolerance: float = None) -> tuple[list[int], list[int]]:
+        """ Detects area for all points that were provided to class, tolerance of the contour simplification can be
+        set for the single request """
+        self.area_detector = AreaDetector(None, self.__map_center, self.__projection, self.__get_edge_map_source(),
+                                          artifact_writer=self.__artifact_writer)
 
         print("Detection of areas is starting")
-        self.area_detector.run_area_detection(self.__points_list)
+        self.area_detector.run_area_detection(self.__points)
         print("Detection of areas is finished")
 
         print("Point extraction is starting")
         self.area_detector.prepare_for_points_extraction()
         contours, hierarchy = self.area_detector.get_boundary_points()  # this function returns points for path planning
+        if simplification_tolerance is None:
+            simplification_tolerance = self.__simplification_tolerance
+        # fewer vertices make path planning and the response faster
+        contour_simplifier = ContourSimplifier(simplification_tolerance,
+                                               self.area_detector.get_geotransform().pixel_size)
+        contours = contour_simplifier.simplify(contours, hierarchy)
+        self.__vertex_counts = contour_simplifier.get_vertex_counts()
 
         print("Point extraction is finished")
 
@@ -48,17 +82,49 @@ class AreaDetectionController:
         self.__hierarchy = hierarchy
         return self.__contours, self.__hierarchy
 
+    def __get_edge_map_source(self) -> EdgeMapSource:
+        """ Returns source of the edge map fragments for the current points """
+        if self.__local_edge_detector is not None:
+            # local scene doesn't depend on the points, so edges are detected only once
+            if self.__local_edge_map_source is None:
+                self.__local_edge_map_source = self.__local_edge_detector.create_edge_map_source()
+            return self.__local_edge_map_source
+
+        # edges of every time period are cached separately and detected on GEE only if some of their map fragments
+        # aren't cached, so adding a new period doesn't detect edges of the other periods again
+        period_sources = []
+        for period in range(len(self.__edge_detector.get_time_periods())):
+            edge_map_source = EarthEngineEdgeMapSource(self.__edge_detector.detect_period_edges(period))
+            if self.__bulk_download_margin is not None:
+                edge_map_source = BulkEdgeMapSource(edge_map_source, self.__get_region_of_interest())
+            period_sources.append(CachedEdgeMapSource(edge_map_source, self.__tile_cache,
+                                                      self.__edge_detector.get_period_parameters_hash(period)))
+        return PeriodEdgeMapSource(period_sources, self.__edge_detector.get_closing_radius())
+
+    def __get_region_of_interest(self) -> tuple[float, float, float, float]:
+        """ Returns bounding box of the points in meters expanded by the margin """
+        min_x, min_y, max_x, max_y = self.__points.get_bounds_meters()
+        margin = self.__bulk_download_margin
+        return min_x - margin, min_y - margin, max_x + margin, max_y + margin
+
     def get_merged_map(self):
         """ Returns merged map of detected area """
         return self.area_detector.get_merged_map()
 
     def get_boundary_coordinates(self) -> list[tuple[float, float]]:
-        points_degrees = self.area_detector.convert_boundary_points_to_degrees(self.__contours)
+        # only outer boundaries of the areas are shown, holes are used by the path planning
+        outer_contours = [contour for contour, (_, _, _, parent) in zip(self.__contours, self.__hierarchy[0])
+                          if parent < 0] if self.__hierarchy is not None else self.__contours
+        points_degrees = self.area_detector.convert_boundary_points_to_degrees(outer_contours)
         # COORDINATES ARE IN LON LAT FORMAT!
         for point in points_degrees:
             print(str(point['lat']) + ',' + str(point['lng']))
         return points_degrees
 
+    def get_vertex_counts(self) -> tuple[int, int]:
+        """ Returns number of vertices of the contours before and after simplification """
+        return self.__vertex_counts
+
     def get_contours(self) -> list[list[tuple[float, float]]]:
         return self.__contours
 
@@ -1,11 +1,24 @@
 import ee
 import geemap
 
-from .MapFragment import MapFragment
+from .MapFragment import MapFragment, BLACK
 from .Direction import Direction
 from .PointData import PointData
-import matplotlib.pyplot as plt
-import math
+from .PointBatch import PointBatch
+from .Projection import Projection
+from .GeoTransform import GeoTransform
+from .EdgeMapSource import EdgeMapSource
+from .EarthEngineEdgeMapSource import EarthEngineEdgeMapSource
+from .MapFragmentPrefetcher import MapFragmentPrefetcher
+from .TileIndex import TileIndex
+from .FragmentPostProcessor import FragmentPostProcessor
+from .PostProcessingStage import PostProcessingStage
+from .RegionGrower import RegionGrower
+from .MosaicBuilder import MosaicBuilder
+from .SeedGrid import SeedGrid
+from .SeedScheduler import SeedScheduler
+from ..artifacts.ArtifactWriter import ArtifactWriter
+from ..artifacts.ArtifactVerbosity import ArtifactVerbosity
 import numpy as np
 import cv2 as cv
 import os
@@ -15,350 +28,221 @@ import os
 
 class AreaDetector:
 
-    def __init__(self, edge_map: geemap.Image, map_center: ee.Geometry.Point, projection: ee.Projection):
+    def __init__(self, edge_map: geemap.Image, map_center: ee.Geometry.Point, projection: Projection,
+                 edge_map_source: EdgeMapSource = None, max_prefetch_workers: int = 8,
+                 post_processing_stages: list[tuple[PostProcessingStage, object]] = None,
+                 use_region_grower: bool = True, artifact_writer: ArtifactWriter = None,
+                 mosaic_memmap_threshold: int = 256 * 1024 ** 2, seed_grid: SeedGrid = None):
         self.__edge_map = edge_map
+        # source of the map fragments can be replaced e.g. with local raster
+        self.__edge_map_source = edge_map_source if edge_map_source is not None else EarthEngineEdgeMapSource(edge_map)
         self.__projection = projection
         self.__map_center = map_center
-        self.__detected_areas_map_fragments = [[]]  # MapFragments objects stored in array
         self.__detected_area_merged_image = []
+        self.__geotransform: GeoTransform = None
         self.__patch_size = 255
         self.__img_resolution = 10
         self.__buffer_radius = ((self.__patch_size - 1) / 2) * self.__img_resolution
-        self.__points_distance = 100 # distance of generated points in meters
+        # MapFragments objects stored by their absolute tile coordinates
+        self.__detected_areas_map_fragments = TileIndex(self.__patch_size, self.__img_resolution)
+        # seeds are generated every 100 meters inside of the polygon of the points by default
+        self.__seed_grid = seed_grid if seed_grid is not None else SeedGrid(points_distance=100)
+        # threshold -> morphology close -> threshold by default
+        self.__post_processor = FragmentPostProcessor(post_processing_stages)
+        # areas are grown with connected components over all tiles or with recursive flood fill of the fragments
+        self.__use_region_grower = use_region_grower
+        # merged maps larger than the threshold in bytes are stored in a memory-mapped file
+        self.__mosaic_builder = MosaicBuilder(self.__patch_size, mosaic_memmap_threshold)
         # we subtract center point from the patch size
         self.__map_fragments_counter = 0
         self.__BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-        os.makedirs(self.__BASE_DIR + '/results', exist_ok=True)
-        os.makedirs(self.__BASE_DIR + '/results/thresholding', exist_ok=True)
-        os.makedirs(self.__BASE_DIR + '/results/morphology', exist_ok=True)
-        os.makedirs(self.__BASE_DIR + '/results/contour_detection', exist_ok=True)
-        os.makedirs(self.__BASE_DIR + '/results/edges', exist_ok=True)
-        self.__load_map_fragment(self.__map_center, 0, 0)
-
-    def __load_map_fragment(self, center_point: PointData, x_pos_to_insert: int, y_pos_to_insert: int):
-        """ Initiates a map around center point of image """
-        print("Loading map fragment")
-        new_map_fragment = MapFragment(center_point, self.__projection, self.__buffer_radius, self.__edge_map,
-                                       self.__img_resolution, self.__patch_size, self.__img_resolution)
-        self.__detected_areas_map_fragments[y_pos_to_insert].insert(x_pos_to_insert, new_map_fragment)
+        # debug images are saved in the background and only when they are enabled
+        self.__artifact_writer = artifact_writer if artifact_writer is not None else ArtifactWriter()
+        self.__prefetcher = MapFragmentPrefetcher(self.__edge_map_source, self.__detected_areas_map_fragments,
+                                                  self.__projection, self.__buffer_radius, self.__img_resolution,
+                                                  max_prefetch_workers)
+        self.__get_map_fragment(*self.__detected_areas_map_fragments.get_tile_coordinates(
+            self.__map_center.get_coordinates_meters()))
+
+    def __load_map_fragment(self, col: int, row: int) -> MapFragment:
+        """ Initiates a map fragment at the provided tile coordinates """
+        print("Loading map fragment - col", col, "row", row)
+        center_x, center_y = self.__detected_areas_map_fragments.get_tile_center(col, row)
+        center_point = PointData.from_coordinates_meters(center_x, center_y, self.__projection)
+        new_map_fragment = MapFragment(center_point, self.__projection, self.__buffer_radius,
+                                       self.__prefetcher.get(col, row), self.__img_resolution, self.__patch_size,
+                                       self.__img_resolution)
+        self.__detected_areas_map_fragments.add(col, row, new_map_fragment)
 
         self.__map_fragments_counter += 1
-
-        fig, ax = plt.subplots()
-
-        ax.axis("off")
-        ax.imshow(new_map_fragment.get_image(), cmap='gray')
-        fig.savefig(self.__BASE_DIR + '/results/edges/Contours' + str(self.__map_fragments_counter) + '.jpg', dpi=500, bbox_inches='tight')
-
-        plt.close(fig)
+        self.__artifact_writer.write(self.__BASE_DIR + '/results/edges/Contours' + str(self.__map_fragments_counter),
+                                     new_map_fragment.get_image(), ArtifactVerbosity.PER_TILE)
 
         print("Loading map fragment finished")
-        print("\nStructure of loaded map: ")
-        for row_id, row in enumerate(self.__detected_areas_map_fragments):
-            print(str(row_id + 1) + ". row length:", int(len(row)))
-        print('\n')
-
-    def __search_row_for_the_map_fragment(self, map_fragment_center: PointData, point: PointData,
-                                          row_num: int) -> tuple[int, int]:
-        """ Searches for map fragment in row and returns coordinates of map fragment as [row_num, col_num] """
-        print("Searching in row", row_num)
-        direction_x = 0
-        point_coordinates = point.get_coordinates_meters()
-        map_fragment_center_coordinates = map_fragment_center.get_coordinates_meters()
-        if (point_coordinates[0] - map_fragment_center_coordinates[0]) <= -self.__buffer_radius:
-            direction_x = -1
-        elif (point_coordinates[0] - map_fragment_center_coordinates[0]) >= self.__buffer_radius:
-            direction_x = 1
-
-        if direction_x >= 0:
-            for col_num in range(len(self.__detected_areas_map_fragments[row_num])):
-                if self.__detected_areas_map_fragments[row_num][col_num].contains_point(point):
-                    print("Point is found on current map fragment - row", row_num, "col", col_num, "\n")
-                    return row_num, col_num
-            # if there is no buffer that contains searched point, we have to add next one
-            while True:
-                current_map_fragment = self.__detected_areas_map_fragments[row_num][-1]
-                print("Loading map to the right")
-                self.__load_map_fragment(current_map_fragment.find_near_map_fragment_center(direction_x, 0),
-                                         len(self.__detected_areas_map_fragments[row_num]), row_num)
-                if self.__detected_areas_map_fragments[row_num][-1].contains_point(point):
-                    print("Point is found on current map fragment - row", row_num, "col",
-                          len(self.__detected_areas_map_fragments[row_num]) - 1, "\n")
-                    return row_num, len(self.__detected_areas_map_fragments[row_num]) - 1
-
-        else:
-            while True:
-                current_map_fragment = self.__detected_areas_map_fragments[row_num][0]
-                print("Loading map to the left")
-                self.__load_map_fragment(current_map_fragment.find_near_map_fragment_center(direction_x, 0), 0, row_num)
-                if self.__detected_areas_map_fragments[row_num][0].contains_point(point):
-                    print("Point is found on current map fragment - row", row_num, "col", 0, "\n")
-                    return row_num, 0
-
-    def __search_for_the_map_fragment(self, row_num: int, point: PointData) -> tuple[int, int]:
-        """ Searches self.__detected_areas_map for row where point is located and returns map fragment coordinates as
-        [row_num, col_num]"""
-        if row_num < 0:
-            self.__detected_areas_map_fragments.insert(0, [])  # new row at the top is added
-            current_map_fragment = self.__detected_areas_map_fragments[1][0]  # we start looking from the lower row
-            print("Loading map up")
-            self.__load_map_fragment(current_map_fragment.find_near_map_fragment_center(0, -1), 0, 0)
-            return self.__search_for_the_map_fragment(row_num + 1, point)
-
-        if row_num >= len(self.__detected_areas_map_fragments):
-            current_map_fragment = self.__detected_areas_map_fragments[-1][0]  # we start from the last row
-            self.__detected_areas_map_fragments.append([])
-            print("Loading map down")
-            self.__load_map_fragment(current_map_fragment.find_near_map_fragment_center(0, 1), 0,
-                                     len(self.__detected_areas_map_fragments) - 1)
-            return self.__search_for_the_map_fragment(row_num, point)
-
-        map_fragment_center = self.__detected_areas_map_fragments[row_num][0].get_center_point()
-        direction_y = 0
-        point_coordinates = point.get_coordinates_meters()
-
-        if (map_fragment_center.get_coordinates_meters()[1] - point_coordinates[1]) <= -self.__buffer_radius:
-            direction_y = -1
-        elif (map_fragment_center.get_coordinates_meters()[1] - point_coordinates[
-            1]) >= self.__buffer_radius:
-            direction_y = 1
-
-        if direction_y == -1:
-            if row_num - 1 < 0:
-                current_map_fragment = self.__detected_areas_map_fragments[0][0]
-                self.__detected_areas_map_fragments.insert(0, [])  # new row at the top is added
-                print("Loading map up")
-                self.__load_map_fragment(current_map_fragment.find_near_map_fragment_center(0, -1), 0,
-                                         row_num)
-                return self.__search_for_the_map_fragment(row_num + 1, point)
-            else:
-                return self.__search_for_the_map_fragment(row_num - 1, point)
-
-        elif direction_y == 1:
-            if row_num + 1 >= len(self.__detected_areas_map_fragments):
-                current_map_fragment = self.__detected_areas_map_fragments[row_num][0]
-                self.__detected_areas_map_fragments.append([])
-                print("Loading map down")
-                self.__load_map_fragment(current_map_fragment.find_near_map_fragment_center(0, direction_y), 0,
-                                         row_num + 1)
-            # we are moving searching to the next row
-            return self.__search_for_the_map_fragment(row_num + 1, point)
-
-        # if current row is correct, we start searching inside it
-        return self.__search_row_for_the_map_fragment(map_fragment_center, point, row_num)
-
-    def run_area_detection(self, points: list[PointData]) -> None:
-        """ Detects area that contains provided point """
-        points = self.__sort_points(points, self.__map_center)
-
-        if len(points) > 2:
-            points = self.__generate_points_grid(points)
-
-        for number, point in enumerate(points):
-            print("Detecting area for point", str(number + 1))
-            # searching for corresponding map fragment for the point
-            row_num, col_num = self.__search_for_the_map_fragment(0, point)
-
-            found_map_fragment = self.__detected_areas_map_fragments[row_num][col_num]
-            x, y = found_map_fragment.convert_point_to_img_coordinates(point)
-            found_map_fragment.run_flood_fill(x, y)
-
-            self.detect_in_adjacent_map_fragments(found_map_fragment, row_num)
+        print("Number of loaded map fragments:", len(self.__detected_areas_map_fragments), "\n")
+        return new_map_fragment
 
-    def __sort_points(self, points: list[PointData], center_point: PointData) -> list[PointData]:
-        """ Sorts points that they are in counter-clockwise order """
+    def __get_map_fragment(self, col: int, row: int) -> MapFragment:
+        """ Returns map fragment at the provided tile coordinates, loads it if it isn't loaded yet """
+        map_fragment = self.__detected_areas_map_fragments.get(col, row)
+        if map_fragment is None:
+            map_fragment = self.__load_map_fragment(col, row)
+        return map_fragment
 
-        def get_angle(point: PointData) -> float:
-            """ Returns the angle in between two points """
-            center_x, center_y = center_point.get_coordinates_meters()
-            point_x, point_y = point.get_coordinates_meters()
-            return math.atan2(point_y - center_y, point_x - center_x)
-
-        return sorted(points, key=get_angle)
-
-    def detect_in_adjacent_map_fragments(self, found_map_fragment: MapFragment, row_num: int) -> None:
+    def run_area_detection(self, points: PointBatch) -> None:
+        """ Detects area that contains provided point """
+        try:
+            # map fragments covering the points are downloaded in the background while the points are processed
+            self.__prefetcher.prefetch_area(points.get_coordinates_meters())
+            points = points.sort_by_angle(self.__map_center)
+            points_meters = points.get_coordinates_meters()
+            seeds = self.__detected_areas_map_fragments.get_pixel_coordinates(points_meters)
+
+            if len(points) > 2:
+                seeds = np.concatenate([seeds, self.__generate_points_grid(points_meters)])
+
+            if self.__use_region_grower:
+                self.__grow_regions(seeds)
+            else:
+                self.__flood_fill_regions(seeds)
+        finally:
+            # fragments that weren't needed by the detection don't have to be downloaded, threads of the prefetcher
+            # are stopped, as every request creates a new detector
+            self.__prefetcher.shutdown()
+
+    def __grow_regions(self, seeds: np.array) -> None:
+        """ Detects areas that contain seeds passed as absolute pixel coordinates with the connected components
+        engine """
+        seed_scheduler = SeedScheduler(self.__detected_areas_map_fragments)
+        region_grower = RegionGrower(self.__get_map_fragment, self.__prefetcher.prefetch_neighbours)
+        region_grower.grow([(col, row, x, y) for (col, row), tile_seeds in seed_scheduler.schedule(seeds)
+                            for x, y in tile_seeds.tolist()])
+        print("Skipped", seed_scheduler.get_skipped_seeds() + region_grower.get_skipped_seeds(), "of", len(seeds),
+              "seeds that were already covered")
+        for component, tiles in region_grower.get_component_tiles().items():
+            print("Detected area", component, "spans", len(tiles), "map fragments")
+
+    def __flood_fill_regions(self, seeds: np.array) -> None:
+        """ Detects areas that contain seeds passed as absolute pixel coordinates with flood fill that recursively
+        moves to adjacent fragments """
+        seed_scheduler = SeedScheduler(self.__detected_areas_map_fragments)
+        for (col, row), tile_seeds in seed_scheduler.schedule(seeds):
+            found_map_fragment = self.__get_map_fragment(col, row)
+            for x, y in tile_seeds.tolist():
+                # seeds that were filled by the previous seeds or lie on the edges don't detect anything new
+                if found_map_fragment.get_pixel_value(x, y) != BLACK:
+                    seed_scheduler.skip()
+                    continue
+                print("Detecting area for point in map fragment - col", col, "row", row)
+                found_map_fragment.run_flood_fill(x, y)
+
+                self.detect_in_adjacent_map_fragments(found_map_fragment, col, row)
+        print("Skipped", seed_scheduler.get_skipped_seeds(), "of", len(seeds), "seeds that were already covered")
+
+    def detect_in_adjacent_map_fragments(self, found_map_fragment: MapFragment, col: int, row: int) -> None:
         """ Runs area detection in adjacent map fragments if this is necessary - when area detected previously is
         beyond current map fragment"""
-        points_to_check = found_map_fragment.check_bounds()
+        # one seed per contiguous run of filled pixels on each border
+        border_runs = found_map_fragment.find_border_runs()
+        # adjacent fragments are loaded in the background while flood fill runs in the other directions
+        self.__prefetcher.prefetch_neighbours(col, row, [direction.get_offset() for direction in Direction
+                                                         if len(border_runs[direction.value][0]) > 0])
         for direction in Direction:
-            if len(points_to_check[direction.value]) == 0:
+            seeds, extents = border_runs[direction.value]
+            if len(seeds) == 0:
                 # we don't have to check map fragment in this direction as there aren't any areas detected in this
                 # direction
                 continue
 
-            new_row_num, new_col_num = (0, 0)
-            if direction == Direction.TOP:
-                print("Detecting adjacent area top")
-                center_point = found_map_fragment.find_near_map_fragment_center(0, -1)
-                new_row_num, new_col_num = self.__search_for_the_map_fragment(row_num - 1, center_point)
-            elif direction == Direction.BOTTOM:
-                print("Detecting adjacent area bottom")
-                center_point = found_map_fragment.find_near_map_fragment_center(0, 1)
-                new_row_num, new_col_num = self.__search_for_the_map_fragment(row_num + 1, center_point)
-            elif direction == Direction.LEFT:
-                print("Detecting adjacent area left")
-                center_point = found_map_fragment.find_near_map_fragment_center(-1, 0)
-                new_row_num, new_col_num = self.__search_for_the_map_fragment(row_num, center_point)
-            else:
-                print("Detecting adjacent area right")
-                center_point = found_map_fragment.find_near_map_fragment_center(1, 0)
-                new_row_num, new_col_num = self.__search_for_the_map_fragment(row_num, center_point)
-
-            was_flood_fill_run = False
-            for coordinates in points_to_check[direction.value]:
-                # here we run flood fill for all fragments
-                adjacent_fragment = self.__detected_areas_map_fragments[new_row_num][new_col_num]
-                if adjacent_fragment.get_pixel_value(coordinates[0], coordinates[1]) == 0:
-                    adjacent_fragment.run_flood_fill(coordinates[0], coordinates[1])
-                    was_flood_fill_run = True
+            print("Detecting adjacent area", direction.name.lower())
+            new_col, new_row = col + direction.get_offset()[0], row + direction.get_offset()[1]
+            adjacent_fragment = self.__get_map_fragment(new_col, new_row)
+
+            # only runs that aren't filled yet in the adjacent fragment are flood filled
+            was_flood_fill_run = adjacent_fragment.fill_border_runs(direction.opposite(), seeds, extents)
 
             if was_flood_fill_run:
                 # we check if we have to detect anything in adjacent map fragments
-                self.detect_in_adjacent_map_fragments(adjacent_fragment, new_row_num)
+                self.detect_in_adjacent_map_fragments(adjacent_fragment, new_col, new_row)
 
     def __merge_map(self) -> None:
         print("Merging map is starting")
 
-        leftmost_map_fragment = None
-        rightmost_map_fragment = None
-
-        # searching for most left and most right map fragment
-        for row in self.__detected_areas_map_fragments:
-            if leftmost_map_fragment is None:
-                leftmost_map_fragment = row[0]
-            else:
-                leftmost_map_fragment_center_x = leftmost_map_fragment.get_center_point().get_coordinates_meters()[0]
-                current_map_fragment_center_x = row[0].get_center_point().get_coordinates_meters()[0]
-                if current_map_fragment_center_x < leftmost_map_fragment_center_x:
-                    leftmost_map_fragment = row[0]
-
-            if rightmost_map_fragment is None:
-                rightmost_map_fragment = row[-1]
-            else:
-                rightmost_map_fragment_center_x = rightmost_map_fragment.get_center_point().get_coordinates_meters()[0]
-                current_map_fragment_center_x = row[-1].get_center_point().get_coordinates_meters()[0]
-                if current_map_fragment_center_x > rightmost_map_fragment_center_x:
-                    rightmost_map_fragment = row[-1]
-
-        distance = (rightmost_map_fragment.get_center_point().get_coordinates_meters()[0] -
-                    leftmost_map_fragment.get_center_point().get_coordinates_meters()[0])
-
-        total_map_fragments_row = round(distance / self.__patch_size / self.__img_resolution) + 1
-
-        merged_rows = []
-
-        for row_num, row in enumerate(self.__detected_areas_map_fragments):
-            distance_from_row_start = (row[0].get_center_point().get_coordinates_meters()[0] -
-                    leftmost_map_fragment.get_center_point().get_coordinates_meters()[0])
-
-            elements_from_start = int(round(distance_from_row_start / self.__patch_size / self.__img_resolution))
-
-            # we add missing fragments to the map fragments (empty images are loaded for them)
-
-            elements_to_end = total_map_fragments_row - elements_from_start - len(row)
-
-            for i in range(elements_from_start):
-                center_point = row[0].find_near_map_fragment_center(-1, 0)
-                row.insert(0, MapFragment(center_point, self.__projection, self.__buffer_radius, None, self.__img_resolution, self.__patch_size, self.__img_resolution))
-
-            for i in range(elements_to_end):
-                center_point = row[0].find_near_map_fragment_center(1, 0)
-                row.append(MapFragment(center_point, self.__projection, self.__buffer_radius, None,
-                                          self.__img_resolution, self.__patch_size, self.__img_resolution))
-
-            merged_row = np.concatenate([fragment.get_image() for fragment in row], axis=1)
-            merged_rows.append(merged_row)
-
-        self.__detected_area_merged_image = np.concatenate(merged_rows, axis=0).astype(np.uint8)
+        # fragments are written directly into the preallocated mosaic, tiles that weren't loaded stay empty
+        self.__detected_area_merged_image = self.__mosaic_builder.build(self.__detected_areas_map_fragments)
+        # fragments are adjacent and don't overlap, so the whole merged map shares one transformation
+        self.__geotransform = self.__detected_areas_map_fragments.get_geotransform()
         print("Merging map finished")
 
-        fig = plt.figure()
-
-        plt.axis("off")
-        plt.imshow(self.__detected_area_merged_image, cmap='gray')
-        plt.savefig(self.__BASE_DIR + '/results/Edge_map.jpg', dpi=500, bbox_inches='tight')
-
+        self.__artifact_writer.write(self.__BASE_DIR + '/results/Edge_map', self.__detected_area_merged_image)
 
     def prepare_for_points_extraction(self) -> None:
         """ Prepares detected areas on MapFragments for points extraction. Applies threshold and merges all fragments into one image """
-        counter = 1
-        for row in range(len(self.__detected_areas_map_fragments)):
-            for column in range(len(self.__detected_areas_map_fragments[row])):
-                self.__detected_areas_map_fragments[row][column].apply_two_thresholds()
-
-                plt.figure()
-                plt.imshow(self.__detected_areas_map_fragments[row][column].get_image(), cmap='gray')
-                plt.axis("off")
-                plt.savefig(self.__BASE_DIR + f'/results/thresholding/Thresholding{str(counter)}.jpg', dpi=500, bbox_inches='tight')
-                plt.close()
-
-                self.__detected_areas_map_fragments[row][column].apply_morphology_close(7)
-
-                plt.figure()
-                plt.imshow(self.__detected_areas_map_fragments[row][column].get_image(), cmap='gray')
-                plt.axis("off")
-                plt.savefig(self.__BASE_DIR + f'/results/morphology/Morphology{str(counter)}.jpg', dpi=500, bbox_inches='tight')
-                plt.close()
-
-                self.__detected_areas_map_fragments[row][column].apply_one_threshold()
-
-                counter += 1
+        map_fragments = [map_fragment for _, map_fragment in self.__detected_areas_map_fragments.items()]
+        # all fragments are stacked and processed together by the vectorised pipeline
+        stage_callback = self.__save_post_processing_stage \
+            if self.__artifact_writer.is_enabled(ArtifactVerbosity.PER_TILE) else None
+        processed_fragments = self.__post_processor.process(
+            np.stack([map_fragment.get_image() for map_fragment in map_fragments]), stage_callback)
+        for map_fragment, processed_fragment in zip(map_fragments, processed_fragments):
+            map_fragment.set_image(processed_fragment)
 
         self.__merge_map()
 
-    def get_map_fragment(self, row_num: int, col_num: int):
-        """ Returns map fragment at the provided position, function created for testing purposes """
-        return self.__detected_areas_map_fragments[row_num][col_num]
+    def __save_post_processing_stage(self, stage: PostProcessingStage, fragments: np.array) -> None:
+        """ Saves images of fragments after thresholding and morphology stages """
+        directories = {PostProcessingStage.BAND_THRESHOLD: 'thresholding/Thresholding',
+                       PostProcessingStage.CLOSE: 'morphology/Morphology'}
+        if stage not in directories:
+            return
+        for counter, fragment in enumerate(fragments, start=1):
+            self.__artifact_writer.write(self.__BASE_DIR + f'/results/{directories[stage]}{str(counter)}', fragment,
+                                         ArtifactVerbosity.PER_TILE)
+
+    def get_map_fragment(self, col: int, row: int):
+        """ Returns map fragment at the provided tile coordinates, function created for testing purposes """
+        return self.__detected_areas_map_fragments.get(col, row)
 
 
     def get_boundary_points(self) -> tuple[list[int], list[int]]:
         """ Returns points of the detected areas boundaries """
-        contours, hierarchy = cv.findContours(self.__detected_area_merged_image, cv.RETR_EXTERNAL, cv.CHAIN_APPROX_TC89_KCOS)
-        # saving result as the image
-        image_contour = cv.cvtColor(self.__detected_area_merged_image, cv.COLOR_GRAY2BGR)  # Image for contours
-        image_points = cv.cvtColor(self.__detected_area_merged_image, cv.COLOR_GRAY2BGR)  # Image for points
+        # holes of the areas are returned as well, parent of every contour is stored in hierarchy
+        contours, hierarchy = cv.findContours(self.__detected_area_merged_image, cv.RETR_CCOMP,
+                                              cv.CHAIN_APPROX_TC89_KCOS)
+        if self.__artifact_writer.is_enabled(ArtifactVerbosity.SUMMARY):
+            self.__save_contours(contours)
 
-        for contour in contours:
-            cv.drawContours(image_contour, [contour], -1, (255, 0, 255), 2)
+        return contours, hierarchy
 
+    def __save_contours(self, contours: list[np.array]) -> None:
+        """ Saves images of the detected contours and of their points """
+        image_contour = cv.cvtColor(self.__detected_area_merged_image, cv.COLOR_GRAY2BGR)  # Image for contours
+        image_points = image_contour.copy()  # Image for points
+        cv.drawContours(image_contour, contours, -1, (255, 0, 255), 2)
         for contour in contours:
             for point in contour:
-                cv.circle(image_points, tuple(point[0]), 1, (128, 0, 128), -1)
-
-        image_contour_rgb = cv.cvtColor(image_contour, cv.COLOR_BGR2RGB)
-        image_points_rgb = cv.cvtColor(image_points, cv.COLOR_BGR2RGB)
+                cv.circle(image_points, tuple(int(value) for value in point[0]), 1, (128, 0, 128), -1)
 
-        # Plot side by side
-        plt.figure(figsize=(12, 6))
-
-        # Contours
-        plt.subplot(1, 2, 1)
-        plt.imshow(image_contour_rgb, cmap='gray')
-        plt.title("Contours")
-        plt.axis('off')
-
-        # Points
-        plt.subplot(1, 2, 2)
-        plt.imshow(image_points_rgb, cmap='gray')
-        plt.title("Contour Points")
-        plt.axis('off')
-        plt.savefig(self.__BASE_DIR + '/results/contour_detection/Contour.jpg', dpi=500, bbox_inches='tight')
-        plt.close()
-
-        return contours, hierarchy
+        self.__artifact_writer.write(self.__BASE_DIR + '/results/contour_detection/Contour', image_contour)
+        self.__artifact_writer.write(self.__BASE_DIR + '/results/contour_detection/Contour_points', image_points)
 
     def get_coordinates_img_merged_map(self, point: PointData) -> tuple[int, int]:
         """ Returns coordinates of the point on the merged area map image """
-        row_num, col_num = self.__search_for_the_map_fragment(0, point)
-        x, y = self.__detected_areas_map_fragments[row_num][col_num].convert_point_to_img_coordinates(point)
-        return x + (self.__patch_size * col_num), y + (self.__patch_size * row_num)
+        x, y = self.__geotransform.meters_to_pixels(point.get_coordinates_meters())[0]
+        return int(x), int(y)
+
+    def get_points_img_merged_map(self, points: PointBatch) -> np.array:
+        """ Returns coordinates of all points on the merged area map image with shape (N, 2) """
+        return points.get_coordinates_pixels(self.__geotransform)
 
     def calculate_coordinates_meters(self, img_coordinates: tuple[int, int]) -> tuple[float, float]:
         """ Calculates img coordinates of point on the map in meters """
-        row_num, col_num = int(img_coordinates[1] // self.__patch_size), int(img_coordinates[0] // self.__patch_size)
-        x, y = img_coordinates[0] % self.__patch_size, img_coordinates[1] % self.__patch_size
-        x_meters, y_meters = self.__detected_areas_map_fragments[row_num][col_num].convert_img_coordinates_to_map_coordinates(x, y)
-        return x_meters, y_meters
+        x_meters, y_meters = self.__geotransform.pixels_to_meters(img_coordinates)[0]
+        return float(x_meters), float(y_meters)
+
+    def get_geotransform(self) -> GeoTransform:
+        """ Returns transformation between merged map pixels and coordinates in meters """
+        return self.__geotransform
 
     def get_merged_map(self):
         """ Returns merged map of detected area """
@@ -366,74 +250,25 @@ class AreaDetector:
 
     def convert_boundary_points_to_degrees(self, contours: list[int]):
         """ Converts boundary points into degree coordinates """
-        points = []
-
-        for contour in contours:
-            for point in contour:
-                point_tmp = tuple(point[0])
-                point = ee.Geometry.Point(self.calculate_coordinates_meters(point_tmp), self.__projection)
-                points.append(point)
-
-        points_collection = ee.FeatureCollection(points).map(
-            lambda element: element.setGeometry(element.geometry().transform('EPSG:4326'))
-        )
-
-        # If there will be more than 65 536 points, the function will fail
-        data = points_collection.getInfo()['features']
-        points = [{'lng': point['geometry']['coordinates'][0], 'lat': point['geometry']['coordinates'][1]} for point in data]
-
-        return points
+        if len(contours) == 0:
+            return []
+        boundary_points = np.concatenate([np.asarray(contour).reshape(-1, 2) for contour in contours])
+        return self.__convert_img_points_to_degrees(boundary_points)
 
     def convert_path_points_to_degrees(self, path: list[int]):
-        """ Converts boundary points into degree coordinates """
-        points = []
-
-        for point in path:
-            point_tmp = tuple(point.tolist())
-            point = ee.Geometry.Point(self.calculate_coordinates_meters(point_tmp), self.__projection)
-            points.append(point)
-
-        points_collection = ee.FeatureCollection(points).map(
-            lambda element: element.setGeometry(element.geometry().transform('EPSG:4326'))
-        )
-
-        # If there will be more than 65 536 points, the function will fail
-        data = points_collection.getInfo()['features']
-        points = [{'lng': point['geometry']['coordinates'][0], 'lat': point['geometry']['coordinates'][1]} for point in data]
-
-        return points
-
-    def __generate_points_grid(self, points: list[PointData]) -> list[PointData]:
-        """ Generates grid of points in the selected area of interest """
-        polygon_outline = points[:]
-        polygon_outline.append(points[0])
-        area_of_interest = ee.Geometry.Polygon([point.get_coordinates_degrees() for point in polygon_outline])
-
-        scaled_projection = self.__projection.atScale(self.__points_distance)
-        dummy_image = ee.Image(0).rename('dummy')
-
-        grid_image = dummy_image.reproject(
-            crs=scaled_projection,
-            scale=self.__points_distance
-        )
-
-        point_grid = grid_image.sample(
-            region=area_of_interest,
-            scale=self.__points_distance,
-            projection=scaled_projection,
-            geometries=True  # Returns points instead of just sampled values
-        )
-
-        point_grid = point_grid.map(
-            lambda element: element.setGeometry(element.geometry().transform('EPSG:4326'))
-        )
-
-        data = point_grid.getInfo()['features']
-        points_coordinates = [(point['geometry']['coordinates'][0], point['geometry']['coordinates'][1]) for point in
-                  data]
-
-        for coordinates in points_coordinates:
-            points.append(PointData(coordinates[0], coordinates[1], self.__projection))
-            print(str(coordinates[1]) + ',' + str(coordinates[0]))
-
-        return points
\ No newline at end of file
+        """ Converts path points into degree coordinates """
+        return self.__convert_img_points_to_degrees(np.asarray(path))
+
+    def __convert_img_points_to_degrees(self, img_points: np.array) -> list[dict]:
+        """ Converts array of merged map coordinates into list of degree coordinates in the format used by frontend """
+        points_meters = self.__geotransform.pixels_to_meters(img_points)
+        longitudes, latitudes = self.__projection.to_degrees(points_meters[:, 0], points_meters[:, 1])
+        return [{'lng': longitude, 'lat': latitude} for longitude, latitude in zip(longitudes.tolist(),
+                                                                                  latitudes.tolist())]
+
+    def __generate_points_grid(self, points_meters: np.array) -> np.array:
+        """ Generates grid of seeds inside of the polygon of the points and returns their absolute pixel coordinates """
+        grid_meters = self.__seed_grid.generate(points_meters)
+        print("Generated", len(grid_meters), "seeds every", self.__seed_grid.get_points_distance(points_meters),
+              "meters")
+        return self.__detected_areas_map_fragments.get_pixel_coordinates(grid_meters)
@@ -0,0 +1,32 @@
+import numpy as np
+from .EdgeMapSource import EdgeMapSource
+from .PointData import PointData
+from .Projection import Projection
+
+""" Edge map source that cuts map fragments from a local NumPy raster, used for offline runs and testing """
+
+
+class ArrayEdgeMapSource(EdgeMapSource):
+
+    def __init__(self, edge_map: np.array, origin_x: float, origin_y: float, resolution: float):
+        self.__edge_map = edge_map
+        self.__origin_x = origin_x  # coordinates in meters of the center of the top left pixel
+        self.__origin_y = origin_y
+        self.__resolution = resolution
+
+    def load_fragment(self, center_point: PointData, buffer_radius: float, projection: Projection,
+                      scale: int) -> np.array:
+        """ Returns fragment of the raster around center point, pixels outside of the raster have value 0 """
+        center_x, center_y = center_point.get_coordinates_meters()
+        fragment_size = int(round(2 * buffer_radius / self.__resolution)) + 1
+        start_x = int(round((center_x - buffer_radius - self.__origin_x) / self.__resolution))
+        start_y = int(round((self.__origin_y - center_y - buffer_radius) / self.__resolution))
+
+        fragment = np.zeros((fragment_size, fragment_size), dtype=float)
+        height, width = self.__edge_map.shape
+        src_x0, src_y0 = max(start_x, 0), max(start_y, 0)
+        src_x1, src_y1 = min(start_x + fragment_size, width), min(start_y + fragment_size, height)
+        if src_x0 < src_x1 and src_y0 < src_y1:
+            fragment[src_y0 - start_y:src_y1 - start_y, src_x0 - start_x:src_x1 - start_x] = \
+                self.__edge_map[src_y0:src_y1, src_x0:src_x1]
+        return fragment
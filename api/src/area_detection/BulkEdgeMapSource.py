@@ -0,0 +1,104 @@
+import io
+import math
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+import ee
+import numpy as np
+from .ArrayEdgeMapSource import ArrayEdgeMapSource
+from .EdgeMapSource import EdgeMapSource
+from .PointData import PointData
+from .Projection import Projection
+
+""" Edge map source that downloads the whole region of interest in a few large chunks when the first fragment is
+requested and cuts the following fragments from it. Fragments outside of the region are loaded from the wrapped
+source one by one """
+
+
+def fetch_url(url: str, timeout: float = 300) -> bytes:
+    """ Downloads content of the url """
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.read()
+
+
+class BulkEdgeMapSource(EdgeMapSource):
+
+    def __init__(self, edge_map_source: EdgeMapSource, region: tuple[float, float, float, float],
+                 url_provider: Callable[[float, float, int, int, Projection, int], str] = None,
+                 fetch: Callable[[str], bytes] = fetch_url, max_chunk_size: int = 2040, max_workers: int = 4):
+        self.__edge_map_source = edge_map_source  # used for fragments that are outside of the region
+        self.__region = region  # (min_x, min_y, max_x, max_y) in meters
+        # returns url of NPY file with the chunk: (origin_x, origin_y, width, height, projection, scale) -> url, where
+        # origin is the center of the top left pixel in meters
+        self.__url_provider = url_provider if url_provider is not None else edge_map_source.get_download_url
+        self.__fetch = fetch
+        self.__max_chunk_size = max_chunk_size  # width and height of the chunk in pixels
+        self.__max_workers = max_workers
+        self.__lock = threading.Lock()
+        self.__region_source: ArrayEdgeMapSource = None
+        self.__region_parameters = None  # (crs, scale, origin_x, origin_y, width, height) of the downloaded region
+
+    def load_fragment(self, center_point: PointData, buffer_radius: float, projection: Projection,
+                      scale: int) -> np.array:
+        """ Returns fragment cut from the downloaded region or loads it from the wrapped source """
+        with self.__lock:
+            if self.__region_parameters is None:
+                self.__load_region(buffer_radius, projection, scale)
+
+        if self.__region_source is not None and self.__contains(center_point, buffer_radius, projection, scale):
+            return self.__region_source.load_fragment(center_point, buffer_radius, projection, scale)
+        print("Map fragment is outside of the downloaded region")
+        return self.__edge_map_source.load_fragment(center_point, buffer_radius, projection, scale)
+
+    def __load_region(self, buffer_radius: float, projection: Projection, scale: int) -> None:
+        """ Downloads the region expanded to whole fragments """
+        fragment_size = int(round(2 * buffer_radius / scale)) + 1
+        min_x, min_y, max_x, max_y = self.__region
+        # absolute pixel coordinates, y axis of the image is directed down
+        start_x = math.floor(round(min_x / scale) / fragment_size) * fragment_size
+        start_y = math.floor(round(-max_y / scale) / fragment_size) * fragment_size
+        end_x = math.ceil((round(max_x / scale) + 1) / fragment_size) * fragment_size
+        end_y = math.ceil((round(-min_y / scale) + 1) / fragment_size) * fragment_size
+        origin_x, origin_y = float(start_x * scale), float(-start_y * scale)
+        width, height = end_x - start_x, end_y - start_y
+        self.__region_parameters = (projection.crs, scale, origin_x, origin_y, width, height)
+
+        chunks = [(x, y, min(self.__max_chunk_size, width - x), min(self.__max_chunk_size, height - y))
+                  for y in range(0, height, self.__max_chunk_size) for x in range(0, width, self.__max_chunk_size)]
+        print("Downloading region of", width, "x", height, "pixels in", len(chunks), "chunks")
+        region = np.zeros((height, width), dtype=np.float32)
+        try:
+            with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+                chunk_images = executor.map(lambda chunk: self.__download_chunk(chunk, origin_x, origin_y,
+                                                                                projection, scale), chunks)
+                for (x, y, chunk_width, chunk_height), chunk_image in zip(chunks, chunk_images):
+                    region[y:y + chunk_height, x:x + chunk_width] = chunk_image
+        # GEE refuses urls of chunks it can't export, e.g. when they exceed its request size limit
+        except (OSError, ValueError, ee.EEException) as error:
+            print("Downloading region failed, map fragments are loaded one by one:", error)
+            return
+        self.__region_source = ArrayEdgeMapSource(region, origin_x, origin_y, scale)
+
+    def __download_chunk(self, chunk: tuple[int, int, int, int], origin_x: float, origin_y: float,
+                         projection: Projection, scale: int) -> np.array:
+        """ Downloads chunk (x, y, width, height) of the region and decodes it into an array """
+        x, y, width, height = chunk
+        url = self.__url_provider(origin_x + x * scale, origin_y - y * scale, width, height, projection, scale)
+        image = np.load(io.BytesIO(self.__fetch(url)), allow_pickle=False)
+        if image.dtype.names is not None:
+            image = image[image.dtype.names[0]]  # bands of the image are stored as fields of structured array
+        if image.shape != (height, width):
+            raise ValueError(f"Chunk has shape {image.shape} instead of {(height, width)}")
+        return image
+
+    def __contains(self, center_point: PointData, buffer_radius: float, projection: Projection, scale: int) -> bool:
+        """ Checks if the whole fragment is inside of the downloaded region """
+        crs, region_scale, origin_x, origin_y, width, height = self.__region_parameters
+        if crs != projection.crs or region_scale != scale:
+            return False
+        center_x, center_y = center_point.get_coordinates_meters()
+        fragment_size = int(round(2 * buffer_radius / scale)) + 1
+        start_x = int(round((center_x - buffer_radius - origin_x) / scale))
+        start_y = int(round((origin_y - center_y - buffer_radius) / scale))
+        return 0 <= start_x and start_x + fragment_size <= width and 0 <= start_y and start_y + fragment_size <= height
@@ -0,0 +1,37 @@
+import numpy as np
+from .EdgeMapSource import EdgeMapSource
+from .PointData import PointData
+from .Projection import Projection
+from .TileCache import TileCache
+
+""" Edge map source that serves map fragments from the TileCache and loads only the missing ones from the wrapped
+source """
+
+
+class CachedEdgeMapSource(EdgeMapSource):
+
+    def __init__(self, edge_map_source: EdgeMapSource, tile_cache: TileCache, parameters_hash: str):
+        self.__edge_map_source = edge_map_source
+        self.__tile_cache = tile_cache
+        self.__parameters_hash = parameters_hash  # hash of the edge detection parameters
+
+    def load_fragment(self, center_point: PointData, buffer_radius: float, projection: Projection,
+                      scale: int) -> np.array:
+        """ Returns fragment from the cache, loads and stores it if it isn't cached yet """
+        key = self.__get_key(center_point, buffer_radius, projection, scale)
+        fragment = self.__tile_cache.get(key)
+        if fragment is not None:
+            print("Map fragment loaded from cache")
+            return fragment
+
+        fragment = self.__edge_map_source.load_fragment(center_point, buffer_radius, projection, scale)
+        self.__tile_cache.put(key, fragment)
+        return fragment
+
+    def __get_key(self, center_point: PointData, buffer_radius: float, projection: Projection, scale: int) -> str:
+        """ Fragment is identified by its center on the pixel grid, size, projection, scale and edge detection
+        parameters """
+        center_x, center_y = center_point.get_coordinates_meters()
+        grid_index = (int(round(center_x / scale)), int(round(center_y / scale)))
+        return TileCache.create_key(grid_index, buffer_radius, projection.crs, scale,
+                                    self.__parameters_hash)
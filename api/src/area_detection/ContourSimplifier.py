@@ -0,0 +1,66 @@
+import numpy as np
+import cv2 as cv
+
+""" Simplification of the detected contours with Douglas-Peucker algorithm and tolerance in meters. Holes are simplified
+only as long as they stay inside of their simplified outer contour, so topology of the areas doesn't change """
+
+
+class ContourSimplifier:
+
+    def __init__(self, tolerance: float = 10, resolution: float = 10, max_attempts: int = 4):
+        self.__tolerance = tolerance  # maximal distance in meters between original and simplified contour
+        self.__resolution = resolution  # size of the pixel in meters
+        self.__max_attempts = max_attempts  # number of times the tolerance is halved for contour that breaks topology
+        self.__vertices_before = 0
+        self.__vertices_after = 0
+
+    def simplify(self, contours: list[np.array], hierarchy: np.array) -> list[np.array]:
+        """ Returns simplified contours in the same order, so hierarchy found by OpenCV stays valid """
+        self.__vertices_before = sum(len(contour) for contour in contours)
+        if self.__tolerance <= 0 or len(contours) == 0:
+            self.__vertices_after = self.__vertices_before
+            return list(contours)
+
+        parents = hierarchy.reshape(-1, 4)[:, 3] if hierarchy is not None else np.full(len(contours), -1)
+        simplified = [None] * len(contours)
+        # parents are simplified before their children, as children are tested against simplified parent
+        for index in sorted(range(len(contours)), key=lambda index: self.__get_depth(parents, index)):
+            parent = simplified[parents[index]] if parents[index] >= 0 else None
+            simplified[index] = self.__simplify_contour(contours[index], parent)
+
+        self.__vertices_after = sum(len(contour) for contour in simplified)
+        print("Contours simplified from", self.__vertices_before, "to", self.__vertices_after, "vertices")
+        return simplified
+
+    def get_vertex_counts(self) -> tuple[int, int]:
+        """ Returns number of vertices before and after the last simplification """
+        return self.__vertices_before, self.__vertices_after
+
+    def __simplify_contour(self, contour: np.array, parent: np.array) -> np.array:
+        """ Simplifies contour with decreasing tolerance until it is valid, returns original contour otherwise """
+        epsilon = self.__tolerance / self.__resolution  # in pixels
+        for _ in range(self.__max_attempts):
+            simplified = cv.approxPolyDP(contour, epsilon, True)
+            if self.__is_valid(simplified, parent):
+                return simplified
+            epsilon /= 2
+        return contour
+
+    @staticmethod
+    def __is_valid(contour: np.array, parent: np.array) -> bool:
+        """ Contour has to remain a polygon and, if it is a hole, lie inside of its parent """
+        if len(contour) < 3:
+            return False
+        if parent is None:
+            return True
+        parent_points = parent.reshape(-1, 2).astype(np.float32)
+        return all(cv.pointPolygonTest(parent_points, (float(x), float(y)), False) >= 0
+                   for x, y in contour.reshape(-1, 2))
+
+    @staticmethod
+    def __get_depth(parents: np.array, index: int) -> int:
+        depth = 0
+        while parents[index] >= 0:
+            index = parents[index]
+            depth += 1
+        return depth
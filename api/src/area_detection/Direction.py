@@ -5,4 +5,14 @@ class Direction(Enum):
     TOP = 0
     BOTTOM = 1
     LEFT = 2
-    RIGHT = 3
\ No newline at end of file
+    RIGHT = 3
+
+    def get_offset(self) -> tuple[int, int]:
+        """ Returns (col, row) offset of the adjacent map fragment in this direction """
+        return {Direction.TOP: (0, -1), Direction.BOTTOM: (0, 1), Direction.LEFT: (-1, 0),
+                Direction.RIGHT: (1, 0)}[self]
+
+    def opposite(self) -> 'Direction':
+        """ Returns direction that points the other way """
+        return {Direction.TOP: Direction.BOTTOM, Direction.BOTTOM: Direction.TOP, Direction.LEFT: Direction.RIGHT,
+                Direction.RIGHT: Direction.LEFT}[self]
\ No newline at end of file
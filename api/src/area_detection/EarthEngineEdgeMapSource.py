@@ -0,0 +1,54 @@
+import ee
+import threading
+import numpy as np
+from .EdgeDetector import EdgeDetector
+from .EdgeMapSource import EdgeMapSource
+from .PointData import PointData
+from .Projection import Projection
+
+""" Edge map source that downloads map fragments from the Google Earth Engine image """
+
+
+class EarthEngineEdgeMapSource(EdgeMapSource):
+
+    def __init__(self, edge_map: ee.Image = None, edge_detector: EdgeDetector = None):
+        self.__edge_map = edge_map
+        # if edge map isn't passed, edge detection runs when the first fragment is downloaded
+        self.__edge_detector = edge_detector
+        self.__lock = threading.Lock()
+
+    def __get_edge_map(self) -> ee.Image:
+        """ Returns edge map, runs edge detection if it wasn't run yet """
+        with self.__lock:
+            if self.__edge_map is None:
+                print("Detection of edges is starting")
+                self.__edge_map = self.__edge_detector.detect_and_return_merged_bands()
+                print("Detection of edges is finished")
+            return self.__edge_map
+
+    def load_fragment(self, center_point: PointData, buffer_radius: float, projection: Projection,
+                      scale: int) -> np.array:
+        """ Converts map rectangle around center point to NumPy array """
+        # select buffer around center point
+        buffer = center_point.get_gee_point().buffer(buffer_radius, proj=projection.get_gee_projection())
+        img = self.__get_edge_map().reproject(projection.get_gee_projection(), None, scale)
+        img = img.sampleRectangle(region=buffer, defaultValue=0).getInfo()
+
+        # selecting band of the image
+        img = np.array(img['properties']['merged_band'], dtype=float)
+        return img
+
+    def get_download_url(self, origin_x: float, origin_y: float, width: int, height: int, projection: Projection,
+                         scale: int) -> str:
+        """ Returns url of NPY file with the edge map on the grid of width x height pixels, origin is the center of
+        the top left pixel in meters """
+        img = self.__get_edge_map().unmask(0).toFloat()
+        # transformation describes the corner of the top left pixel
+        crs_transform = [scale, 0, origin_x - scale / 2, 0, -scale, origin_y + scale / 2]
+        return img.getDownloadURL({
+            'bands': ['merged_band'],
+            'crs': projection.crs,
+            'crs_transform': crs_transform,
+            'dimensions': f'{width}x{height}',
+            'format': 'NPY'
+        })
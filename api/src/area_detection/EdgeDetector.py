@@ -1,5 +1,6 @@
 import ee
 import geemap
+import hashlib
 from .PointData import PointData
 
 """Class detecting edges in images using different bands from Sentinel-2"""
@@ -19,6 +20,7 @@ class EdgeDetector:
         self.__points = points
         self.__map_center = map_center
         self.__cloud_filter_threshold = 5
+        self.__closing_radius = 25  # radius in meters of the closing that connects edges of all periods
         self.__image = None
 
     # function used to mask clouds on Sentinel-2 images comes from: https://developers.google.com/earth-engine/datasets/catalog/COPERNICUS_S2_SR_HARMONIZED#colab-python
@@ -96,21 +98,25 @@ class EdgeDetector:
 
         return high_threshold_detection.Or(hysteresis_threshold)
 
+    def __run_period_detection(self, time_period: tuple[str]) -> ee.Image:
+        """ Returns bands of the time period with edges detected on the segmented NDVI as NDVI_mean band """
+        result_image = self.__get_map(time_period)
+        result_image = result_image.addBands(self.__get_NDVI(result_image))
+        segmentated_image = self.__segmentate_map(result_image)
+        return result_image.addBands(self.__detect_edges(segmentated_image.select("NDVI_mean")))
+
     def __run_detection(self) -> ee.Image:
         """ Function that runs edge detection algorithm """
         self.__image = ee.Image.constant(0).updateMask(ee.Image(0))
         for time_period in self.__time_periods:
-            result_image = self.__get_map(time_period)
-            result_image = result_image.addBands(self.__get_NDVI(result_image))
-            segmentated_image = self.__segmentate_map(result_image)
-            result_image = result_image.addBands(self.__detect_edges(segmentated_image.select("NDVI_mean")))
-            self.__image = self.__image.addBands(result_image)
+            self.__image = self.__image.addBands(self.__run_period_detection(time_period))
 
         mean_band_image = self.__image.select([name for name in self.__image.bandNames().getInfo() if '_mean' in name])
 
         merged_band = (ee.ImageCollection(mean_band_image).toBands()).reduce(ee.Reducer.max())
         # merged_band = merged_band.selfMask().unmask(0).focalMax(10)  # applying dilation to make edges thicker
-        merged_band = merged_band.focalMax(25, units="meters").focalMin(25, units="meters")  # applying opening to connect edges
+        merged_band = merged_band.focalMax(self.__closing_radius, units="meters").focalMin(
+            self.__closing_radius, units="meters")  # applying opening to connect edges
         self.__image = self.__image.addBands(merged_band.rename("merged_band"))
 
     def __prepare_result_map(self, result_image: ee.Image) -> geemap.Map:
@@ -132,6 +138,26 @@ class EdgeDetector:
         resultMap.addLayer(self.__image.select('merged_band').selfMask(), {"palette": ["ffffff"]}, 'Merged band')
         return resultMap
 
+    def get_time_periods(self) -> list[tuple[str, str]]:
+        return self.__time_periods
+
+    def get_closing_radius(self) -> float:
+        """ Returns radius in meters of the closing that connects edges of the merged band """
+        return self.__closing_radius
+
+    def get_period_parameters_hash(self, period: int) -> str:
+        """ Returns hash of the parameters that have impact on the edges of the single time period, composites are
+        made of the scenes that contain the map center, so it is a part of the hash """
+        map_center = tuple(float(coordinate) for coordinate in self.__map_center.get_coordinates_degrees())
+        parameters = (self.__time_periods[period], self.__bands, self.__thresholds, self.__sigma, self.__distance,
+                      self.__cloud_filter_threshold, map_center)
+        return hashlib.sha256(repr(parameters).encode('utf-8')).hexdigest()
+
+    def detect_period_edges(self, period: int) -> ee.Image:
+        """ Returns image with edges of the single time period as merged_band, so it can be downloaded the same way
+        as the merged edges of all periods """
+        return self.__run_period_detection(self.__time_periods[period]).select(['NDVI_mean'], ['merged_band'])
+
     def detect_and_show_on_map(self) -> geemap.Map:
         """ You can use this function to show results on GEE Map """
         self.__run_detection()
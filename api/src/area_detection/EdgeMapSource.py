@@ -0,0 +1,13 @@
+import numpy as np
+from .PointData import PointData
+from .Projection import Projection
+
+""" Base class of raster sources that provide edge map fragments to the AreaDetector """
+
+
+class EdgeMapSource:
+
+    def load_fragment(self, center_point: PointData, buffer_radius: float, projection: Projection,
+                      scale: int) -> np.array:
+        """ Returns square edge map fragment around center point as a NumPy array """
+        raise NotImplementedError("EdgeMapSource subclasses have to implement load_fragment")
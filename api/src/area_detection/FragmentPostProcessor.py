@@ -0,0 +1,65 @@
+from typing import Callable
+import numpy as np
+import cv2 as cv
+from .PostProcessingStage import PostProcessingStage
+
+WHITE = 255
+
+DEFAULT_STAGES = [(PostProcessingStage.BAND_THRESHOLD, (0.0, 1.0)), (PostProcessingStage.CLOSE, 7),
+                  (PostProcessingStage.BINARISE, 0)]
+
+""" Vectorised post-processing pipeline of map fragments. All stages write into one uint8 buffer, so no temporary
+image is allocated per stage. Pipeline works on a single fragment (H, W) or on a batch of fragments (N, H, W) """
+
+
+class FragmentPostProcessor:
+
+    def __init__(self, stages: list[tuple[PostProcessingStage, object]] = None):
+        self.__stages = stages if stages is not None else DEFAULT_STAGES
+
+    def process(self, images: np.array,
+                stage_callback: Callable[[PostProcessingStage, np.array], None] = None) -> np.array:
+        """ Runs all stages on the fragments and returns result as uint8 array of the same shape, stage_callback is
+        called with the result after every stage """
+        batch = images if images.ndim == 3 else images[np.newaxis]
+        batch = np.ascontiguousarray(batch)
+        result = np.empty(batch.shape, dtype=np.uint8)
+        # pixel-wise stages see the whole batch as one tall image, so every stage is a single OpenCV call
+        flat_result = result.reshape(-1, result.shape[-1])
+        is_result_initialized = False
+
+        for stage, parameter in self.__stages:
+            source = flat_result if is_result_initialized else batch.reshape(-1, batch.shape[-1])
+            if stage == PostProcessingStage.BAND_THRESHOLD:
+                low, high = parameter
+                # inRange includes both bounds, so they are moved to the next representable values
+                cv.inRange(source, self.__next_value(source, low, np.inf), self.__next_value(source, high, -np.inf),
+                           dst=flat_result)
+            elif stage == PostProcessingStage.BINARISE:
+                if is_result_initialized:
+                    cv.threshold(source, parameter, WHITE, cv.THRESH_BINARY, dst=flat_result)
+                else:
+                    cv.inRange(source, self.__next_value(source, parameter, np.inf), np.finfo(np.float64).max,
+                               dst=flat_result)
+            elif stage == PostProcessingStage.CLOSE:
+                if not is_result_initialized:
+                    np.copyto(flat_result, source, casting='unsafe')
+                kernel = np.ones((parameter, parameter), np.uint8)
+                # morphology can't be run on the stacked batch as it would connect neighbouring fragments
+                for fragment in result:
+                    cv.morphologyEx(fragment, cv.MORPH_CLOSE, kernel, dst=fragment)
+            is_result_initialized = True
+
+            if stage_callback is not None:
+                stage_callback(stage, result)
+
+        if not is_result_initialized:
+            np.copyto(result, batch, casting='unsafe')
+        return result if images.ndim == 3 else result[0]
+
+    @staticmethod
+    def __next_value(source: np.array, value: float, direction: float) -> float:
+        """ Returns next value after threshold that is representable in the data type of the source """
+        if np.issubdtype(source.dtype, np.floating):
+            return float(np.nextafter(source.dtype.type(value), source.dtype.type(direction)))
+        return float(np.floor(value) + 1 if direction > 0 else np.ceil(value) - 1)
@@ -0,0 +1,27 @@
+import numpy as np
+
+""" Affine transformation between pixel coordinates of the merged map and coordinates of the projection in meters """
+
+
+class GeoTransform:
+
+    def __init__(self, origin_x: float, origin_y: float, pixel_size: float):
+        self.origin_x = origin_x  # coordinates in meters of the center of the top left pixel
+        self.origin_y = origin_y
+        self.pixel_size = pixel_size
+
+    def pixels_to_meters(self, pixels: np.array) -> np.array:
+        """ Converts array of pixel coordinates with shape (N, 2) into array of coordinates in meters """
+        pixels = np.asarray(pixels, dtype=float).reshape(-1, 2)
+        meters = np.empty_like(pixels)
+        meters[:, 0] = self.origin_x + pixels[:, 0] * self.pixel_size
+        meters[:, 1] = self.origin_y - pixels[:, 1] * self.pixel_size  # y axis of image is directed down
+        return meters
+
+    def meters_to_pixels(self, meters: np.array) -> np.array:
+        """ Converts array of coordinates in meters with shape (N, 2) into array of pixel coordinates """
+        meters = np.asarray(meters, dtype=float).reshape(-1, 2)
+        pixels = np.empty(meters.shape, dtype=int)
+        pixels[:, 0] = np.round((meters[:, 0] - self.origin_x) / self.pixel_size)
+        pixels[:, 1] = np.round((self.origin_y - meters[:, 1]) / self.pixel_size)
+        return pixels
@@ -0,0 +1,73 @@
+import numpy as np
+
+""" Closed-form ellipsoidal Lambert Azimuthal Equal Area projection (EPSG method 9820), transforms whole arrays of
+coordinates at once. Formulas come from IOGP Guidance Note 7-2, section 3.2.3 """
+
+
+class LambertAzimuthalEqualArea:
+
+    def __init__(self, latitude_origin: float, longitude_origin: float, false_easting: float,
+                 false_northing: float, semi_major_axis: float = 6378137.0,
+                 inverse_flattening: float = 298.257222101):
+        flattening = 1 / inverse_flattening
+        self.__a = semi_major_axis
+        self.__e2 = 2 * flattening - flattening ** 2
+        self.__e = np.sqrt(self.__e2)
+        self.__longitude_origin = np.radians(longitude_origin)
+        self.__false_easting = false_easting
+        self.__false_northing = false_northing
+
+        latitude_origin = np.radians(latitude_origin)
+        self.__q_p = self.__calculate_q(np.pi / 2)
+        self.__beta_origin = np.arcsin(self.__calculate_q(latitude_origin) / self.__q_p)
+        self.__r_q = self.__a * np.sqrt(self.__q_p / 2)
+        self.__d = (self.__a * np.cos(latitude_origin) / np.sqrt(1 - self.__e2 * np.sin(latitude_origin) ** 2) /
+                    (self.__r_q * np.cos(self.__beta_origin)))
+
+        # coefficients of the series that converts authalic latitude back to geodetic latitude
+        e4, e6 = self.__e2 ** 2, self.__e2 ** 3
+        self.__series = (self.__e2 / 3 + 31 * e4 / 180 + 517 * e6 / 5040,
+                         23 * e4 / 360 + 251 * e6 / 3780,
+                         761 * e6 / 45360)
+
+    def __calculate_q(self, latitude: np.array) -> np.array:
+        sin_latitude = np.sin(latitude)
+        return (1 - self.__e2) * (sin_latitude / (1 - self.__e2 * sin_latitude ** 2) -
+                                  1 / (2 * self.__e) * np.log((1 - self.__e * sin_latitude) /
+                                                              (1 + self.__e * sin_latitude)))
+
+    def forward(self, longitude: np.array, latitude: np.array) -> tuple[np.array, np.array]:
+        """ Transforms coordinates in degrees into projected coordinates in meters """
+        longitude_delta = np.radians(np.asarray(longitude, dtype=float)) - self.__longitude_origin
+        beta = np.arcsin(np.clip(self.__calculate_q(np.radians(np.asarray(latitude, dtype=float))) / self.__q_p,
+                                 -1, 1))
+
+        cos_beta = np.cos(beta)
+        b = self.__r_q * np.sqrt(2 / (1 + np.sin(self.__beta_origin) * np.sin(beta) +
+                                      np.cos(self.__beta_origin) * cos_beta * np.cos(longitude_delta)))
+        x = self.__false_easting + b * self.__d * cos_beta * np.sin(longitude_delta)
+        y = self.__false_northing + (b / self.__d) * (np.cos(self.__beta_origin) * np.sin(beta) -
+                                                      np.sin(self.__beta_origin) * cos_beta *
+                                                      np.cos(longitude_delta))
+        return x, y
+
+    def inverse(self, x: np.array, y: np.array) -> tuple[np.array, np.array]:
+        """ Transforms projected coordinates in meters into coordinates in degrees """
+        easting = np.asarray(x, dtype=float) - self.__false_easting
+        northing = np.asarray(y, dtype=float) - self.__false_northing
+
+        rho = np.sqrt((easting / self.__d) ** 2 + (self.__d * northing) ** 2)
+        c = 2 * np.arcsin(np.clip(rho / (2 * self.__r_q), -1, 1))
+        sin_c, cos_c = np.sin(c), np.cos(c)
+        safe_rho = np.where(rho == 0, 1, rho)  # point in the origin of the projection
+
+        beta = np.arcsin(np.clip(cos_c * np.sin(self.__beta_origin) +
+                                 self.__d * northing * sin_c * np.cos(self.__beta_origin) / safe_rho, -1, 1))
+        longitude = self.__longitude_origin + np.arctan2(
+            easting * sin_c,
+            self.__d * rho * np.cos(self.__beta_origin) * cos_c -
+            self.__d ** 2 * northing * np.sin(self.__beta_origin) * sin_c)
+        latitude = (beta + self.__series[0] * np.sin(2 * beta) + self.__series[1] * np.sin(4 * beta) +
+                    self.__series[2] * np.sin(6 * beta))
+
+        return np.degrees(longitude), np.degrees(latitude)
@@ -0,0 +1,122 @@
+import os
+import numpy as np
+import cv2 as cv
+from concurrent.futures import ProcessPoolExecutor
+from skimage.feature import canny
+from skimage.segmentation import slic
+from .ArrayEdgeMapSource import ArrayEdgeMapSource
+from .PeriodEdgeMapSource import combine_period_edges
+
+"""Class detecting edges in Sentinel-2 band rasters stored on disk, it runs the same steps as EdgeDetector without
+Google Earth Engine. Scenes are processed in overlapping tiles in parallel processes"""
+
+CLOUD_BIT_MASK = 1 << 10
+CIRRUS_BIT_MASK = 1 << 11
+
+
+def detect_tile_edges(scenes: list[np.array], parameters: dict) -> np.array:
+    """ Detects edges on the tile of one time period, scenes have shape (bands, H, W) with QA60 band as the last
+    one if clouds should be masked """
+    bands_number = len(parameters['bands'])
+    reflectance_sum = np.zeros((bands_number,) + scenes[0].shape[1:], dtype=np.float32)
+    valid_count = np.zeros(scenes[0].shape[1:], dtype=np.float32)
+    for scene in scenes:
+        bands = scene[:bands_number].astype(np.float32) / 10000
+        valid = np.ones(scene.shape[1:], dtype=bool)
+        if scene.shape[0] > bands_number:
+            qa = scene[bands_number].astype(np.int64)
+            valid = (qa & CLOUD_BIT_MASK == 0) & (qa & CIRRUS_BIT_MASK == 0)
+        reflectance_sum += bands * valid
+        valid_count += valid
+
+    # mean composite of the scenes without clouds, pixels without any clear observation are masked
+    valid = valid_count > 0
+    composite = reflectance_sum / np.maximum(valid_count, 1)
+    nir, red = composite[parameters['bands'].index('B8')], composite[parameters['bands'].index('B4')]
+    ndvi = np.divide(nir - red, nir + red, out=np.zeros_like(nir), where=(nir + red) != 0)
+
+    features = np.concatenate([composite, ndvi[np.newaxis]]).transpose(1, 2, 0)
+    segments = slic(features, n_segments=max(1, features.shape[0] * features.shape[1] // parameters['size'] ** 2),
+                    compactness=parameters['compactness'], channel_axis=-1, convert2lab=False, start_label=0)
+    # mean NDVI of every superpixel
+    segment_ndvi = np.bincount(segments.ravel(), weights=ndvi.ravel()) / np.maximum(np.bincount(segments.ravel()), 1)
+    ndvi_mean = segment_ndvi[segments]
+
+    low_threshold, high_threshold = parameters['thresholds']
+    low_threshold_detection = canny(ndvi_mean, sigma=parameters['sigma'], low_threshold=low_threshold,
+                                    high_threshold=low_threshold, mask=valid).astype(np.uint8)
+    high_threshold_detection = canny(ndvi_mean, sigma=parameters['sigma'], low_threshold=high_threshold,
+                                     high_threshold=high_threshold, mask=valid).astype(np.uint8)
+    kernel = np.ones((2 * parameters['distance'] + 1, 2 * parameters['distance'] + 1), np.uint8)
+    hysteresis_threshold = low_threshold_detection & cv.dilate(high_threshold_detection, kernel)
+    return high_threshold_detection | hysteresis_threshold
+
+
+class LocalEdgeDetector:
+    def __init__(self, periods: list[list[str]], origin_x: float, origin_y: float, resolution: int = 10,
+                 tile_size: int = 1024, tile_margin: int = 32, max_workers: int = None):
+        # scenes of every time period, scene is .npy stack (bands, H, W) or directory with <band>.tif files
+        self.__periods = periods
+        self.__origin_x = origin_x  # coordinates in meters of the center of the top left pixel
+        self.__origin_y = origin_y
+        self.__resolution = resolution
+        self.__bands = ['B8', 'B4', 'B3', 'B2', 'B11']  # band used to calculate superpixels
+        # B8 and B4 bands need to be passed as NDVI is calculated using them
+        self.__thresholds = [0.06, 0.1]  # low and high threshold used for canny detection algorithm
+        self.__sigma = 3  # sigma value used for image smoothing during edge detection
+        self.__distance = 5  # max distance between edges to be connected
+        self.__superpixel_size = 15  # distance between superpixel seeds in pixels
+        self.__compactness = 0.5
+        self.__closing_radius = 25  # radius in meters of the closing that connects edges
+        self.__tile_size = tile_size
+        self.__tile_margin = tile_margin  # overlap of the tiles, edges close to the tile border are discarded
+        self.__max_workers = max_workers
+
+    def __load_scene(self, path: str) -> np.array:
+        """ Returns scene as array (bands, H, W), QA60 band is read if it is available """
+        if path.endswith('.npy'):
+            scene = np.load(path, mmap_mode='r')
+            if scene.shape[0] not in (len(self.__bands), len(self.__bands) + 1):
+                scene = np.moveaxis(scene, -1, 0)  # bands are stored as the last axis
+            return scene
+        band_paths = [os.path.join(path, band + '.tif') for band in self.__bands + ['QA60']]
+        return np.stack([cv.imread(band_path, cv.IMREAD_UNCHANGED) for band_path in band_paths
+                         if os.path.exists(band_path)])
+
+    def __get_detection_parameters(self) -> dict:
+        return {'bands': self.__bands, 'thresholds': self.__thresholds, 'sigma': self.__sigma,
+                'distance': self.__distance, 'size': self.__superpixel_size, 'compactness': self.__compactness}
+
+    def detect_period_edges(self, period: int) -> np.array:
+        """ Returns edges detected on the scenes of the time period """
+        scenes = [self.__load_scene(path) for path in self.__periods[period]]
+        height, width = scenes[0].shape[1:]
+        windows = []
+        for y in range(0, height, self.__tile_size):
+            for x in range(0, width, self.__tile_size):
+                windows.append((max(y - self.__tile_margin, 0), min(y + self.__tile_size + self.__tile_margin, height),
+                                max(x - self.__tile_margin, 0), min(x + self.__tile_size + self.__tile_margin, width),
+                                y, x))
+
+        print("Detecting edges of period", period + 1, "in", len(windows), "tiles")
+        edges = np.zeros((height, width), dtype=np.uint8)
+        parameters = self.__get_detection_parameters()
+        with ProcessPoolExecutor(max_workers=self.__max_workers) as executor:
+            futures = [executor.submit(detect_tile_edges, [np.array(scene[:, y0:y1, x0:x1]) for scene in scenes],
+                                       parameters) for y0, y1, x0, x1, _, _ in windows]
+            for (y0, y1, x0, x1, y, x), future in zip(windows, futures):
+                # only the part without margin is used, as edges near the border of the tile are less accurate
+                tile_height, tile_width = min(self.__tile_size, height - y), min(self.__tile_size, width - x)
+                edges[y:y + tile_height, x:x + tile_width] = \
+                    future.result()[y - y0:y - y0 + tile_height, x - x0:x - x0 + tile_width]
+        return edges
+
+    def detect_and_return_merged_bands(self) -> np.array:
+        """ Returns image with edges of all periods merged into one band """
+        period_edges = [self.detect_period_edges(period) for period in range(len(self.__periods))]
+        return combine_period_edges(period_edges, self.__closing_radius / self.__resolution)
+
+    def create_edge_map_source(self) -> ArrayEdgeMapSource:
+        """ Runs edge detection and returns source of map fragments for the AreaDetector """
+        return ArrayEdgeMapSource(self.detect_and_return_merged_bands(), self.__origin_x, self.__origin_y,
+                                  self.__resolution)
@@ -1,43 +1,38 @@
-import ee
-import geemap
 import numpy as np
 import cv2 as cv
 from .Direction import Direction
 from .PointData import PointData
+from .Projection import Projection
+from .FragmentPostProcessor import FragmentPostProcessor
+from .PostProcessingStage import PostProcessingStage
 
 FLOOD_FILL_COLOR = 0.5
 BLACK = 0
 WHITE = 255
 
+def find_runs(mask: np.array) -> tuple[np.array, np.array]:
+    """ Returns starts and ends (inclusive) of contiguous runs of True values in one-dimensional mask """
+    changes = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(changes == 1), np.flatnonzero(changes == -1) - 1
+
+
 """ Class that represents map fragments that are stored in AreaDetector class, makes map operations easier """
 
 
 class MapFragment:
-    def __init__(self, center_point: PointData, projection: ee.Projection, buffer_radius: float,
-                 edge_map: geemap.Map, img_resolution: int, patch_size: int, scale: int):
+    def __init__(self, center_point: PointData, projection: Projection, buffer_radius: float,
+                 map_representation: np.array, img_resolution: int, patch_size: int, scale: int):
         self.__buffer_radius = buffer_radius
         self.__img_resolution = img_resolution
-        self.__projection = ee.Projection(projection)
+        self.__projection = projection
         self.__center_point = center_point
         self.__scale = scale
         self.__patch_size = patch_size
-        if edge_map is not None:
-            self.__map_representation = self.__move_rectangle_to_numpy(edge_map)
+        if map_representation is not None:
+            self.__map_representation = map_representation
         else:
             self.__map_representation = np.zeros((self.__patch_size, self.__patch_size))
 
-
-    def __move_rectangle_to_numpy(self, edge_map: geemap.Map) -> np.array:
-        """ Converts map rectangle to NumPy array """
-        # select buffer around center point
-        buffer = self.__get_buffer_around_point(self.__center_point)
-        img = edge_map.reproject(self.__projection, None, self.__scale)
-        img = img.sampleRectangle(region=buffer, defaultValue=0).getInfo()
-
-        # selecting band of the image
-        img = np.array(img['properties']['merged_band'], dtype=float)
-        return img
-
     def contains_point(self, point: PointData) -> bool:
         """ Function that checks whether a point is inside the map fragment """
         coordinates = self.convert_point_to_img_coordinates(point)
@@ -48,15 +43,12 @@ class MapFragment:
         print('Point isn\'t inside current map fragment')
         return False
 
-    def __get_buffer_around_point(self, point: PointData) -> ee.Geometry:
-        """ Returns buffer around point """
-        return point.get_gee_point().buffer(self.__buffer_radius, proj=self.__projection)
-
     def find_near_map_fragment_center(self, x_direction: int, y_direction: int) -> PointData:
         """ Returns center point of map fragment next to the current one """
         x, y = self.__center_point.get_coordinates_meters()
-        latitude = x + x_direction * self.__buffer_radius * 2
-        longitude = y - y_direction * self.__buffer_radius * 2
+        # adjacent fragments don't overlap, so pixels of all fragments form one regular grid
+        latitude = x + x_direction * self.__patch_size * self.__img_resolution
+        longitude = y - y_direction * self.__patch_size * self.__img_resolution
         return PointData.from_coordinates_meters(latitude, longitude, self.__projection)
 
     def run_flood_fill(self, x: int, y: int):
@@ -67,24 +59,20 @@ class MapFragment:
             result = cv.floodFill(self.__map_representation, None, (x, y), FLOOD_FILL_COLOR)
             self.__map_representation[:] = result[1]
 
+    def fill_mask(self, mask: np.array) -> None:
+        """ Fills pixels selected by boolean mask with FLOOD_FILL_COLOR """
+        if self.__map_representation.dtype != np.float32:
+            self.__map_representation = self.__map_representation.astype(np.float32)
+        self.__map_representation[mask] = FLOOD_FILL_COLOR
+
     def apply_two_thresholds(self, threshold1: float = 0.0, threshold2: float = 1.0):
         """ Applies thresholding with two thresholds on map fragment to extract detected areas from image """
-        for y in range(len(self.__map_representation)):
-            for x in range(len(self.__map_representation[y])):
-                if threshold1 < self.__map_representation[y][x] < threshold2:
-                    self.__map_representation[y][x] = WHITE
-                else:
-                    self.__map_representation[y][x] = BLACK
-        self.__map_representation = self.__map_representation.astype(np.uint8)
+        self.__map_representation = FragmentPostProcessor(
+            [(PostProcessingStage.BAND_THRESHOLD, (threshold1, threshold2))]).process(self.__map_representation)
 
     def apply_one_threshold(self, threshold: float = 0):
-        for y in range(len(self.__map_representation)):
-            for x in range(len(self.__map_representation[y])):
-                if self.__map_representation[y][x] > threshold:
-                    self.__map_representation[y][x] = WHITE
-                else:
-                    self.__map_representation[y][x] = BLACK
-        self.__map_representation = self.__map_representation.astype(np.uint8)
+        self.__map_representation = FragmentPostProcessor(
+            [(PostProcessingStage.BINARISE, threshold)]).process(self.__map_representation)
 
     def apply_morphology_close(self, kernel_size: int = 5):
         """ Applies morphological close with selected kernel size to reduce discontinuity in image, mask size needs
@@ -100,33 +88,62 @@ class MapFragment:
         points_for_flood_fill = ([], [], [], [])
         # tuple that contains list of the points that will be used for flood fill to the adjacent map fragments
 
-        for i in range(len(self.__map_representation)):
-            self.__check_bound(i, 0, points_for_flood_fill[0], Direction.TOP)
-            self.__check_bound(i, -1, points_for_flood_fill[1], Direction.BOTTOM)
-            self.__check_bound(0, i, points_for_flood_fill[2], Direction.LEFT)
-            self.__check_bound(-1, i, points_for_flood_fill[3], Direction.RIGHT)
+        for direction, border in zip(Direction, self.__get_borders()):
+            positions = np.flatnonzero(border == FLOOD_FILL_COLOR)
+            points = self.__get_border_coordinates(direction.opposite(), positions)
+            points_for_flood_fill[direction.value].extend(map(tuple, points.tolist()))
 
         return points_for_flood_fill
 
-    def __check_bound(self, x: int, y: int, points_for_flood_fill: list[tuple[int, int]],
-                      direction: Direction) -> None:
-        """ Checks if an edge point is considered as a searched area and adds it to the list if that is true,
-        returns boolean that informs if previous area was closed, possible values for direction is vertical and
-        horizontal"""
-        if self.__map_representation[y][x] == FLOOD_FILL_COLOR:
-            if direction == Direction.TOP:
-                points_for_flood_fill.append((x, self.__patch_size - 1))
-            elif direction == Direction.BOTTOM:
-                points_for_flood_fill.append((x, 0))
-            elif direction == Direction.LEFT:
-                points_for_flood_fill.append((self.__patch_size - 1, y))
-            elif direction == Direction.RIGHT:
-                points_for_flood_fill.append((0, y))
+    def find_border_runs(self) -> tuple[tuple[np.array, np.array], ...]:
+        """ Finds contiguous runs of flood filled pixels on the borders of map fragment. For each Direction returns
+        array of seeds for flood fill of the adjacent map fragment (one seed per run, in its coordinates) and array
+        of extents of the runs along the border as [start, end] """
+        border_runs = []
+        for direction, border in zip(Direction, self.__get_borders()):
+            starts, ends = find_runs(border == FLOOD_FILL_COLOR)
+            border_runs.append((self.__get_border_coordinates(direction.opposite(), starts),
+                                np.stack([starts, ends], axis=1)))
+        return tuple(border_runs)
+
+    def fill_border_runs(self, border: Direction, seeds: np.array, extents: np.array) -> bool:
+        """ Runs flood fill from the runs found on the border of adjacent map fragment, runs which pixels are
+        already filled or are edges are skipped. Returns True if any flood fill was run """
+        was_flood_fill_run = False
+        for (seed_x, seed_y), (start, end) in zip(seeds, extents):
+            if self.get_pixel_value(seed_x, seed_y) == BLACK:
+                self.run_flood_fill(seed_x, seed_y)
+                was_flood_fill_run = True
+
+            # run can be split by edges on this side of the border, each part needs its own flood fill
+            unfilled_starts, _ = find_runs(self.__get_borders()[border.value][start:end + 1] == BLACK)
+            for x, y in self.__get_border_coordinates(border, unfilled_starts + start):
+                if self.get_pixel_value(x, y) == BLACK:
+                    self.run_flood_fill(x, y)
+                    was_flood_fill_run = True
+        return was_flood_fill_run
+
+    def __get_borders(self) -> tuple[np.array, np.array, np.array, np.array]:
+        """ Returns borders of map fragment in order of Direction values """
+        return (self.__map_representation[0, :], self.__map_representation[-1, :], self.__map_representation[:, 0],
+                self.__map_representation[:, -1])
+
+    def __get_border_coordinates(self, border: Direction, positions: np.array) -> np.array:
+        """ Returns (x, y) coordinates of the positions along the border """
+        fixed_coordinate = 0 if border in (Direction.TOP, Direction.LEFT) else self.__patch_size - 1
+        fixed_coordinates = np.full(positions.shape, fixed_coordinate)
+        if border in (Direction.TOP, Direction.BOTTOM):
+            return np.stack([positions, fixed_coordinates], axis=1)
+        return np.stack([fixed_coordinates, positions], axis=1)
 
     def get_image(self) -> np.array:
         """ Returns representation of map fragment as a np.array """
         return self.__map_representation
 
+    def set_image(self, map_representation: np.array) -> None:
+        """ Replaces representation of map fragment, used when fragments are processed together in a batch """
+        self.__map_representation = map_representation
+
     def get_pixel_value(self, x: int, y: int) -> float:
         return self.__map_representation[y][x]
 
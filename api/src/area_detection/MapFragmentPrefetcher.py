@@ -0,0 +1,90 @@
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, Future
+from .EdgeMapSource import EdgeMapSource
+from .PointData import PointData
+from .Projection import Projection
+from .TileIndex import TileIndex
+
+""" Class that loads map fragments in background threads, so that downloading of the next fragments overlaps with
+the area detection on the current one """
+
+
+class MapFragmentPrefetcher:
+
+    def __init__(self, edge_map_source: EdgeMapSource, tile_index: TileIndex, projection: Projection,
+                 buffer_radius: float, scale: int, max_workers: int = 8):
+        self.__edge_map_source = edge_map_source
+        self.__tile_index = tile_index  # used only to calculate positions of the tiles
+        self.__projection = projection
+        self.__buffer_radius = buffer_radius
+        self.__scale = scale
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.__lock = threading.Lock()
+        self.__futures: dict[tuple[int, int], Future] = {}
+        self.__loaded_fragments = set()  # fragments that were already handed over to the AreaDetector
+        self.__is_shut_down = False
+
+    def prefetch(self, col: int, row: int) -> None:
+        """ Schedules loading of the map fragment, does nothing if it is already loading or loaded """
+        with self.__lock:
+            future = self.__futures.get((col, row))
+            if self.__is_shut_down or (col, row) in self.__loaded_fragments \
+                    or (future is not None and not future.cancelled()):
+                return
+            self.__futures[(col, row)] = self.__executor.submit(self.__load, col, row)
+
+    def prefetch_area(self, points_meters: np.array) -> None:
+        """ Schedules loading of all map fragments that cover bounding box of the points in meters with shape
+        (N, 2) """
+        tiles = self.__tile_index.split_pixel_coordinates(self.__tile_index.get_pixel_coordinates(points_meters))
+        min_col, min_row = tiles[:, :2].min(axis=0).tolist()
+        max_col, max_row = tiles[:, :2].max(axis=0).tolist()
+        print("Prefetching", (max_col - min_col + 1) * (max_row - min_row + 1), "map fragments")
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                self.prefetch(col, row)
+
+    def prefetch_neighbours(self, col: int, row: int, offsets: list[tuple[int, int]]) -> None:
+        """ Schedules loading of map fragments next to the fragment, offsets are passed as (col, row) """
+        for col_offset, row_offset in offsets:
+            self.prefetch(col + col_offset, row + row_offset)
+
+    def get(self, col: int, row: int) -> np.array:
+        """ Returns map fragment at the tile coordinates, waits for it if it is still loading. Fragment is loaded in
+        the calling thread after the prefetcher is shut down """
+        with self.__lock:
+            future = self.__futures.get((col, row))
+            if (future is None or future.cancelled()) and not self.__is_shut_down:
+                future = self.__executor.submit(self.__load, col, row)
+                self.__futures[(col, row)] = future
+        if future is None or future.cancelled():
+            map_representation = self.__load(col, row)
+        else:
+            map_representation = future.result()
+        with self.__lock:
+            self.__futures.pop((col, row), None)
+            self.__loaded_fragments.add((col, row))
+        return map_representation
+
+    def cancel_pending(self) -> None:
+        """ Cancels loading of fragments that haven't started yet, fragments can still be loaded later on demand """
+        with self.__lock:
+            for tile, future in list(self.__futures.items()):
+                if future.cancel():
+                    del self.__futures[tile]
+
+    def shutdown(self) -> None:
+        """ Cancels loading of fragments that haven't started yet and stops the worker threads, they exit when the
+        fragments that are being loaded are finished. Called when the detection doesn't need more fragments """
+        self.cancel_pending()
+        with self.__lock:
+            self.__is_shut_down = True
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __load(self, col: int, row: int) -> np.array:
+        """ Loads map fragment from the edge map source, runs in worker thread """
+        center_x, center_y = self.__tile_index.get_tile_center(col, row)
+        center_point = PointData.from_coordinates_meters(center_x, center_y, self.__projection)
+        return self.__edge_map_source.load_fragment(center_point, self.__buffer_radius, self.__projection,
+                                                    self.__scale)
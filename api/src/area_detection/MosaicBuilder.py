@@ -0,0 +1,37 @@
+import tempfile
+import numpy as np
+from .TileIndex import TileIndex
+
+""" Class that merges map fragments from the tile index into one image. Image is allocated once with the final size
+and every fragment is copied directly into its place, so the merged map isn't copied while it is built. Large
+mosaics are kept in a memory-mapped temporary file instead of memory """
+
+
+class MosaicBuilder:
+
+    def __init__(self, patch_size: int, memmap_threshold_bytes: int = 256 * 1024 ** 2, memmap_directory: str = None):
+        self.__patch_size = patch_size
+        self.__memmap_threshold_bytes = memmap_threshold_bytes  # mosaics larger than this are memory-mapped
+        self.__memmap_directory = memmap_directory  # directory of temporary files, system default if None
+
+    def build(self, tile_index: TileIndex) -> np.array:
+        """ Returns uint8 image that covers extent of the loaded tiles, tiles that aren't loaded are left empty """
+        min_col, min_row, max_col, max_row = tile_index.get_extent()
+        shape = ((max_row - min_row + 1) * self.__patch_size, (max_col - min_col + 1) * self.__patch_size)
+        mosaic = self.__allocate(shape)
+
+        for (col, row), map_fragment in tile_index.items():
+            y = (row - min_row) * self.__patch_size
+            x = (col - min_col) * self.__patch_size
+            np.copyto(mosaic[y:y + self.__patch_size, x:x + self.__patch_size], map_fragment.get_image(),
+                      casting='unsafe')
+        return mosaic
+
+    def __allocate(self, shape: tuple[int, int]) -> np.array:
+        """ Returns zeroed uint8 buffer, buffers above the threshold are backed by a temporary file """
+        if shape[0] * shape[1] <= self.__memmap_threshold_bytes:
+            return np.zeros(shape, dtype=np.uint8)
+        print("Mosaic of size", shape, "is memory-mapped")
+        # file is removed as soon as it is closed, mapping keeps it alive as long as the mosaic is used
+        with tempfile.TemporaryFile(dir=self.__memmap_directory) as file:
+            return np.memmap(file, dtype=np.uint8, mode='w+', shape=shape)
@@ -0,0 +1,46 @@
+import math
+import numpy as np
+import cv2 as cv
+from concurrent.futures import ThreadPoolExecutor
+from .EdgeMapSource import EdgeMapSource
+from .PointData import PointData
+from .Projection import Projection
+
+""" Edge map source that merges edges of separate time periods locally, every period is loaded from its own source,
+so periods whose fragments are already cached aren't detected again """
+
+
+def create_circular_kernel(radius: float) -> np.array:
+    """ Returns kernel with pixels whose centers are not further than radius in pixels from the center, the same as
+    the circle kernel of focalMax and focalMin in Google Earth Engine """
+    size = int(math.floor(radius))
+    offsets = np.arange(-size, size + 1)
+    return (offsets[np.newaxis, :] ** 2 + offsets[:, np.newaxis] ** 2 <= radius ** 2).astype(np.uint8)
+
+
+def combine_period_edges(period_edges: list[np.array], closing_radius: float) -> np.array:
+    """ Merges edges of all periods with maximum and connects them with morphological closing with circular kernel of
+    radius given in pixels """
+    merged_band = np.zeros(period_edges[0].shape, dtype=np.uint8)
+    for edges in period_edges:
+        np.maximum(merged_band, edges, out=merged_band, casting='unsafe')
+    return cv.morphologyEx(merged_band, cv.MORPH_CLOSE, create_circular_kernel(closing_radius), dst=merged_band)
+
+
+class PeriodEdgeMapSource(EdgeMapSource):
+
+    def __init__(self, period_sources: list[EdgeMapSource], closing_radius: float):
+        self.__period_sources = period_sources  # one source of edges for every time period
+        self.__closing_radius = closing_radius  # radius in meters of the closing that connects edges
+
+    def load_fragment(self, center_point: PointData, buffer_radius: float, projection: Projection,
+                      scale: int) -> np.array:
+        """ Returns maximum of the period fragments after closing, fragments of the periods are loaded with a margin,
+        so the closing gives the same result at the border of the fragment as inside of it """
+        margin = math.ceil(self.__closing_radius / scale)  # in pixels
+        with ThreadPoolExecutor(max_workers=len(self.__period_sources)) as executor:
+            period_edges = list(executor.map(lambda source: source.load_fragment(
+                center_point, buffer_radius + margin * scale, projection, scale), self.__period_sources))
+
+        merged_band = combine_period_edges(period_edges, self.__closing_radius / scale)
+        return merged_band[margin:merged_band.shape[0] - margin, margin:merged_band.shape[1] - margin].astype(float)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import ee
+import numpy as np
+from .GeoTransform import GeoTransform
+from .PointData import PointData
+from .Projection import Projection
+from .SeedGrid import points_in_polygon
+
+""" Class that stores many points as contiguous arrays of coordinates, so that they are transformed, sorted and
+tested together instead of one PointData object at a time """
+
+
+class PointBatch:
+    def __init__(self, coordinates_degrees: np.array, projection: Projection, coordinates_meters: np.array = None):
+        # coordinates are stored in the same (longitude, latitude) order as in PointData
+        self.__coordinates_degrees = np.asarray(coordinates_degrees, dtype=float).reshape(-1, 2)
+        self.__coordinates_meters = None if coordinates_meters is None else \
+            np.asarray(coordinates_meters, dtype=float).reshape(-1, 2)
+        self.__projection = projection
+
+    @classmethod
+    def from_points(cls, points: list[PointData], projection: Projection) -> PointBatch:
+        """ Construction of class object using list of PointData objects """
+        return cls(np.array([point.get_coordinates_degrees() for point in points], dtype=float), projection)
+
+    @classmethod
+    def from_coordinates_meters(cls, coordinates_meters: np.array, projection: Projection) -> PointBatch:
+        """ Construction of class object using array of coordinates in meters with shape (N, 2) """
+        coordinates_meters = np.asarray(coordinates_meters, dtype=float).reshape(-1, 2)
+        longitudes, latitudes = projection.to_degrees(coordinates_meters[:, 0], coordinates_meters[:, 1])
+        return cls(np.stack([longitudes, latitudes], axis=1), projection, coordinates_meters)
+
+    def __len__(self) -> int:
+        return len(self.__coordinates_degrees)
+
+    def __getitem__(self, index) -> PointBatch:
+        """ Returns batch with selected points, index can be a slice, array of indices or boolean mask """
+        coordinates_meters = None if self.__coordinates_meters is None else \
+            self.__coordinates_meters[index].reshape(-1, 2)
+        return PointBatch(self.__coordinates_degrees[index], self.__projection, coordinates_meters)
+
+    def get_projection(self) -> Projection:
+        return self.__projection
+
+    def get_coordinates_degrees(self) -> np.array:
+        """ Returns coordinates of points in degrees with shape (N, 2) """
+        return self.__coordinates_degrees
+
+    def get_coordinates_meters(self) -> np.array:
+        """ Returns coordinates of points in meters with shape (N, 2), all points are transformed at once """
+        if self.__coordinates_meters is None:
+            x, y = self.__projection.to_meters(self.__coordinates_degrees[:, 0], self.__coordinates_degrees[:, 1])
+            self.__coordinates_meters = np.stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)], axis=1)
+        return self.__coordinates_meters
+
+    def get_coordinates_pixels(self, geotransform: GeoTransform) -> np.array:
+        """ Returns pixel coordinates of points on the image described by the transformation with shape (N, 2) """
+        return geotransform.meters_to_pixels(self.get_coordinates_meters())
+
+    def get_centroid(self) -> PointData:
+        """ Returns centroid of the points calculated in meters """
+        center_x, center_y = self.get_coordinates_meters().mean(axis=0)
+        return PointData.from_coordinates_meters(float(center_x), float(center_y), self.__projection)
+
+    def get_bounds_meters(self) -> tuple[float, float, float, float]:
+        """ Returns (min_x, min_y, max_x, max_y) of the points in meters """
+        min_x, min_y = self.get_coordinates_meters().min(axis=0)
+        max_x, max_y = self.get_coordinates_meters().max(axis=0)
+        return float(min_x), float(min_y), float(max_x), float(max_y)
+
+    def sort_by_angle(self, center_point: PointData) -> PointBatch:
+        """ Returns points sorted in counter-clockwise order around the center point """
+        center_x, center_y = center_point.get_coordinates_meters()
+        coordinates_meters = self.get_coordinates_meters()
+        angles = np.arctan2(coordinates_meters[:, 1] - center_y, coordinates_meters[:, 0] - center_x)
+        return self[np.argsort(angles, kind='stable')]
+
+    def contains(self, coordinates_meters: np.array) -> np.array:
+        """ Returns boolean mask of coordinates in meters with shape (M, 2) that are inside of the polygon formed by
+        the points """
+        return points_in_polygon(np.asarray(coordinates_meters, dtype=float).reshape(-1, 2),
+                                 self.get_coordinates_meters())
+
+    def get_gee_feature_collection(self) -> ee.FeatureCollection:
+        """ Returns representation of points on Google Earth Engine server side in the projection of the batch, it is
+        created only when it is needed """
+        gee_projection = self.__projection.get_gee_projection()
+        # point is created as EPSG:4326 projection by default
+        return ee.FeatureCollection([ee.Feature(ee.Geometry.Point(longitude, latitude).transform(gee_projection))
+                                     for longitude, latitude in self.__coordinates_degrees.tolist()])
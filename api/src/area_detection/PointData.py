@@ -1,32 +1,35 @@
 from __future__ import annotations
 import ee
+from .Projection import Projection
 
 """ Class used to store information about points and operations on them """
 
 
 class PointData:
-    def __init__(self, latitude: float, longitude: float, projection: ee.Projection, gee_point: ee.Geometry.Point = None):
+    def __init__(self, latitude: float, longitude: float, projection: Projection, gee_point: ee.Geometry.Point = None):
         self.__coordinates_degrees = (latitude, longitude)
-        self.__gee_point = gee_point if gee_point is not None else ee.Geometry.Point(latitude, longitude)
+        self.__gee_point = gee_point  # created on demand, as most of the operations are done locally
         self.__coordinates_meters = None
         self.__projection = projection
 
     @classmethod
-    def from_gee_point(cls, gee_point: ee.Geometry.Point, projection: ee.Projection):
+    def from_gee_point(cls, gee_point: ee.Geometry.Point, projection: Projection):
         """ Construction of class object using Google Earth Engine Point """
         latitude, longitude = gee_point.coordinates().getInfo()
         return cls(latitude, longitude, projection, gee_point)
 
     @classmethod
-    def from_coordinates_meters(cls, x: float, y: float, projection: ee.Projection):
+    def from_coordinates_meters(cls, x: float, y: float, projection: Projection):
         """ Construction of class object using coordinates in meters """
-        point = ee.Geometry.Point([x, y], projection).transform("EPSG:4326")
-        created_point = PointData.from_gee_point(point, projection)
+        latitude, longitude = projection.to_degrees(x, y)
+        created_point = cls(float(latitude), float(longitude), projection)
         created_point.__coordinates_meters = x, y
         return created_point
 
     def get_gee_point(self):
         """ Returns representation of point on Google Earth Engine server side """
+        if self.__gee_point is None:
+            self.__gee_point = ee.Geometry.Point(self.__coordinates_degrees[0], self.__coordinates_degrees[1])
         return self.__gee_point
 
     def get_coordinates_degrees(self):
@@ -36,5 +39,6 @@ class PointData:
     def get_coordinates_meters(self):
         """ Returns coordinates of point in meters """
         if self.__coordinates_meters is None:
-            self.__coordinates_meters = self.__gee_point.transform(self.__projection).coordinates().getInfo()
-        return self.__coordinates_meters
\ No newline at end of file
+            x, y = self.__projection.to_meters(self.__coordinates_degrees[0], self.__coordinates_degrees[1])
+            self.__coordinates_meters = float(x), float(y)
+        return self.__coordinates_meters
@@ -0,0 +1,7 @@
+from enum import Enum
+
+""" Enum used to configure stages of the FragmentPostProcessor """
+class PostProcessingStage(Enum):
+    BAND_THRESHOLD = 0  # parameter: (low, high), pixels with low < value < high become white
+    CLOSE = 1  # parameter: odd kernel size of morphological close
+    BINARISE = 2  # parameter: threshold, pixels with value > threshold become white
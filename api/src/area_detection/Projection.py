@@ -0,0 +1,51 @@
+import ee
+import numpy as np
+from .LambertAzimuthalEqualArea import LambertAzimuthalEqualArea
+
+# projections that can be transformed locally without requests to Google Earth Engine
+LOCAL_TRANSFORMS = {
+    'EPSG:3035': LambertAzimuthalEqualArea(latitude_origin=52, longitude_origin=10, false_easting=4321000,
+                                           false_northing=3210000)
+}
+
+""" Class that represents projection used for calculations in meters, coordinates are transformed locally if the
+projection is supported and using Google Earth Engine otherwise """
+
+
+class Projection:
+
+    def __init__(self, crs: str):
+        self.crs = crs
+        self.__local_transform = LOCAL_TRANSFORMS.get(crs)
+        self.__gee_projection = None
+
+    def get_gee_projection(self) -> ee.Projection:
+        """ Returns representation of projection on Google Earth Engine server side """
+        if self.__gee_projection is None:
+            self.__gee_projection = ee.Projection(self.crs)
+        return self.__gee_projection
+
+    def is_supported_locally(self) -> bool:
+        return self.__local_transform is not None
+
+    def to_meters(self, longitude: np.array, latitude: np.array) -> tuple[np.array, np.array]:
+        """ Transforms arrays of coordinates in degrees (EPSG:4326) into coordinates of projection in meters """
+        if self.__local_transform is not None:
+            return self.__local_transform.forward(longitude, latitude)
+        return self.__transform_on_gee(longitude, latitude, ee.Projection('EPSG:4326'), self.get_gee_projection())
+
+    def to_degrees(self, x: np.array, y: np.array) -> tuple[np.array, np.array]:
+        """ Transforms arrays of coordinates of projection in meters into coordinates in degrees (EPSG:4326) """
+        if self.__local_transform is not None:
+            return self.__local_transform.inverse(x, y)
+        return self.__transform_on_gee(x, y, self.get_gee_projection(), ee.Projection('EPSG:4326'))
+
+    @staticmethod
+    def __transform_on_gee(x: np.array, y: np.array, source: ee.Projection,
+                           target: ee.Projection) -> tuple[np.array, np.array]:
+        """ Transforms all coordinates with single request to Google Earth Engine """
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        coordinates = np.stack([x.ravel(), y.ravel()], axis=1).tolist()
+        transformed = ee.Geometry.MultiPoint(coordinates, source).transform(target, 0.001).coordinates().getInfo()
+        transformed = np.array(transformed, dtype=float).reshape(-1, 2)
+        return transformed[:, 0].reshape(x.shape), transformed[:, 1].reshape(y.shape)
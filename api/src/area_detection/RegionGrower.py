@@ -0,0 +1,121 @@
+from typing import Callable
+import numpy as np
+import cv2 as cv
+from .Direction import Direction
+from .MapFragment import MapFragment, BLACK
+
+""" Iterative region growing over the tiles of the map. Every tile is labelled once with connected components,
+components of adjacent tiles are joined across the seams with union-find and the worklist replaces recursion, so
+areas that span many tiles don't hit the recursion limit """
+
+
+class RegionGrower:
+
+    def __init__(self, get_map_fragment: Callable[[int, int], MapFragment],
+                 prefetch_neighbours: Callable[[int, int, list[tuple[int, int]]], None] = None):
+        self.__get_map_fragment = get_map_fragment  # returns fragment at (col, row), loads it when necessary
+        self.__prefetch_neighbours = prefetch_neighbours
+        # labels, global id of the first component and number of components of every labelled tile
+        self.__tile_labels: dict[tuple[int, int], tuple[np.array, int, int]] = {}
+        self.__parent: list[int] = []  # union-find forest of global component ids
+        self.__component_tiles: dict[int, tuple[int, int]] = {}  # tile of every global component id
+        self.__selected_components = set()
+        self.__skipped_seeds = 0  # seeds on the edges or inside of the areas that were already selected
+
+    def grow(self, seeds: list[tuple[int, int, int, int]]) -> None:
+        """ Fills areas that contain seeds passed as (col, row, x, y), where x and y are pixel coordinates inside
+        the tile """
+        worklist = []
+        for col, row, x, y in seeds:
+            labels, first_id = self.__get_labels(col, row)
+            if labels[y, x] == 0 or first_id + labels[y, x] - 1 in self.__selected_components:
+                self.__skipped_seeds += 1
+                continue
+            self.__select(first_id + labels[y, x] - 1, worklist)
+
+        while len(worklist) > 0:
+            component = worklist.pop()
+            col, row = self.__component_tiles[component]
+            labels, first_id = self.__get_labels(col, row)
+            local_label = component - first_id + 1
+            borders = self.__get_borders(labels)
+
+            touched_directions = [direction for direction in Direction
+                                  if np.any(borders[direction.value] == local_label)]
+            if self.__prefetch_neighbours is not None:
+                self.__prefetch_neighbours(col, row, [direction.get_offset() for direction in touched_directions])
+
+            for direction in touched_directions:
+                positions = np.flatnonzero(borders[direction.value] == local_label)
+                new_col, new_row = col + direction.get_offset()[0], row + direction.get_offset()[1]
+                neighbour_labels, neighbour_first_id = self.__get_labels(new_col, new_row)
+                neighbour_border = self.__get_borders(neighbour_labels)[direction.opposite().value]
+                for neighbour_label in np.unique(neighbour_border[positions]):
+                    if neighbour_label == 0:
+                        continue  # edge pixel on the other side of the seam
+                    neighbour_component = neighbour_first_id + neighbour_label - 1
+                    self.__union(component, neighbour_component)
+                    self.__select(neighbour_component, worklist)
+
+        self.__fill_selected_components()
+
+    def get_skipped_seeds(self) -> int:
+        return self.__skipped_seeds
+
+    def get_component_tiles(self) -> dict[int, set[tuple[int, int]]]:
+        """ Returns tiles touched by every filled area, areas are identified by the root of union-find """
+        component_tiles = {}
+        for component in self.__selected_components:
+            component_tiles.setdefault(self.__find(component), set()).add(self.__component_tiles[component])
+        return component_tiles
+
+    def __select(self, component: int, worklist: list[int]) -> None:
+        """ Marks component as filled and adds it to the worklist if it wasn't visited yet """
+        if component not in self.__selected_components:
+            self.__selected_components.add(component)
+            worklist.append(component)
+
+    def __get_labels(self, col: int, row: int) -> tuple[np.array, int]:
+        """ Returns connected components of unfilled pixels of the tile, labels the tile when it is used first time """
+        if (col, row) not in self.__tile_labels:
+            image = self.__get_map_fragment(col, row).get_image()
+            # floodFill used by MapFragment fills 4-connected pixels, so the same connectivity is used here
+            components_number, labels = cv.connectedComponents((image == BLACK).astype(np.uint8), connectivity=4,
+                                                                ltype=cv.CV_32S)
+            first_id = len(self.__parent)
+            self.__parent.extend(range(first_id, first_id + components_number - 1))
+            self.__component_tiles.update(dict.fromkeys(range(first_id, first_id + components_number - 1),
+                                                        (col, row)))
+            self.__tile_labels[(col, row)] = (labels, first_id, components_number - 1)
+        labels, first_id, _ = self.__tile_labels[(col, row)]
+        return labels, first_id
+
+    @staticmethod
+    def __get_borders(labels: np.array) -> tuple[np.array, np.array, np.array, np.array]:
+        """ Returns borders of labels in order of Direction values """
+        return labels[0, :], labels[-1, :], labels[:, 0], labels[:, -1]
+
+    def __find(self, component: int) -> int:
+        root = component
+        while self.__parent[root] != root:
+            root = self.__parent[root]
+        while self.__parent[component] != root:  # path compression
+            self.__parent[component], component = root, self.__parent[component]
+        return root
+
+    def __union(self, first_component: int, second_component: int) -> None:
+        first_root, second_root = self.__find(first_component), self.__find(second_component)
+        if first_root != second_root:
+            self.__parent[max(first_root, second_root)] = min(first_root, second_root)
+
+    def __fill_selected_components(self) -> None:
+        """ Fills all pixels of the selected components in their map fragments """
+        selected_components_by_tile = {}
+        for component in self.__selected_components:
+            selected_components_by_tile.setdefault(self.__component_tiles[component], []).append(component)
+
+        for (col, row), components in selected_components_by_tile.items():
+            labels, first_id, components_number = self.__tile_labels[(col, row)]
+            selected_labels = np.zeros(components_number + 1, dtype=bool)  # lookup table indexed by local label
+            selected_labels[np.array(components) - first_id + 1] = True
+            self.__get_map_fragment(col, row).fill_mask(selected_labels[labels])
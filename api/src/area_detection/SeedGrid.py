@@ -0,0 +1,51 @@
+import math
+import numpy as np
+
+""" Generation of the seed points of the area detection on a regular grid inside of the polygon of waypoints. Grid is
+generated locally in meters of the projection, cells of the grid are aligned to the origin of the projection """
+
+
+def points_in_polygon(points: np.array, polygon: np.array) -> np.array:
+    """ Returns boolean mask of points with shape (N, 2) that are inside of the polygon with shape (M, 2), all points
+    are tested against all edges at once with the even-odd rule """
+    x, y = points[:, 0:1], points[:, 1:2]
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    crosses = (y1 > y) != (y2 > y)  # edge crosses horizontal line going through the point
+    with np.errstate(divide='ignore', invalid='ignore'):
+        intersection_x = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+    return np.count_nonzero(crosses & (x < intersection_x), axis=1) % 2 == 1
+
+
+def get_polygon_area(polygon: np.array) -> float:
+    """ Returns area of the polygon with shape (M, 2) calculated with the shoelace formula """
+    x, y = polygon[:, 0], polygon[:, 1]
+    return float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2)
+
+
+class SeedGrid:
+
+    def __init__(self, points_distance: float = 100, max_points: int = None):
+        self.__points_distance = points_distance  # distance of generated points in meters
+        # if set, distance grows for large polygons so that grid has at most about max_points points
+        self.__max_points = max_points
+
+    def get_points_distance(self, polygon: np.array) -> float:
+        """ Returns distance between points of the grid generated for the polygon """
+        if self.__max_points is None:
+            return self.__points_distance
+        return max(self.__points_distance, math.sqrt(get_polygon_area(polygon) / self.__max_points))
+
+    def generate(self, polygon: np.array) -> np.array:
+        """ Returns centers of the grid cells inside of the polygon with vertices in meters as array with shape
+        (N, 2) """
+        polygon = np.asarray(polygon, dtype=float).reshape(-1, 2)
+        points_distance = self.get_points_distance(polygon)
+        min_x, min_y = polygon.min(axis=0)
+        max_x, max_y = polygon.max(axis=0)
+        xs = (np.arange(math.floor(min_x / points_distance), math.ceil(max_x / points_distance)) + 0.5) \
+            * points_distance
+        ys = (np.arange(math.floor(min_y / points_distance), math.ceil(max_y / points_distance)) + 0.5) \
+            * points_distance
+        grid = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+        return grid[points_in_polygon(grid, polygon)]
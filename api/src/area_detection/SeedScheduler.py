@@ -0,0 +1,39 @@
+import numpy as np
+from .TileIndex import TileIndex
+
+""" Class that groups seeds of the area detection by their tiles. Duplicated seeds are removed and tiles are visited
+row by row in serpentine order, so consecutive tiles are adjacent and loaded fragments are reused by the following
+seeds """
+
+
+class SeedScheduler:
+
+    def __init__(self, tile_index: TileIndex):
+        self.__tile_index = tile_index
+        self.__skipped_seeds = 0
+
+    def schedule(self, seeds: np.array) -> list[tuple[tuple[int, int], np.array]]:
+        """ Returns list of (col, row) of the tile and (x, y) coordinates inside the tile of its seeds with shape
+        (K, 2), seeds are passed as absolute pixel coordinates """
+        tile_seeds = np.unique(self.__tile_index.split_pixel_coordinates(seeds), axis=0)
+        self.__skipped_seeds += len(seeds) - len(tile_seeds)  # seeds that fall into the same pixel
+        if len(tile_seeds) == 0:
+            return []
+
+        cols, rows = tile_seeds[:, 0], tile_seeds[:, 1]
+        # columns of every second row are visited backwards
+        serpentine_cols = np.where((rows - rows.min()) % 2 == 0, cols, -cols)
+        tile_seeds = tile_seeds[np.lexsort((serpentine_cols, rows))]
+
+        _, starts = np.unique(tile_seeds[:, :2], axis=0, return_index=True)
+        starts = np.sort(starts)  # np.unique sorts tiles, the serpentine order is restored by positions
+        ends = np.append(starts[1:], len(tile_seeds))
+        return [((int(tile_seeds[start, 0]), int(tile_seeds[start, 1])), tile_seeds[start:end, 2:])
+                for start, end in zip(starts, ends)]
+
+    def skip(self, seeds_number: int = 1) -> None:
+        """ Counts seeds that weren't processed as their pixel was already filled """
+        self.__skipped_seeds += seeds_number
+
+    def get_skipped_seeds(self) -> int:
+        return self.__skipped_seeds
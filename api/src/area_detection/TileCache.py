@@ -0,0 +1,66 @@
+import hashlib
+import os
+import threading
+import numpy as np
+
+""" Content-addressed cache of map fragments stored on disk as .npy files, least recently used fragments are
+removed when the cache exceeds its size """
+
+
+class TileCache:
+
+    def __init__(self, directory: str, max_size_bytes: int = 1024 ** 3):
+        self.__directory = directory
+        self.__max_size_bytes = max_size_bytes
+        self.__lock = threading.Lock()
+        os.makedirs(self.__directory, exist_ok=True)
+
+    @staticmethod
+    def create_key(*parts) -> str:
+        """ Creates key of the cache entry from the values that determine content of the fragment """
+        return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> np.array:
+        """ Returns memory-mapped fragment or None if it isn't stored in cache, the array is copy-on-write so
+        changes made by the area detection never reach the file """
+        path = self.__get_path(key)
+        try:
+            fragment = np.load(path, mmap_mode='c')
+            os.utime(path)  # modification time is used to find least recently used fragments
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        return fragment
+
+    def put(self, key: str, fragment: np.array) -> None:
+        """ Stores fragment in cache and evicts least recently used fragments if cache is too big """
+        path = self.__get_path(key)
+        temporary_path = path + '.' + str(threading.get_ident()) + '.tmp'
+        with open(temporary_path, 'wb') as file:
+            np.save(file, fragment)
+        os.replace(temporary_path, path)  # file appears in the cache only when it is completely written
+        self.__evict()
+
+    def __get_path(self, key: str) -> str:
+        return os.path.join(self.__directory, key + '.npy')
+
+    def __evict(self) -> None:
+        """ Removes least recently used fragments until size of the cache is below the limit """
+        with self.__lock:
+            entries = []
+            for entry in os.scandir(self.__directory):
+                if entry.name.endswith('.npy'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            cache_size = sum(entry[1] for entry in entries)
+            for _, size, path in sorted(entries):
+                if cache_size <= self.__max_size_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                cache_size -= size
@@ -0,0 +1,79 @@
+import numpy as np
+from .GeoTransform import GeoTransform
+from .MapFragment import MapFragment
+
+""" Sparse index of map fragments keyed by absolute (col, row) coordinates of the tile. Tiles form a regular grid
+anchored at the origin of the projection, so position of every point on the grid is known without searching """
+
+
+class TileIndex:
+
+    def __init__(self, patch_size: int, img_resolution: int):
+        self.__patch_size = patch_size
+        self.__img_resolution = img_resolution
+        self.__tile_size = patch_size * img_resolution  # size of the tile in meters
+        self.__map_fragments: dict[tuple[int, int], MapFragment] = {}
+
+    def get_pixel_coordinates(self, points_meters: np.array) -> np.array:
+        """ Returns absolute pixel coordinates (x grows to the east, y grows to the south) of points in meters with
+        shape (N, 2) """
+        points_meters = np.asarray(points_meters, dtype=float).reshape(-1, 2)
+        pixels = np.empty(points_meters.shape, dtype=np.int64)
+        pixels[:, 0] = np.round(points_meters[:, 0] / self.__img_resolution)
+        pixels[:, 1] = np.round(-points_meters[:, 1] / self.__img_resolution)
+        return pixels
+
+    def get_tile_coordinates(self, point_meters: tuple[float, float]) -> tuple[int, int]:
+        """ Returns (col, row) of the tile that contains point """
+        x, y = self.get_pixel_coordinates(point_meters)[0] // self.__patch_size
+        return int(x), int(y)
+
+    def get_tile_pixel_coordinates(self, point_meters: tuple[float, float]) -> tuple[int, int, int, int]:
+        """ Returns (col, row) of the tile that contains point and (x, y) coordinates of the point inside the tile """
+        col, row, x, y = self.split_pixel_coordinates(self.get_pixel_coordinates(point_meters))[0]
+        return int(col), int(row), int(x), int(y)
+
+    def split_pixel_coordinates(self, pixels: np.array) -> np.array:
+        """ Splits absolute pixel coordinates with shape (N, 2) into array of (col, row, x, y) with shape (N, 4),
+        where x and y are pixel coordinates inside the tile """
+        pixels = np.asarray(pixels, dtype=np.int64).reshape(-1, 2)
+        return np.concatenate([pixels // self.__patch_size, pixels % self.__patch_size], axis=1)
+
+    def get_tile_origin(self, col: int, row: int) -> tuple[float, float]:
+        """ Returns coordinates in meters of the center of the top left pixel of the tile """
+        return float(col * self.__tile_size), float(-row * self.__tile_size)
+
+    def get_tile_center(self, col: int, row: int) -> tuple[float, float]:
+        """ Returns coordinates in meters of the center of the tile """
+        origin_x, origin_y = self.get_tile_origin(col, row)
+        half_size = (self.__patch_size - 1) / 2 * self.__img_resolution
+        return origin_x + half_size, origin_y - half_size
+
+    def get(self, col: int, row: int) -> MapFragment:
+        """ Returns map fragment at the position or None if it isn't loaded """
+        return self.__map_fragments.get((col, row))
+
+    def add(self, col: int, row: int, map_fragment: MapFragment) -> None:
+        self.__map_fragments[(col, row)] = map_fragment
+
+    def __contains__(self, tile: tuple[int, int]) -> bool:
+        return tile in self.__map_fragments
+
+    def __len__(self) -> int:
+        return len(self.__map_fragments)
+
+    def items(self) -> list[tuple[tuple[int, int], MapFragment]]:
+        """ Returns loaded map fragments sorted by row and column """
+        return sorted(self.__map_fragments.items(), key=lambda item: (item[0][1], item[0][0]))
+
+    def get_extent(self) -> tuple[int, int, int, int]:
+        """ Returns (min_col, min_row, max_col, max_row) of loaded tiles """
+        cols = [tile[0] for tile in self.__map_fragments]
+        rows = [tile[1] for tile in self.__map_fragments]
+        return min(cols), min(rows), max(cols), max(rows)
+
+    def get_geotransform(self) -> GeoTransform:
+        """ Returns transformation of the mosaic that covers extent of loaded tiles """
+        min_col, min_row, _, _ = self.get_extent()
+        origin_x, origin_y = self.get_tile_origin(min_col, min_row)
+        return GeoTransform(origin_x, origin_y, self.__img_resolution)
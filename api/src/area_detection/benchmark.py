@@ -0,0 +1,70 @@
+import contextlib
+import io
+import time
+import numpy as np
+from .ArrayEdgeMapSource import ArrayEdgeMapSource
+from .AreaDetector import AreaDetector
+from .PointBatch import PointBatch
+from .PointData import PointData
+from .Projection import Projection
+
+""" Benchmark of the area growing engines on synthetic fields spanning multiple map fragments. Run from the root of
+the repository with: python -m api.src.area_detection.benchmark """
+
+RESOLUTION = 10
+PATCH_SIZE = 255
+# top left pixel of the synthetic raster is the top left pixel of the tile, so the field covers whole tiles
+ORIGIN_X, ORIGIN_Y = 1843 * PATCH_SIZE * RESOLUTION, 1373 * PATCH_SIZE * RESOLUTION
+
+
+def create_open_field(tiles: int) -> np.array:
+    """ One rectangular field that covers almost all of the tiles """
+    size = tiles * PATCH_SIZE
+    edge_map = np.zeros((size, size))
+    edge_map[[0, -1], :] = 1
+    edge_map[:, [0, -1]] = 1
+    return edge_map
+
+
+def create_serpentine_field(tiles: int, corridor_width: int = 40) -> np.array:
+    """ One corridor that winds through all of the tiles, so the area crosses the seams many times """
+    edge_map = create_open_field(tiles)
+    size = edge_map.shape[0]
+    for number, y in enumerate(range(corridor_width, size - 1, corridor_width)):
+        if number % 2 == 0:
+            edge_map[y, :size - corridor_width] = 1
+        else:
+            edge_map[y, corridor_width:] = 1
+    return edge_map
+
+
+def run(edge_map: np.array, use_region_grower: bool) -> tuple[float, np.array]:
+    """ Returns time of the detection and the merged map """
+    projection = Projection('EPSG:3035')
+    edge_map_source = ArrayEdgeMapSource(edge_map, ORIGIN_X, ORIGIN_Y, RESOLUTION)
+    size = edge_map.shape[0]
+    center = PointData.from_coordinates_meters(ORIGIN_X + size / 2 * RESOLUTION, ORIGIN_Y - size / 2 * RESOLUTION,
+                                               projection)
+    seeds = PointBatch.from_coordinates_meters([(ORIGIN_X + 5 * RESOLUTION, ORIGIN_Y - 5 * RESOLUTION),
+                                                (ORIGIN_X + (size - 6) * RESOLUTION,
+                                                 ORIGIN_Y - (size - 6) * RESOLUTION)], projection)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        area_detector = AreaDetector(None, center, projection, edge_map_source, use_region_grower=use_region_grower)
+        start = time.perf_counter()
+        area_detector.run_area_detection(seeds)
+        elapsed = time.perf_counter() - start
+        area_detector.prepare_for_points_extraction()
+    return elapsed, area_detector.get_merged_map()
+
+
+if __name__ == "__main__":
+    print("field       tiles  region grower [s]  flood fill [s]  identical")
+    for name, create_field in [("open", create_open_field), ("serpentine", create_serpentine_field)]:
+        for tiles in [2, 4, 6]:
+            edge_map = create_field(tiles)
+            grower_time, grower_map = run(edge_map, True)
+            flood_fill_time, flood_fill_map = run(edge_map, False)
+            identical = grower_map.shape == flood_fill_map.shape and np.array_equal(grower_map, flood_fill_map)
+            print(f"{name:<11} {tiles * tiles:>5}  {grower_time:>17.3f}  "
+                  f"{flood_fill_time:>14.3f}  {identical}")
@@ -0,0 +1,7 @@
+from enum import Enum
+
+""" Enum used to configure which debug images are saved by the ArtifactWriter """
+class ArtifactVerbosity(Enum):
+    NONE = 0  # nothing is saved
+    SUMMARY = 1  # merged map, detected contours and planned path
+    PER_TILE = 2  # summary and images of every map fragment after loading and after every post-processing stage
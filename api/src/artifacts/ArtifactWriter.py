@@ -0,0 +1,79 @@
+import os
+import queue
+import threading
+import numpy as np
+import cv2 as cv
+from .ArtifactVerbosity import ArtifactVerbosity
+
+""" Class that saves debug images of the pipeline as PNG files in a background thread, so that writing them doesn't
+slow down handling of the request. Images are queued in a bounded queue, if the writer falls behind, the pipeline
+waits instead of keeping an unlimited number of images in memory """
+
+
+class ArtifactWriter:
+
+    def __init__(self, verbosity: ArtifactVerbosity = ArtifactVerbosity.NONE, max_queue_size: int = 64):
+        self.__verbosity = verbosity
+        self.__queue = queue.Queue(maxsize=max_queue_size)
+        self.__thread: threading.Thread = None
+        self.__lock = threading.Lock()
+
+    def is_enabled(self, verbosity: ArtifactVerbosity) -> bool:
+        """ Returns True if artifacts of the provided level are saved """
+        return verbosity != ArtifactVerbosity.NONE and self.__verbosity.value >= verbosity.value
+
+    def write(self, path: str, image: np.array, verbosity: ArtifactVerbosity = ArtifactVerbosity.SUMMARY,
+              extension: str = '.png') -> None:
+        """ Schedules saving of the image, extension of the path is replaced with the given one, so the format is PNG
+        by default. Image is copied, so it can be modified right after the call """
+        if not self.is_enabled(verbosity):
+            return
+        self.__start()
+        self.__queue.put((os.path.splitext(path)[0] + extension, np.array(image, copy=True)))
+
+    def flush(self) -> None:
+        """ Waits until all scheduled images are saved """
+        if self.__thread is not None:
+            self.__queue.join()
+
+    def close(self) -> None:
+        """ Saves scheduled images and stops the background thread """
+        with self.__lock:
+            if self.__thread is None:
+                return
+            self.__queue.put(None)
+            self.__thread.join()
+            self.__thread = None
+
+    def __start(self) -> None:
+        """ Starts the background thread when the first image is scheduled """
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name="ArtifactWriter", daemon=True)
+                self.__thread.start()
+
+    def __run(self) -> None:
+        while True:
+            item = self.__queue.get()
+            try:
+                if item is None:
+                    return
+                path, image = item
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if not cv.imwrite(path, self.__to_uint8(image)):
+                    print("Saving artifact", path, "failed")
+            except (OSError, cv.error) as error:
+                print("Saving artifact failed:", error)
+            finally:
+                self.__queue.task_done()
+
+    @staticmethod
+    def __to_uint8(image: np.array) -> np.array:
+        """ Converts image into 8-bit image, floating point images are expected to have values between 0 and 1 """
+        if image.dtype == np.uint8:
+            return image
+        if image.dtype == bool:
+            return image.astype(np.uint8) * 255
+        if np.issubdtype(image.dtype, np.floating):
+            return np.clip(image * 255, 0, 255).astype(np.uint8)
+        return np.clip(image, 0, 255).astype(np.uint8)
@@ -0,0 +1,112 @@
+import numpy as np
+from .CoverageStrategy import CoverageStrategy
+
+""" Coverage strategy that decomposes the area into boustrophedon cells and sweeps every cell in parallel lanes.
+Lanes are placed every scan_radius, a new cell starts wherever the number of lane segments changes (at holes and
+concave parts of the boundary). Cells are visited in nearest neighbour order until the travel time is used """
+
+
+class BoustrophedonAlgorithm(CoverageStrategy):
+    def __init__(self, scan_radius: float = 200, resolution: float = 20, travel_time: float = 30,
+                 velocity: float = 20, sweep_angle: float = 0):
+        super().__init__(scan_radius, resolution, travel_time, velocity)
+        self.sweep_angle = sweep_angle  # direction of the lanes in radians
+        # segments of the path are the lanes that cover the area, reordering would replace them with shorter jumps
+        self.refinable = False
+
+    def rotate(self, points: np.array, angle: float) -> np.array:
+        rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+        return np.asarray(points, dtype=float).reshape(-1, 2) @ rotation.T
+
+    def find_lane_segments(self, rings: list) -> list:
+        """ Returns (y, x_start, x_end) of the parts of every lane that are inside of the area, lanes are horizontal
+        and holes are excluded with the even-odd rule """
+        edges = np.concatenate([np.concatenate([ring, np.roll(ring, -1, axis=0)], axis=1) for ring in rings])
+        x1, y1, x2, y2 = edges[:, 0], edges[:, 1], edges[:, 2], edges[:, 3]
+        min_y, max_y = edges[:, [1, 3]].min(), edges[:, [1, 3]].max()
+        lanes_number = max(int(np.ceil((max_y - min_y) / self.scan_radius)), 1)
+        # lanes are centred, so the strip of scan_radius around every lane covers the area
+        lanes = min_y + (max_y - min_y - (lanes_number - 1) * self.scan_radius) / 2 \
+            + np.arange(lanes_number) * self.scan_radius
+
+        crosses = (y1 > lanes[:, np.newaxis]) != (y2 > lanes[:, np.newaxis])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            intersections = x1 + (lanes[:, np.newaxis] - y1) * (x2 - x1) / (y2 - y1)
+        lane_segments = []
+        for lane, lane_crosses, lane_intersections in zip(lanes, crosses, intersections):
+            xs = np.sort(lane_intersections[lane_crosses])
+            lane_segments.append([(lane, xs[index], xs[index + 1]) for index in range(0, len(xs) - 1, 2)])
+        return lane_segments
+
+    def decompose(self, lane_segments: list) -> list:
+        """ Joins segments of consecutive lanes into cells, segments are joined only if they overlap only with each
+        other, so every cell can be swept without leaving it """
+        cells = []
+        open_cells = {}  # index of the segment in the previous lane -> index of its cell
+        previous_segments = []
+        for segments in lane_segments:
+            overlaps = [[previous for previous, (_, start, end) in enumerate(previous_segments)
+                         if start <= segment[2] and segment[1] <= end] for segment in segments]
+            previous_counts = np.bincount([previous for overlap in overlaps for previous in overlap],
+                                          minlength=len(previous_segments))
+            new_open_cells = {}
+            for index, (segment, overlap) in enumerate(zip(segments, overlaps)):
+                if len(overlap) == 1 and previous_counts[overlap[0]] == 1 and overlap[0] in open_cells:
+                    cell = open_cells[overlap[0]]
+                    cells[cell].append(segment)
+                else:
+                    cell = len(cells)
+                    cells.append([segment])
+                new_open_cells[index] = cell
+            open_cells = new_open_cells
+            previous_segments = segments
+        return cells
+
+    def sweep_cell(self, cell: list, reverse_lanes: bool, start_from_end: bool) -> np.array:
+        """ Returns waypoints of the lanes of the cell, direction of the lanes alternates """
+        lanes = cell[::-1] if reverse_lanes else cell
+        points = []
+        for index, (y, start, end) in enumerate(lanes):
+            if (index % 2 == 1) != start_from_end:
+                start, end = end, start
+            points += [(start, y), (end, y)]
+        return np.array(points)
+
+    def order_cells(self, cells: list, starting_point: np.array) -> list:
+        """ Visits cells in nearest neighbour order, every cell is entered from its closest corner """
+        # corners of every cell in order (reverse_lanes, start_from_end): (False, False), (False, True), ...
+        corners = np.array([[(cell[0][1], cell[0][0]), (cell[0][2], cell[0][0]),
+                             (cell[-1][1], cell[-1][0]), (cell[-1][2], cell[-1][0])] for cell in cells])
+        remaining = np.ones(len(cells), dtype=bool)
+        position = starting_point
+        sweeps = []
+        for _ in range(len(cells)):
+            distances = np.linalg.norm(corners - position, axis=2)
+            distances[~remaining] = np.inf
+            cell, corner = np.unravel_index(np.argmin(distances), distances.shape)
+            sweeps.append(self.sweep_cell(cells[cell], corner >= 2, corner % 2 == 1))
+            position = sweeps[-1][-1]
+            remaining[cell] = False
+        return sweeps
+
+    def calculate_path(self, contours: list[int], hierarchy: list[int], starting_point: np.array,
+                       starting_direction: float, priority_field: np.array) -> (np.array, np.array, np.array, float):
+        components = self.process_contours(contours, hierarchy)
+        if len(components) == 0:
+            return None, None, None, None
+        starting_point = np.asarray(starting_point, dtype=float)
+
+        # lanes are horizontal in the rotated coordinates
+        cells = []
+        for vertices_array, obstacles in components:
+            rings = [self.rotate(ring, -self.sweep_angle) for ring in [vertices_array] + obstacles]
+            cells += self.decompose(self.find_lane_segments(rings))
+        print("Number of boustrophedon cells:", len(cells))
+        if len(cells) == 0:
+            return None, None, None, None
+
+        rotated_start = self.rotate(starting_point, -self.sweep_angle)
+        sweeps = self.order_cells(cells, rotated_start[0])
+        path = self.rotate(np.concatenate([rotated_start] + sweeps + [rotated_start]), self.sweep_angle)
+        path[0], path[-1] = starting_point, starting_point  # rotation back isn't exact
+        return self.finish_path(path, starting_direction)
@@ -0,0 +1,108 @@
+import numpy as np
+
+""" Index of the unvisited grid points used to choose the next waypoint. Points are hashed into cells of a uniform
+grid and unvisited points of every cell are kept at the beginning of its part of a swap-remove array. Cells are
+evaluated in order of the lower bound of the cost of their points and the search stops when the best cost found is
+lower than the bound of the next cell, so most of the grid isn't evaluated. The chosen point is the same as the one
+chosen by evaluating costs of all unvisited points """
+
+
+class CandidateIndex:
+    def __init__(self, grid_points: np.array, predator_cost: np.array, priority_factor: np.array,
+                 scan_radius: float, distance_weight: float, turn_weight: float, predator_weight: float,
+                 points_per_cell: int = 32):
+        self.points = np.asarray(grid_points, dtype=float).reshape(-1, 2)
+        self.predator_cost = np.asarray(predator_cost, dtype=float).ravel()
+        self.priority_factor = np.asarray(priority_factor, dtype=float).ravel()
+        self.scan_radius = scan_radius
+        self.distance_weight = distance_weight
+        self.turn_weight = turn_weight
+        self.predator_weight = predator_weight
+        self.size = len(self.points)
+        # bounds of the cells are valid only if no part of the cost is negative
+        self.can_prune = self.size > 0 and min(distance_weight, turn_weight, predator_weight) >= 0 \
+            and self.predator_cost.min() >= 0 and self.priority_factor.min() >= 0
+
+        # uniform grid with about points_per_cell points in every cell
+        minimum = self.points.min(axis=0) if self.size > 0 else np.zeros(2)
+        extent = np.maximum(self.points.max(axis=0) - minimum, 1e-9) if self.size > 0 else np.ones(2)
+        cell_size = max(np.sqrt(extent[0] * extent[1] * points_per_cell / max(self.size, 1)), extent.max() / 1024)
+        cells_shape = np.floor(extent / cell_size).astype(int) + 1
+        cell_coordinates = np.floor((self.points - minimum) / cell_size).astype(int)
+        self.cell_of_point = cell_coordinates[:, 1] * cells_shape[0] + cell_coordinates[:, 0]
+        cells_number = int(cells_shape[0] * cells_shape[1])
+
+        # unvisited points of the cell are members[cell_start:cell_start + cell_count], positions stores place of
+        # every point in members
+        self.members = np.argsort(self.cell_of_point, kind='stable')
+        self.positions = np.empty(self.size, dtype=int)
+        self.positions[self.members] = np.arange(self.size)
+        self.cell_count = np.bincount(self.cell_of_point, minlength=cells_number)
+        self.cell_start = np.concatenate([[0], np.cumsum(self.cell_count)[:-1]]).astype(int)
+
+        # bounds are calculated once for all points of the cell, they stay valid when points are removed
+        cell_ids = np.arange(cells_number)
+        self.cell_min = minimum + np.stack([cell_ids % cells_shape[0], cell_ids // cells_shape[0]], axis=1) * cell_size
+        self.cell_max = self.cell_min + cell_size
+        self.cell_min_predator = np.full(cells_number, np.inf)
+        np.minimum.at(self.cell_min_predator, self.cell_of_point, self.predator_cost)
+        self.cell_min_factor = np.full(cells_number, np.inf)
+        np.minimum.at(self.cell_min_factor, self.cell_of_point, self.priority_factor)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def remove(self, index: int) -> None:
+        """ Removes point from the candidates by swapping it with the last unvisited point of its cell """
+        cell = self.cell_of_point[index]
+        position = self.positions[index]
+        last_position = self.cell_start[cell] + self.cell_count[cell] - 1
+        last = self.members[last_position]
+        self.members[position], self.members[last_position] = last, index
+        self.positions[last], self.positions[index] = position, last_position
+        self.cell_count[cell] -= 1
+        self.size -= 1
+
+    def get_unvisited(self, cells: np.array) -> np.array:
+        return np.concatenate([self.members[self.cell_start[cell]:self.cell_start[cell] + self.cell_count[cell]]
+                               for cell in cells])
+
+    def evaluate(self, ids: np.array, current_point: np.array, current_direction: float) -> (int, float, float, float):
+        """ Returns best of the points with its cost, target angle and turn, ties are resolved by lower index """
+        deltas = self.points[ids] - current_point
+        # distances are calculated the same way as in scipy distance_matrix, so costs of ties are equal
+        distances = np.sum(np.abs(deltas) ** 2, axis=-1) ** 0.5
+        target_angles = np.arctan2(deltas[:, 1], deltas[:, 0])
+        angle_cost = (target_angles - current_direction + np.pi) % (2 * np.pi) - np.pi
+        cost = (distances / self.scan_radius * self.distance_weight + np.abs(angle_cost) * self.turn_weight
+                + self.predator_cost[ids] * self.predator_weight) * self.priority_factor[ids]
+        best = np.lexsort((ids, cost))[0]
+        return int(ids[best]), cost[best], target_angles[best], angle_cost[best]
+
+    def select(self, current_point: np.array, current_direction: float) -> (int, float, float):
+        """ Returns index of the best unvisited point, target angle and turn needed to get to it """
+        current_point = np.asarray(current_point, dtype=float)
+        cells = np.flatnonzero(self.cell_count)
+        if not self.can_prune:
+            index, _, target_angle, angle_cost = self.evaluate(self.get_unvisited(cells), current_point,
+                                                               current_direction)
+            return index, target_angle, angle_cost
+
+        # turn cost isn't negative, so cost of every point of the cell isn't lower than the bound of the cell
+        offsets = np.maximum(np.maximum(self.cell_min[cells] - current_point, current_point - self.cell_max[cells]), 0)
+        min_distances = np.sqrt(np.sum(offsets ** 2, axis=1))
+        bounds = self.cell_min_factor[cells] * (min_distances / self.scan_radius * self.distance_weight
+                                                + self.cell_min_predator[cells] * self.predator_weight)
+        # bounds are lowered a little, so rounding errors don't skip points with the same cost
+        bounds -= 1e-9 * np.abs(bounds) + 1e-12
+        order = np.argsort(bounds, kind='stable')
+
+        best = None
+        for cell, bound in zip(cells[order], bounds[order]):
+            if best is not None and bound > best[1]:
+                break
+            candidate = self.evaluate(self.get_unvisited([cell]), current_point, current_direction)
+            if best is None or (candidate[1], candidate[0]) < (best[1], best[0]):
+                best = candidate
+        index, _, target_angle, angle_cost = best
+        return index, target_angle, angle_cost
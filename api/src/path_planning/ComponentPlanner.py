@@ -0,0 +1,97 @@
+import copy
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+""" Planning of the areas that consist of several disconnected components. Every component is planned independently
+in a worker process with all the time left after flying to it and back, sub-tours are joined in nearest neighbour
+order and the joined path is cut where the UAV has to return, so the time is counted on the legs that are flown """
+
+# priority field used by all components planned in the worker, set once by the initializer of the process pool
+shared_data = {}
+
+
+def initialize_worker(priority_field) -> None:
+    shared_data.update(priority_field=priority_field)
+
+
+def create_component_grid(algorithm, vertices_array: np.array, obstacles: list) -> (np.array, float):
+    return algorithm.create_grid_with_angle(vertices_array, obstacles)
+
+
+def traverse_component(algorithm, grid_points: np.array, entry_point: np.array, entry_direction: float,
+                       priority_field: np.array) -> np.array:
+    """ Returns sub-tour of the component that starts at the entry point, without the way back to it """
+    if grid_points.size == 0:
+        return entry_point.reshape(1, 2)
+    path, _, _, _ = algorithm.traverse_the_grid(grid_points, entry_point, entry_direction, priority_field)
+    return path[:-1]
+
+
+def traverse_shared_component(algorithm, grid_points: np.array, entry_point: np.array,
+                              entry_direction: float) -> np.array:
+    """ Returns sub-tour of the component planned in the worker with the priority field of its initializer """
+    return traverse_component(algorithm, grid_points, entry_point, entry_direction, shared_data["priority_field"])
+
+
+class ComponentPlanner:
+    def __init__(self, algorithm, max_workers: int = None):
+        self.algorithm = algorithm
+        self.max_workers = max_workers
+
+    def order_components(self, grids: list, starting_point: np.array) -> list:
+        """ Orders components with nearest neighbour rule starting from the centroid of the nearest one """
+        centroids = [grid.mean(axis=0) for grid in grids]
+        remaining = [index for index, grid in enumerate(grids) if grid.size > 0]
+        order = []
+        position = starting_point
+        while len(remaining) > 0:
+            nearest = min(remaining, key=lambda index: np.linalg.norm(centroids[index] - position))
+            remaining.remove(nearest)
+            order.append(nearest)
+            position = centroids[nearest]
+        return order
+
+    def plan(self, components: list, starting_point: np.array, starting_direction: float,
+             priority_field: np.array) -> (np.array, np.array, np.array, float):
+        # raster of the priority zones is sent to every worker once instead of with every component
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=initialize_worker,
+                                 initargs=(priority_field,)) as executor:
+            grids_with_angles = list(executor.map(create_component_grid, [self.algorithm] * len(components),
+                                                  *zip(*components)))
+            grids = [grid for grid, _ in grids_with_angles]
+            # grids are created in the workers, so angles chosen there are recorded on the algorithm here
+            self.algorithm.grid_angles = [grid_angle for _, grid_angle in grids_with_angles]
+            return self.plan_grids(grids, starting_point, starting_direction, priority_field, executor)
+
+    def plan_grids(self, grids: list, starting_point: np.array, starting_direction: float, priority_field: np.array,
+                   executor: ProcessPoolExecutor = None) -> (np.array, np.array, np.array, float):
+        """ Plans components with the given waypoints, sub-tours are planned in the executor if it is given and one
+        after another otherwise. Workers of the executor have to be initialized with the priority field """
+        starting_point = np.asarray(starting_point, dtype=float)
+        sub_tours = []
+        position = starting_point
+        for index in self.order_components(grids, starting_point):
+            grid = grids[index]
+            entry_index = np.argmin(np.linalg.norm(grid - position, axis=1))
+            entry_point = grid[entry_index]
+            entry_delta = entry_point - position
+            position = grid.mean(axis=0)
+            # flight to the component and back is the least time it takes, the rest can be used inside of it
+            transit_time = 2 * self.algorithm.get_time(np.array([starting_point, entry_point]))
+            if transit_time >= self.algorithm.travel_time:
+                print("Component", index, "is skipped because of time")
+                continue
+            component_algorithm = copy.copy(self.algorithm)
+            component_algorithm.travel_time = self.algorithm.travel_time - transit_time
+            arguments = (component_algorithm, np.delete(grid, entry_index, axis=0), entry_point,
+                         np.arctan2(entry_delta[1], entry_delta[0]))
+            sub_tours.append(executor.submit(traverse_shared_component, *arguments) if executor is not None
+                             else traverse_component(*arguments, priority_field))
+        if len(sub_tours) == 0:
+            return None, None, None, None
+        if executor is not None:
+            sub_tours = [future.result() for future in sub_tours]
+
+        # joined path is cut at the first waypoint from which the UAV can't get back in time
+        path = np.concatenate([[starting_point]] + sub_tours + [[starting_point]])
+        return self.algorithm.finish_path(path, starting_direction)
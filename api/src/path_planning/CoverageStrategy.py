@@ -0,0 +1,73 @@
+import numpy as np
+
+""" Base class of the coverage strategies. Strategy plans path over the detected contours and returns it together
+with directions, turns and time of the flight, so PathPlanner can smooth paths of every strategy the same way """
+
+
+def calculate_directions_and_turns(path: np.array, starting_direction: float) -> (np.array, np.array):
+    """ Returns direction of every segment of the path and turn made at the beginning of every segment """
+    deltas = np.diff(path, axis=0)
+    directions = np.arctan2(deltas[:, 1], deltas[:, 0])
+    turns = np.diff(np.concatenate([[starting_direction], directions]))
+    turns = (turns + np.pi) % (2 * np.pi) - np.pi
+    return directions, turns
+
+
+class CoverageStrategy:
+    def __init__(self, scan_radius: float = 200, resolution: float = 20, travel_time: float = 30,
+                 velocity: float = 20):
+        self.scan_radius = scan_radius
+        self.resolution = resolution
+        self.travel_time = travel_time
+        self.velocity = velocity
+        self.refinable = True  # waypoints of the path can be reordered by TourRefiner
+
+    def process_contours(self, contours: list[int], hierarchy: list[int]) -> list:
+        # every outer contour (even depth in the contour tree) is a component with its holes as obstacles
+        parents = np.asarray(hierarchy).reshape(-1, 4)[:, 3] if hierarchy is not None else np.full(len(contours), -1)
+        depths = np.zeros(len(contours), dtype=int)
+        for index in range(len(contours)):
+            parent = parents[index]
+            while parent >= 0:
+                depths[index] += 1
+                parent = parents[parent]
+
+        components = []
+        for index, contour in enumerate(contours):
+            vertices_array = np.asarray(contour).reshape(-1, 2)
+            if depths[index] % 2 == 1 or len(vertices_array) < 3:
+                continue
+            obstacles = [np.asarray(contours[child]).reshape(-1, 2) for child in np.flatnonzero(parents == index)
+                         if len(contours[child]) >= 3]
+            components.append((vertices_array, obstacles))
+        print("Number of components:", len(components))
+        return components
+
+    def get_time(self, path: np.array) -> float:
+        """ Returns time in minutes of the flight along the path """
+        length = np.linalg.norm(np.diff(path, axis=0), axis=1).sum()
+        return length * self.resolution / self.velocity / 60
+
+    def truncate_to_travel_time(self, path: np.array) -> np.array:
+        """ Cuts the path at the last point from which the UAV can still get back to the start in time """
+        segment_lengths = np.linalg.norm(np.diff(path, axis=0), axis=1)
+        flown_length = np.concatenate([[0], np.cumsum(segment_lengths)])
+        return_length = np.linalg.norm(path - path[0], axis=1)
+        max_length = self.travel_time * 60 * self.velocity / self.resolution
+        infeasible = np.flatnonzero(flown_length + return_length > max_length)
+        if infeasible.size == 0:
+            return path
+        return np.concatenate([path[:max(infeasible[0], 1)], path[:1]])
+
+    def finish_path(self, path: np.array, starting_direction: float) -> (np.array, np.array, np.array, float):
+        """ Removes repeated points, cuts the path to the travel time and returns it with directions, turns and
+        time of the flight """
+        # consecutive duplicates would create segments without direction
+        path = path[np.concatenate([[True], np.linalg.norm(np.diff(path, axis=0), axis=1) > 0])]
+        path = self.truncate_to_travel_time(path)
+        directions, turns = calculate_directions_and_turns(path, starting_direction)
+        return path, directions, turns, self.get_time(path)
+
+    def calculate_path(self, contours: list[int], hierarchy: list[int], starting_point: np.array,
+                       starting_direction: float, priority_field: np.array) -> (np.array, np.array, np.array, float):
+        raise NotImplementedError("CoverageStrategy subclasses have to implement calculate_path")
@@ -0,0 +1,84 @@
+import copy
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from .ComponentPlanner import create_component_grid
+
+""" Planning for several UAVs flying over the same area. Waypoints of the grid are split into one region per vehicle
+with weighted k-means, every region gets number of waypoints proportional to the distance its vehicle can fly.
+Regions are cells of a power diagram, so they are convex and don't overlap. Every region is planned in its own worker
+process, vehicles start from the same point """
+
+
+# priority field used by all vehicles planned in the worker, set once by the initializer of the process pool
+shared_data = {}
+
+
+def initialize_worker(priority_field) -> None:
+    shared_data.update(priority_field=priority_field)
+
+
+def plan_vehicle(algorithm, grid_points: np.array, starting_point: np.array,
+                 starting_direction: float) -> (np.array, np.array, np.array, float):
+    if grid_points.size == 0:
+        return None, None, None, None
+    return algorithm.traverse_the_grid(grid_points, starting_point, starting_direction, shared_data["priority_field"])
+
+
+class FleetPlanner:
+    def __init__(self, algorithm, max_workers: int = None, iterations: int = 100):
+        self.algorithm = algorithm
+        self.max_workers = max_workers
+        self.iterations = iterations
+
+    def partition(self, grid_points: np.array, capacities: np.array) -> np.array:
+        """ Returns index of the region of every waypoint, sizes of the regions are proportional to capacities """
+        capacities = np.asarray(capacities, dtype=float)
+        targets = len(grid_points) * capacities / capacities.sum()
+        # regions start as strips along the longest axis of the grid
+        centred = grid_points - grid_points.mean(axis=0)
+        main_axis = np.linalg.svd(centred, full_matrices=False)[2][0]
+        order = np.argsort(centred @ main_axis, kind='stable')
+        boundaries = np.concatenate([[0], np.cumsum(targets)]).astype(int)
+        centres = np.array([grid_points[order[boundaries[index]:max(boundaries[index + 1], boundaries[index] + 1)]]
+                           .mean(axis=0) for index in range(len(capacities))])
+
+        # bias of the region is subtracted from squared distances to its centre, it grows when region is too small
+        biases = np.zeros(len(capacities))
+        scale = np.mean(np.sum(centred ** 2, axis=1)) / len(capacities)
+        labels = np.zeros(len(grid_points), dtype=int)
+        for _ in range(self.iterations):
+            distances = np.sum((grid_points[:, None, :] - centres[None, :, :]) ** 2, axis=2) - biases
+            labels = np.argmin(distances, axis=1)
+            counts = np.bincount(labels, minlength=len(capacities))
+            biases += scale * (targets - counts) / np.maximum(targets, 1) * 0.5
+            biases -= biases.mean()
+            for region in np.flatnonzero(counts):
+                centres[region] = grid_points[labels == region].mean(axis=0)
+        return labels
+
+    def plan(self, components: list, vehicles: list[tuple[float, float]], starting_point: np.array,
+             starting_direction: float, priority_field) -> list:
+        """ Returns (path, directions, turns, time) of every vehicle given as (velocity, travel_time), velocity in
+        meters per second and travel time in minutes """
+        starting_point = np.asarray(starting_point, dtype=float)
+        # raster of the priority zones is sent to every worker once instead of with every vehicle
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=initialize_worker,
+                                 initargs=(priority_field,)) as executor:
+            grids_with_angles = list(executor.map(create_component_grid, [self.algorithm] * len(components),
+                                                  *zip(*components)))
+            # angles are recorded before the algorithm is copied for the vehicles, so every copy has them
+            self.algorithm.grid_angles = [grid_angle for _, grid_angle in grids_with_angles]
+            grids = [grid for grid, _ in grids_with_angles if grid.size > 0]
+            if len(grids) == 0:
+                return [(None, None, None, None) for _ in vehicles]
+            grid_points = np.concatenate(grids)
+            labels = self.partition(grid_points, [velocity * travel_time for velocity, travel_time in vehicles])
+            print("Waypoints of the vehicles:", np.bincount(labels, minlength=len(vehicles)).tolist())
+
+            futures = []
+            for region, (velocity, travel_time) in enumerate(vehicles):
+                vehicle_algorithm = copy.copy(self.algorithm)
+                vehicle_algorithm.velocity, vehicle_algorithm.travel_time = velocity, travel_time
+                futures.append(executor.submit(plan_vehicle, vehicle_algorithm, grid_points[labels == region],
+                                               starting_point, starting_direction))
+            return [future.result() for future in futures]
@@ -0,0 +1,131 @@
+import copy
+import itertools
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, wait
+
+""" Multi-start planning that evaluates a grid of weights, starting directions and scan accuracies in worker
+processes. Grids of the waypoints of every component are created once for every accuracy and sent to every worker
+once, runs only get their parameters and plan the components the same way as PathAlgorithm. Every run is scored by the
+part of the area covered per minute and by the total turn, the best path is chosen from the runs finished within the
+latency budget. Runs stop themselves at the deadline, except the run with the configuration of the algorithm, so
+there is always a path to return """
+
+# grids and planning data shared by all runs of the worker, set once by the initializer of the process pool
+shared_data = {}
+
+
+def initialize_worker(algorithm, grids: dict, starting_point: np.array, priority_field) -> None:
+    shared_data.update(algorithm=algorithm, grids=grids, starting_point=starting_point, priority_field=priority_field)
+
+
+def run_configuration(parameters: dict, deadline: float = None) -> (np.array, np.array, np.array, float):
+    algorithm = copy.copy(shared_data["algorithm"])
+    algorithm.deadline = deadline
+    algorithm.scan_accuracy = parameters["scan_accuracy"]
+    algorithm.distance_weight = parameters["distance_weight"]
+    algorithm.turn_weight = parameters["turn_weight"]
+    algorithm.predator_weight = parameters["predator_weight"]
+    grids = shared_data["grids"][parameters["scan_accuracy"]]
+    return algorithm.traverse_components(grids, shared_data["starting_point"], parameters["starting_direction"],
+                                         shared_data["priority_field"])
+
+
+class ParameterSweep:
+    def __init__(self, algorithm, distance_weights: tuple = (1, 1.5), turn_weights: tuple = (0, 0.5),
+                 predator_weights: tuple = (0.5, 1.5),
+                 starting_directions: tuple = (0, np.pi / 4, np.pi / 2, 3 * np.pi / 4),
+                 scan_accuracies: tuple = (1.5, 2), latency_budget: float = 10, turn_penalty: float = 0.2,
+                 max_workers: int = None):
+        self.algorithm = algorithm
+        self.distance_weights = distance_weights
+        self.turn_weights = turn_weights
+        self.predator_weights = predator_weights
+        self.starting_directions = starting_directions
+        self.scan_accuracies = scan_accuracies
+        self.latency_budget = latency_budget  # seconds, runs that don't finish in time are skipped
+        self.turn_penalty = turn_penalty  # part of the score taken by the total turn
+        self.max_workers = max_workers
+        self.table = []
+
+    def get_table(self) -> list[dict]:
+        """ Returns parameters and scores of every finished run of the last sweep, best runs first """
+        return self.table
+
+    def get_configurations(self, starting_direction: float) -> list[dict]:
+        """ Returns parameters of all runs, configuration of the algorithm is the first one, so it is run first """
+        algorithm = self.algorithm
+        configurations = [dict(scan_accuracy=algorithm.scan_accuracy, distance_weight=algorithm.distance_weight,
+                               turn_weight=algorithm.turn_weight, predator_weight=algorithm.predator_weight,
+                               starting_direction=starting_direction)]
+        for scan_accuracy, distance_weight, turn_weight, predator_weight, direction in itertools.product(
+                self.scan_accuracies, self.distance_weights, self.turn_weights, self.predator_weights,
+                self.starting_directions):
+            configuration = dict(scan_accuracy=scan_accuracy, distance_weight=distance_weight, turn_weight=turn_weight,
+                                 predator_weight=predator_weight, starting_direction=direction)
+            if configuration != configurations[0]:
+                configurations.append(configuration)
+        return configurations
+
+    def score(self, runs: list) -> list[dict]:
+        """ Returns table of the runs given as (parameters, waypoints number, result) sorted by score """
+        table = []
+        for parameters, waypoints_number, (path, directions, turns, time_travelled) in runs:
+            # first and last points of the path are the starting point
+            coverage = (len(path) - 2) / waypoints_number
+            table.append(dict(parameters, coverage=coverage, coverage_per_minute=coverage / time_travelled,
+                              total_turn=float(np.abs(turns).sum()), time=time_travelled))
+        max_coverage_rate = max(row["coverage_per_minute"] for row in table)
+        max_total_turn = max(max(row["total_turn"] for row in table), 1e-9)
+        for row in table:
+            row["score"] = row["coverage_per_minute"] / max_coverage_rate \
+                - self.turn_penalty * row["total_turn"] / max_total_turn
+        return sorted(table, key=lambda row: -row["score"])
+
+    def plan(self, components: list, starting_point: np.array, starting_direction: float,
+             priority_field) -> ((np.array, np.array, np.array, float), dict):
+        """ Returns result of the best run and its parameters, (None, None, None, None) if area has no waypoints """
+        start = time.perf_counter()
+        # workers compare the deadline with their own clock, so it is given in the time since the epoch
+        deadline = time.time() + self.latency_budget
+        self.table = []
+        starting_point = np.asarray(starting_point, dtype=float)
+        self.algorithm.grid_angles = []
+        grids, grid_angles = {}, {}
+        for scan_accuracy in self.scan_accuracies + (self.algorithm.scan_accuracy,):
+            grid_algorithm = copy.copy(self.algorithm)
+            grid_algorithm.scan_accuracy = scan_accuracy
+            grids_with_angles = [grid_algorithm.create_grid_with_angle(vertices_array, obstacles)
+                                 for vertices_array, obstacles in components]
+            grids[scan_accuracy] = [grid for grid, _ in grids_with_angles]
+            grid_angles[scan_accuracy] = [grid_angle for _, grid_angle in grids_with_angles]
+        if any(all(grid.size == 0 for grid in component_grids) for component_grids in grids.values()):
+            return (None, None, None, None), None
+
+        configurations = self.get_configurations(starting_direction)
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=initialize_worker,
+                                       initargs=(self.algorithm, grids, starting_point, priority_field))
+        # configuration of the algorithm is submitted first and runs without the deadline
+        futures = {executor.submit(run_configuration, parameters, None if index == 0 else deadline): parameters
+                   for index, parameters in enumerate(configurations)}
+        wait(futures, timeout=max(deadline - time.time(), 0))
+        wait([next(iter(futures))])
+        # runs that haven't started are cancelled and the running ones stop at the deadline
+        executor.shutdown(wait=True, cancel_futures=True)
+        finished = [future for future in futures
+                    if not future.cancelled() and not isinstance(future.exception(), TimeoutError)]
+        print("Parameter sweep finished", len(finished), "out of", len(futures), "runs in",
+              str(time.perf_counter() - start), "seconds")
+
+        runs = [(futures[future], sum(len(grid) for grid in grids[futures[future]["scan_accuracy"]]), future.result())
+                for future in finished]
+        # components can be too far to be reached in the travel time
+        runs = [run for run in runs if run[2][0] is not None]
+        if len(runs) == 0:
+            return (None, None, None, None), None
+        self.table = self.score(runs)
+        best_parameters = {key: self.table[0][key] for key in configurations[0]}
+        best_run = next(result for parameters, _, result in runs if parameters == best_parameters)
+        # angles are the ones of the lattices the best path was planned on
+        self.algorithm.grid_angles = grid_angles[best_parameters["scan_accuracy"]]
+        return best_run, best_parameters
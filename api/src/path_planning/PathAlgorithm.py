@@ -1,90 +1,110 @@
 import cv2
+import time
 import numpy as np
 from matplotlib import pyplot as plt
 from scipy.spatial import distance_matrix
 from matplotlib.path import Path
+from .ComponentPlanner import ComponentPlanner
+from .CandidateIndex import CandidateIndex
+from .PriorityMap import PriorityMap
+from .CoverageStrategy import CoverageStrategy
 
 
-class PathAlgorithm:
+class PathAlgorithm(CoverageStrategy):
     def __init__(self, scan_radius: float = 200, scan_accuracy: float = 2,
                  distance_weight: float = 1, turn_weight: float = 1,
-                 predator_weight: float = 0.5, resolution: float = 20, travel_time: float = 30, velocity: float = 20):
-        self.scan_radius = scan_radius
+                 predator_weight: float = 0.5, resolution: float = 20, travel_time: float = 30, velocity: float = 20,
+                 max_workers: int = None, use_candidate_index: bool = True):
+        super().__init__(scan_radius, resolution, travel_time, velocity)
         self.scan_accuracy = scan_accuracy
         self.distance_weight = distance_weight
         self.turn_weight = turn_weight
         self.predator_weight = predator_weight
-        self.resolution = resolution
-        self.travel_time= travel_time
-        self.velocity = velocity
+        self.max_workers = max_workers  # processes used to plan disconnected components
+        # next point is searched with the spatial index instead of evaluating all unvisited points
+        self.use_candidate_index = use_candidate_index
+        self.grid_angles = []  # angles of the lattices of the components of the last planned path
+        self.deadline = None  # time.time() at which traversal is stopped with TimeoutError, set by parameter sweep
 
     def get_contours(self, path: str) -> np.array:
         rect = cv2.imread(path)
         gray = cv2.cvtColor(rect, cv2.COLOR_BGR2GRAY)
         _, thresh = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
-        contours, hierarchy = cv2.findContours(thresh, cv2.RETR_LIST, cv2.CHAIN_APPROX_TC89_KCOS)
+        contours, hierarchy = cv2.findContours(thresh, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_TC89_KCOS)
         return self.process_contours(contours, hierarchy)
 
-    def process_contours(self, contours: list[int], hierarchy: list[int]):
-        contours = contours[:1]
-        obstacles = list(contours[:-1])
-        contours = contours[-1:]
-        vertices_array = np.array(contours)
-        vertices_array_shape = vertices_array.shape
-        vertices_array = vertices_array.reshape((vertices_array_shape[1], vertices_array_shape[3]))
-        for index, obstacle in enumerate(obstacles):
-            obstacles[index] = np.array(obstacle)
-            obstacle_shape = obstacles[index].shape
-            print(obstacle_shape)
-            obstacles[index] = obstacles[index].reshape((obstacle_shape[0], obstacle_shape[2]))
-        print(obstacles)
-        return vertices_array, obstacles
-
-    def create_grid(self, vertices_array: np.array, obstacles: list, alpha: float = None) -> np.array:
-        if alpha is None:
-            alpha = np.arctan2(vertices_array[0][1] - vertices_array[1][1], vertices_array[0][0] - vertices_array[1][0])
-
-        a = distance_matrix(vertices_array, vertices_array)
-
-        max_vertex_distance = np.array(a).max()
-
-        grid_param = max_vertex_distance + self.scan_radius * 2
-        print(grid_param)
-
-        set_points_x = np.arange(-grid_param / 2, grid_param / 2, self.scan_radius / self.scan_accuracy)
-        set_points_y = np.arange(-grid_param / 2, grid_param / 2, self.scan_radius / self.scan_accuracy)
-
-        set_points = np.array([[[x, y] for x in set_points_x] for y in set_points_y])
-        set_points = set_points.reshape((set_points.shape[0] ** 2, 2))
-        set_points = np.array(
-            [[x * np.cos(alpha) - y * np.sin(alpha), x * np.sin(alpha) + y * np.cos(alpha)] for x, y in set_points])
-        print(set_points.size)
-
-        x = vertices_array[:, 0]
-        y = vertices_array[:, 1]
-
-        x = np.append(x, x[0])
-        y = np.append(y, y[0])
-
-
-        A = np.abs(0.5 * np.sum(x[:-1] * y[1:] - x[1:] * y[:-1]))
-        Cx = (1 / (6 * A)) * np.sum((x[:-1] + x[1:]) * (x[:-1] * y[1:] - x[1:] * y[:-1]))
-        Cy = (1 / (6 * A)) * np.sum((y[:-1] + y[1:]) * (x[:-1] * y[1:] - x[1:] * y[:-1]))
-        print(Cx, Cy)
-        centre = np.array([Cx, Cy])
-        set_points = set_points - centre
-        print(set_points)
-
-        polygon = Path(vertices_array)
-        mask = polygon.contains_points(set_points)
-        obstacle_mask = [False for _ in range(mask.size)]
+    def get_centre(self, vertices_array: np.array) -> np.array:
+        """ Returns centroid of the polygon, signed area is used so the result doesn't depend on its orientation """
+        x, y = vertices_array[:, 0], vertices_array[:, 1]
+        x_next, y_next = np.roll(x, -1), np.roll(y, -1)
+        cross = x * y_next - x_next * y
+        area = 0.5 * np.sum(cross)
+        if abs(area) < 1e-9:
+            return vertices_array.mean(axis=0)
+        return np.array([np.sum((x + x_next) * cross), np.sum((y + y_next) * cross)]) / (6 * area)
+
+    def create_lattices(self, vertices_array: np.array, alphas: np.array) -> (np.array, np.array, np.array):
+        """ Returns points of square lattices rotated by every angle that cover the polygon, together with index of
+        the angle and number of the row of every point. Lattices go through the centroid of the polygon """
+        step = self.scan_radius / self.scan_accuracy
+        centre = self.get_centre(vertices_array)
+        points, angle_ids, rows = [], [], []
+        for index, alpha in enumerate(alphas):
+            rotation = np.array([[np.cos(alpha), -np.sin(alpha)], [np.sin(alpha), np.cos(alpha)]])
+            # vertices in the coordinates of the lattice, where its rows are horizontal
+            local_vertices = (vertices_array - centre) @ rotation
+            low = np.floor(local_vertices.min(axis=0) / step)
+            high = np.ceil(local_vertices.max(axis=0) / step)
+            xs, ys = np.meshgrid(np.arange(low[0], high[0] + 1), np.arange(low[1], high[1] + 1))
+            lattice = np.stack([xs.ravel(), ys.ravel()], axis=1) * step
+            points.append(lattice @ rotation.T + centre)
+            angle_ids.append(np.full(len(lattice), index))
+            rows.append(ys.ravel().astype(int))
+        return np.concatenate(points), np.concatenate(angle_ids), np.concatenate(rows)
+
+    def get_grid_mask(self, points: np.array, vertices_array: np.array, obstacles: list) -> np.array:
+        """ Returns which points are inside of the polygon and outside of its obstacles """
+        mask = Path(vertices_array).contains_points(points)
         for obstacle in obstacles:
-            obstacle_shape = Path(obstacle)
-            obstacle_mask = obstacle_mask | obstacle_shape.contains_points(set_points)
+            mask &= ~Path(obstacle).contains_points(points)
+        return mask
+
+    def find_grid_angle(self, vertices_array: np.array, obstacles: list) -> float:
+        """ Returns angle of the lattice with the fewest waypoints inside of the area, ties are resolved by the fewest
+        rows, so the shortest sweep. Candidates are directions of the edges of the convex hull, minimum-width
+        direction is one of them. Lattice is square, so angles are taken modulo 90 degrees """
+        hull = cv2.convexHull(np.asarray(vertices_array, dtype=np.float32)).reshape(-1, 2).astype(float)
+        edges = np.roll(hull, -1, axis=0) - hull
+        # angle of the first edge of the contour was used before, so it stays a candidate
+        first_edge = vertices_array[0] - vertices_array[1]
+        candidates = np.concatenate([[np.arctan2(first_edge[1], first_edge[0])], np.arctan2(edges[:, 1], edges[:, 0])])
+        candidates = candidates % (np.pi / 2)
+        _, unique_indices = np.unique(np.round(candidates, 6), return_index=True)
+        candidates = candidates[np.sort(unique_indices)]
+
+        # waypoints of all candidates are tested in one batch
+        points, angle_ids, rows = self.create_lattices(vertices_array, candidates)
+        mask = self.get_grid_mask(points, vertices_array, obstacles)
+        counts = np.bincount(angle_ids[mask], minlength=len(candidates))
+        occupied_rows = np.unique(np.stack([angle_ids[mask], rows[mask]], axis=1), axis=0)[:, 0]
+        rows_counts = np.bincount(occupied_rows, minlength=len(candidates))
+        best = np.lexsort((rows_counts, counts))[0]
+        print("Grid angle:", np.degrees(candidates[best]), "deg,", counts[best], "waypoints, first contour edge gives",
+              counts[0])
+        return candidates[best]
 
-        grid_points = set_points[mask ^ obstacle_mask]
+    def create_grid(self, vertices_array: np.array, obstacles: list, alpha: float = None) -> np.array:
+        """ Returns waypoints of the square lattice inside of the area, lattice angle is optimised if it isn't given """
+        return self.create_grid_with_angle(vertices_array, obstacles, alpha)[0]
 
-        return grid_points
+    def create_grid_with_angle(self, vertices_array: np.array, obstacles: list,
+                               alpha: float = None) -> (np.array, float):
+        """ Returns waypoints of the square lattice inside of the area together with the angle of the lattice """
+        vertices_array = np.asarray(vertices_array, dtype=float).reshape(-1, 2)
+        if alpha is None:
+            alpha = self.find_grid_angle(vertices_array, obstacles)
+        points, _, _ = self.create_lattices(vertices_array, [alpha])
+        return points[self.get_grid_mask(points, vertices_array, obstacles)], float(alpha)
 
     def calculate_turn_cost(self, grid: np.array, current_point: np.array, current_direction: float):
         delta_vectors = grid - current_point
@@ -94,6 +114,21 @@ class PathAlgorithm:
         angle_cost = angle_cost.reshape(-1, 1)
         return angle_cost, target_angles
 
+    def select_next_point(self, grid_points: np.array, visited: np.array, current_point: np.array,
+                          current_direction: float, predator_cost: np.array, priority_factor: np.array) -> (int, float, float):
+        # costs of all unvisited points are calculated
+        unvisited_grid = grid_points[~visited]
+        distance_cost = distance_matrix(unvisited_grid, [current_point]) / self.scan_radius
+        angle_cost, target_angles = self.calculate_turn_cost(unvisited_grid, current_point, current_direction)
+        unvisited_predator_cost = predator_cost[~visited]
+
+        cost_total = distance_cost * self.distance_weight + np.abs(angle_cost) * self.turn_weight \
+                     + unvisited_predator_cost * self.predator_weight
+        cost_total = np.multiply(cost_total, priority_factor[~visited])
+
+        best_next_idx = np.argmin(cost_total)
+        return np.flatnonzero(~visited)[best_next_idx], target_angles[best_next_idx], angle_cost[best_next_idx, 0]
+
     def traverse_the_grid(self, grid_points: np.array, starting_point: np.array, starting_direction: float, priority_field: np.array) -> (np.array, np.array, np.array, float):
         visited = np.zeros(len(grid_points), dtype=bool)
         path, direction_history, turn_history = [starting_point], [], []
@@ -108,8 +143,11 @@ class PathAlgorithm:
         predator_cost /= self.scan_radius
 
         priority_multiplier = 0.5
-        if priority_field is not None:
-            priority_factor = np.array([priority_multiplier if Path(priority_field).contains_point(point) else 1 for point in grid_points])
+        if isinstance(priority_field, PriorityMap):
+            # weights of the zones are read from the raster with one lookup
+            priority_factor = priority_field.get_weights(grid_points).reshape(-1, 1)
+        elif priority_field is not None and len(priority_field) > 0:
+            priority_factor = np.where(Path(priority_field).contains_points(grid_points), priority_multiplier, 1)
             priority_factor = priority_factor.reshape((priority_factor.size, 1))
         else:
             priority_factor = np.array([1 for _ in grid_points])
@@ -117,23 +155,26 @@ class PathAlgorithm:
 
         time_travelled = 0
         time_required_to_get_back = 0
-
-        while not np.all(visited):
-            print("Visited " + str(sum(visited)) + " out of " + str(grid_points.size / 2) + " waypoints")
-            unvisited_grid = grid_points[~visited]
-            # calculate costs
-            distance_cost = distance_matrix(unvisited_grid, [current_point]) / self.scan_radius
-            angle_cost, target_angles = self.calculate_turn_cost(unvisited_grid, current_point, current_direction)
-            unvisited_predator_cost = predator_cost[~visited]
-
-            cost_total = distance_cost * self.distance_weight + np.abs(angle_cost) * self.turn_weight \
-                         + unvisited_predator_cost * self.predator_weight
-            cost_total = np.multiply(cost_total, priority_factor[~visited])
-
+        candidate_index = None
+        if self.use_candidate_index:
+            candidate_index = CandidateIndex(grid_points, predator_cost, priority_factor, self.scan_radius,
+                                             self.distance_weight, self.turn_weight, self.predator_weight)
+
+        for visited_number in range(len(grid_points)):
+            if visited_number % 100 == 0:
+                print("Visited " + str(visited_number) + " out of " + str(len(grid_points)) + " waypoints")
+            if self.deadline is not None and time.time() >= self.deadline:
+                raise TimeoutError("Grid traversal didn't finish before the deadline")
             # choose the best next point
-            best_next_idx = np.argmin(cost_total)
-            current_point = unvisited_grid[best_next_idx]
-            current_direction = target_angles[best_next_idx]
+            if candidate_index is not None:
+                point_index, current_direction, turn = candidate_index.select(current_point, current_direction)
+                candidate_index.remove(point_index)
+            else:
+                point_index, current_direction, turn = self.select_next_point(grid_points, visited, current_point,
+                                                                              current_direction, predator_cost,
+                                                                              priority_factor)
+                visited[point_index] = True
+            current_point = grid_points[point_index]
 
             # add time travelled to sum
             time_required = np.linalg.norm(current_point - path[-1]) * self.resolution / self.velocity / 60
@@ -143,10 +184,7 @@ class PathAlgorithm:
             # update output
             path.append(current_point)
             direction_history.append(current_direction)
-            turn_history.append(angle_cost[best_next_idx])
-
-            # remove from further calculations
-            visited[np.where(~visited)[0][best_next_idx]] = True
+            turn_history.append(np.array([turn]))
 
             if time_travelled + time_required_to_get_back >= self.travel_time * 0.99:
                 print("Path planning stopping because of time")
@@ -164,11 +202,26 @@ class PathAlgorithm:
         return np.array(path + [starting_point]), np.array(direction_history+[target_angles]), np.array(turn_history), time_travelled
 
     def calculate_path(self, contours: list[int], hierarchy: list[int], starting_point: np.array, starting_direction: float, priority_field: np.array) -> (np.array, np.array, np.array, float):
-        contour_vertices, obstacles = self.process_contours(contours, hierarchy)
-        grid_points = self.create_grid(contour_vertices, obstacles)
-        if grid_points.size == 0:
+        components = self.process_contours(contours, hierarchy)
+        self.grid_angles = []
+        if len(components) == 0:
             return None, None, None, None
-        return self.traverse_the_grid(grid_points, starting_point, starting_direction, priority_field)
+        if len(components) > 1:
+            # disconnected components are planned in parallel and joined into one tour
+            return ComponentPlanner(self, self.max_workers).plan(components, starting_point, starting_direction,
+                                                                 priority_field)
+        contour_vertices, obstacles = components[0]
+        grid_points, grid_angle = self.create_grid_with_angle(contour_vertices, obstacles)
+        self.grid_angles = [grid_angle]
+        return self.traverse_components([grid_points], starting_point, starting_direction, priority_field)
+
+    def traverse_components(self, grids: list, starting_point: np.array, starting_direction: float,
+                            priority_field: np.array) -> (np.array, np.array, np.array, float):
+        """ Returns path over the waypoints of the components, the only component is traversed from the starting
+        point and several ones are joined by ComponentPlanner, sub-tours are planned one after another """
+        if len(grids) == 1 and grids[0].size > 0:
+            return self.traverse_the_grid(grids[0], starting_point, starting_direction, priority_field)
+        return ComponentPlanner(self).plan_grids(grids, starting_point, starting_direction, priority_field)
 
     def __str__(self):
         return "Heuristic("+str(self.scan_radius)+","+str(self.scan_accuracy)+","+str(self.distance_weight)+","\
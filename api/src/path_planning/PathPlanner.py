@@ -1,12 +1,15 @@
 import numpy as np
 import cv2
-import matplotlib as mpl
-import matplotlib.pyplot as plt
 from matplotlib.path import Path
 from numpy import tan
 from numpy.ma.core import arctan
 from scipy.spatial import distance_matrix
 import os
+from ..artifacts.ArtifactWriter import ArtifactWriter
+from ..artifacts.ArtifactVerbosity import ArtifactVerbosity
+from .PriorityMap import PriorityMap
+from .TourRefiner import TourRefiner
+from .CoverageStrategy import calculate_directions_and_turns
 
 
 def calculate_tangent_points(point: np.array, radius: float):
@@ -28,10 +31,13 @@ class PathPlanner:
         self._directions: np.array = None
         self._turns: np.array = None
         self.time_travelled = 0
+        self.saved_length = 0  # meters by which the refinement shortened the path
         self.img_path: str = None
         self.starting_point: np.array = None
         self.starting_direction: float = None
         self.priority_field: np.array = np.array([])
+        self.priority_map: PriorityMap = None  # weighted zones, used instead of priority_field if it is set
+        self.artifact_writer: ArtifactWriter = None  # planned path is drawn only if summary artifacts are enabled
         # os.makedirs('src/path_planning/results', exist_ok=True)
 
     def run_path_finding(self):
@@ -44,39 +50,50 @@ class PathPlanner:
                                                                                   self.priority_field)
 
     def draw_path(self, merged_area: np.array):
-        plt.clf()
-        if self.img_path is not None:
-            plt.title(self.img_path + str(self.algorithm))
-        else:
-            plt.title("Path planning result")
-        rect_rgb = cv2.cvtColor(merged_area, cv2.COLOR_BGR2RGB)
-        plt.imshow(rect_rgb)
-        plt.fill(self.priority_field[:, 0], self.priority_field[:, 1], "g",  alpha=0.3)
+        if self.artifact_writer is None or not self.artifact_writer.is_enabled(ArtifactVerbosity.SUMMARY):
+            return
+        image = cv2.cvtColor(merged_area, cv2.COLOR_GRAY2BGR) if merged_area.ndim == 2 else merged_area.copy()
+        if len(self.priority_field) > 0:
+            priority_image = image.copy()
+            cv2.fillPoly(priority_image, [np.round(self.priority_field).astype(np.int32)], (0, 128, 0))
+            cv2.addWeighted(priority_image, 0.3, image, 0.7, 0, dst=image)
         if self._path is not None:
-            plt.plot(self._path[:, 0], self._path[:, 1], "r")
-        plt.plot(self.starting_point[0], self.starting_point[1], 'bo')
-        start = self.starting_point
-        dx = np.cos(self.starting_direction)
-        dy = np.sin(self.starting_direction)
-
-        plt.quiver(start[0], start[1], dx, dy, color='b', angles='xy', scale_units='xy', scale=1)
-        # plt.savefig('src/path_planning/results/Planned_path.jpg')
+            cv2.polylines(image, [np.round(self._path).astype(np.int32)], False, (0, 0, 255))
+        start = np.round(self.starting_point).astype(int)
+        cv2.circle(image, (int(start[0]), int(start[1])), 3, (255, 0, 0), -1)
+        direction = np.array([np.cos(self.starting_direction), np.sin(self.starting_direction)])
+        end = np.round(self.starting_point + 20 * direction).astype(int)
+        cv2.arrowedLine(image, (int(start[0]), int(start[1])), (int(end[0]), int(end[1])), (255, 0, 0))
+
         # zapisywanie w miejscu dostepnym z frontendu
         static_path = os.path.join(os.path.dirname(__file__), '../../static/Planned_path.jpg')
-        static_path = os.path.abspath(static_path)
-
-        plt.savefig(static_path)
+        self.artifact_writer.write(os.path.abspath(static_path), image, extension='.jpg')
 
     def run_path_finding_detected_area(self, contours: list[int], hierarchy: list[int], merged_map: np.array,
                                        starting_direction: float):
 
         self.starting_point = self.priority_field[0, :]
         self.starting_direction = starting_direction
+        priority = self.priority_map if self.priority_map is not None else self.priority_field
         self._path, self._directions, self._turns, self.time_travelled = self.algorithm.calculate_path(contours,
                                                                                                        hierarchy,
                                                                                                        self.starting_point,
                                                                                                        self.starting_direction,
-                                                                                                       self.priority_field)
+                                                                                                       priority)
+
+    def refine_path(self, time_budget: float = 1):
+        """ Shortens the planned path with 2-opt and Or-opt moves for at most time_budget seconds, the path only
+        gets shorter, so it still fits into the travel time. Paths of strategies that cover the area along their
+        segments are kept as they are """
+        self.saved_length = 0
+        if self._path is None or not self.algorithm.refinable:
+            return
+        tour_refiner = TourRefiner(time_budget)
+        self._path = tour_refiner.refine(self._path)
+        self._directions, self._turns = calculate_directions_and_turns(self._path, self.starting_direction)
+        self.time_travelled = self.algorithm.get_time(self._path)
+        self.saved_length = tour_refiner.get_saved_length() * self.resolution
+        print("Path refinement:", tour_refiner.get_moves_number(), "moves, saved", str(self.saved_length), "meters")
 
     def validate_turns(self, velocity: float) -> float:
         maximal_turn = 0
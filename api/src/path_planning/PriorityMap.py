@@ -0,0 +1,29 @@
+import cv2
+import numpy as np
+
+""" Weights of the waypoints stored as a raster on the pixel grid of the merged map. Zones are rasterised once, so the
+weight of every waypoint is read with a single array lookup. Cost of the waypoint is multiplied by its weight, so
+waypoints with lower weight are visited earlier """
+
+
+class PriorityMap:
+    def __init__(self, shape: tuple[int, int], default_weight: float = 1):
+        self.default_weight = default_weight
+        self.weights = np.full(shape, default_weight, dtype=np.float32)
+
+    def add_zone(self, polygon: np.array, weight: float) -> None:
+        """ Sets weight of the pixels inside of the polygon given in pixel coordinates, zones added later overwrite
+        the previous ones """
+        polygon = np.round(np.asarray(polygon, dtype=float).reshape(-1, 2)).astype(np.int32)
+        if len(polygon) >= 3:
+            cv2.fillPoly(self.weights, [polygon], float(weight))
+
+    def get_weights(self, points: np.array) -> np.array:
+        """ Returns weights of the points in pixel coordinates with shape (N, 2), points outside of the map get the
+        default weight """
+        pixels = np.round(np.asarray(points, dtype=float).reshape(-1, 2)).astype(int)
+        height, width = self.weights.shape
+        inside = (pixels[:, 0] >= 0) & (pixels[:, 0] < width) & (pixels[:, 1] >= 0) & (pixels[:, 1] < height)
+        weights = np.full(len(pixels), self.default_weight, dtype=float)
+        weights[inside] = self.weights[pixels[inside, 1], pixels[inside, 0]]
+        return weights
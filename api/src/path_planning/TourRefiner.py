@@ -0,0 +1,143 @@
+import bisect
+import time
+import numpy as np
+from scipy.spatial import cKDTree
+
+""" Local search that shortens planned tours before they are smoothed. Tour starts and ends at the starting point,
+which stays in place. 2-opt reverses a part of the tour, Or-opt moves up to max_segment consecutive waypoints between
+two other ones. Gains of all moves to the nearest neighbours of every waypoint are evaluated at once, then improving
+moves are applied from the best one as long as they change disjoint parts of the tour, so their gains don't depend on
+each other. Scans are repeated until no move shortens the tour or the time budget is used. Every applied move shortens
+the tour, so the tour that fitted into the travel time still fits into it. Waypoints are reordered by length only, so
+the order in which priority zones were visited is not kept """
+
+
+class TourRefiner:
+    def __init__(self, time_budget: float = 1, neighbours_number: int = 8, max_segment: int = 3):
+        self.time_budget = time_budget  # seconds of the search
+        self.neighbours_number = neighbours_number
+        self.max_segment = max_segment
+        self.saved_length = 0
+        self.moves_number = 0
+
+    def get_saved_length(self) -> float:
+        """ Returns by how much the last refined tour was shortened, in units of the path """
+        return self.saved_length
+
+    def get_moves_number(self) -> int:
+        return self.moves_number
+
+    def find_two_opt(self, points: np.array, tour: np.array, positions: np.array,
+                     neighbours: np.array) -> (np.array, np.array, np.array):
+        """ Returns gains and positions (first, last) of the reversed parts of the tour of all improving moves """
+        last_edge = len(tour) - 2
+        first = np.repeat(np.arange(last_edge + 1), neighbours.shape[1])
+        second = positions[neighbours[tour[:last_edge + 1]].ravel()]
+        low, high = np.minimum(first, second), np.maximum(first, second)
+        valid = (high - low >= 2) & (high <= last_edge)
+        low, high = low[valid], high[valid]
+        a, b, c, d = points[tour[low]], points[tour[low + 1]], points[tour[high]], points[tour[high + 1]]
+        gains = (np.linalg.norm(a - b, axis=1) + np.linalg.norm(c - d, axis=1)
+                 - np.linalg.norm(a - c, axis=1) - np.linalg.norm(b - d, axis=1))
+        improving = gains > 1e-9
+        return gains[improving], low[improving] + 1, high[improving]
+
+    def find_or_opt(self, points: np.array, tour: np.array, positions: np.array,
+                    neighbours: np.array) -> (np.array, np.array, np.array, np.array, np.array):
+        """ Returns gains, positions (first, last) of the moved segments, edges they are inserted into and whether
+        the segments are reversed of all improving moves """
+        moves = []
+        last_edge = len(tour) - 2
+        for length in range(1, self.max_segment + 1):
+            starts = np.arange(1, len(tour) - length)
+            if starts.size == 0:
+                break
+            ends = starts + length - 1
+            start_points, end_points = points[tour[starts]], points[tour[ends]]
+            removal_gain = (np.linalg.norm(points[tour[starts - 1]] - start_points, axis=1)
+                            + np.linalg.norm(end_points - points[tour[ends + 1]], axis=1)
+                            - np.linalg.norm(points[tour[starts - 1]] - points[tour[ends + 1]], axis=1))
+
+            # segment is inserted next to the neighbour of its first or last waypoint, before or after it
+            for touching_end in (False, True):
+                touching = ends if touching_end else starts
+                segment_index = np.repeat(np.arange(starts.size), neighbours.shape[1])
+                neighbour_positions = positions[neighbours[tour[touching]].ravel()]
+                for after_neighbour in (False, True):
+                    edges = neighbour_positions if after_neighbour else neighbour_positions - 1
+                    valid = ((edges <= starts[segment_index] - 2) | (edges >= ends[segment_index] + 1)) \
+                        & (edges >= 0) & (edges <= last_edge)
+                    edges_valid, index = edges[valid], segment_index[valid]
+                    edge_start, edge_end = points[tour[edges_valid]], points[tour[edges_valid + 1]]
+                    # waypoint touching the neighbour is placed next to it, the other end is next to the other vertex
+                    near, far = (end_points, start_points) if touching_end else (start_points, end_points)
+                    near_vertex, far_vertex = (edge_start, edge_end) if after_neighbour else (edge_end, edge_start)
+                    gains = removal_gain[index] + np.linalg.norm(edge_start - edge_end, axis=1) \
+                        - np.linalg.norm(near[index] - near_vertex, axis=1) \
+                        - np.linalg.norm(far[index] - far_vertex, axis=1)
+                    improving = gains > 1e-9
+                    # segment keeps its direction if its first waypoint follows the first vertex of the edge
+                    moves.append((gains[improving], starts[index[improving]], ends[index[improving]],
+                                  edges_valid[improving], np.full(np.count_nonzero(improving),
+                                                                  touching_end == after_neighbour)))
+        if len(moves) == 0:
+            return tuple(np.zeros(0, dtype=dtype) for dtype in (float, int, int, int, bool))
+        return tuple(np.concatenate(values) for values in zip(*moves))
+
+    def select_moves(self, gains: np.array, spans: np.array) -> list[int]:
+        """ Returns indices of the moves taken from the best one whose spans of positions [first, last] don't
+        overlap, spans may share their ends, as the waypoints at the ends stay in place """
+        selected, starts, ends = [], [], []
+        for move in np.argsort(-gains, kind="stable"):
+            first, last = spans[move]
+            place = bisect.bisect_right(starts, first)
+            # previous span has to end before this one starts and the next one has to start after it ends
+            if (place > 0 and ends[place - 1] > first) or (place < len(starts) and starts[place] < last):
+                continue
+            starts.insert(place, first)
+            ends.insert(place, last)
+            selected.append(move)
+        return selected
+
+    def refine(self, path: np.array) -> np.array:
+        """ Returns shortened path that visits the same waypoints and starts and ends at the same points """
+        start = time.perf_counter()
+        self.saved_length, self.moves_number = 0, 0
+        points = np.asarray(path, dtype=float).reshape(-1, 2)
+        if len(points) < 5:
+            return points
+        tour = np.arange(len(points))
+        neighbours_number = min(self.neighbours_number + 1, len(points))
+        # the nearest point is the point itself
+        neighbours = cKDTree(points).query(points, neighbours_number)[1][:, 1:]
+
+        while time.perf_counter() - start < self.time_budget:
+            positions = np.empty(len(tour), dtype=int)
+            positions[tour] = np.arange(len(tour))
+            two_opt_gains, two_opt_first, two_opt_last = self.find_two_opt(points, tour, positions, neighbours)
+            or_opt_gains, or_opt_first, or_opt_last, or_opt_edges, or_opt_reversed = \
+                self.find_or_opt(points, tour, positions, neighbours)
+            if two_opt_gains.size + or_opt_gains.size == 0:
+                break
+            # span of the move holds all waypoints it moves and the waypoints on both sides of them
+            spans = np.concatenate([np.stack([two_opt_first - 1, two_opt_last + 1], axis=1),
+                                    np.stack([np.minimum(or_opt_edges, or_opt_first - 1),
+                                              np.maximum(or_opt_edges + 1, or_opt_last + 1)], axis=1)])
+            gains = np.concatenate([two_opt_gains, or_opt_gains])
+
+            # moves change disjoint parts of the tour, so they are applied to it in place one by one
+            for move in self.select_moves(gains, spans):
+                if move < two_opt_gains.size:
+                    first, last = two_opt_first[move], two_opt_last[move]
+                    tour[first:last + 1] = tour[first:last + 1][::-1].copy()
+                else:
+                    or_opt = move - two_opt_gains.size
+                    first, last, edge = or_opt_first[or_opt], or_opt_last[or_opt], or_opt_edges[or_opt]
+                    segment = tour[first:last + 1][::-1] if or_opt_reversed[or_opt] else tour[first:last + 1]
+                    if edge < first:
+                        tour[edge + 1:last + 1] = np.concatenate([segment, tour[edge + 1:first]])
+                    else:
+                        tour[first:edge + 1] = np.concatenate([tour[last + 1:edge + 1], segment])
+                self.saved_length += gains[move]
+                self.moves_number += 1
+        return points[tour]
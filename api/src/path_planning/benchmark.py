@@ -0,0 +1,47 @@
+import contextlib
+import io
+import time
+import numpy as np
+from .PathAlgorithm import PathAlgorithm
+
+""" Benchmark of the search of the next waypoint on square grids. Run from the root of the repository with:
+python -m api.src.path_planning.benchmark """
+
+SCAN_RADIUS = 200
+SCAN_ACCURACY = 2
+# evaluating all unvisited points is quadratic, so it is compared only on the smaller grids
+EXHAUSTIVE_LIMIT = 10000
+
+
+def create_grid(points_number: int, seed: int = 0) -> np.array:
+    """ Square lattice of waypoints with small jitter, as rotated grids don't have points exactly on the axes """
+    side = int(round(np.sqrt(points_number)))
+    step = SCAN_RADIUS / SCAN_ACCURACY
+    xs, ys = np.meshgrid(np.arange(side) * step, np.arange(side) * step)
+    grid = np.stack([xs.ravel(), ys.ravel()], axis=1)
+    return grid + np.random.default_rng(seed).uniform(-step / 10, step / 10, grid.shape)
+
+
+def run(grid_points: np.array, use_candidate_index: bool) -> tuple[float, np.array]:
+    """ Returns time of the traversal and the planned path """
+    algorithm = PathAlgorithm(scan_radius=SCAN_RADIUS, scan_accuracy=SCAN_ACCURACY, predator_weight=1.5,
+                              distance_weight=1.5, turn_weight=0.5, resolution=10, velocity=20, travel_time=10 ** 9,
+                              use_candidate_index=use_candidate_index)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        path, _, _, _ = algorithm.traverse_the_grid(grid_points, np.array([-50.0, -50.0]), np.pi / 4, None)
+        elapsed = time.perf_counter() - start
+    return elapsed, path
+
+
+if __name__ == "__main__":
+    for points_number in [1000, 10000, 100000]:
+        grid_points = create_grid(points_number)
+        index_time, index_path = run(grid_points, use_candidate_index=True)
+        if len(grid_points) > EXHAUSTIVE_LIMIT:
+            print(f"{len(grid_points):>7} points: candidate index {index_time:8.2f} s")
+            continue
+        exhaustive_time, exhaustive_path = run(grid_points, use_candidate_index=False)
+        same_path = exhaustive_path.shape == index_path.shape and np.allclose(exhaustive_path, index_path)
+        print(f"{len(grid_points):>7} points: exhaustive {exhaustive_time:8.2f} s, candidate index "
+              f"{index_time:8.2f} s, speedup {exhaustive_time / index_time:6.1f}x, same path: {same_path}")
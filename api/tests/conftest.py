@@ -0,0 +1,5 @@
+import os
+import sys
+
+# tests import the API as the package "api", like the benchmark run from the root of the repository
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
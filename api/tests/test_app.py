@@ -0,0 +1,134 @@
+import json
+import os
+import cv2
+import numpy as np
+import pytest
+from api.src.area_detection.GeoTransform import GeoTransform
+from api.src.area_detection.Projection import Projection
+
+ORIGIN_X, ORIGIN_Y = 4000005.0, 3030005.0
+FIELD = (500, 500, 1300, 1300)  # pixels of the detected field on the merged map, 8 x 8 km
+
+
+class DetectedField:
+    """ Stands in for AreaDetectionController and its AreaDetector with one square field on the merged map, so the
+    planning of the request runs without edge detection """
+
+    def __init__(self):
+        self.merged_map = np.zeros((2000, 2000), dtype=np.uint8)
+        cv2.rectangle(self.merged_map, FIELD[:2], FIELD[2:], 255, -1)
+        self.contours, self.hierarchy = cv2.findContours(self.merged_map, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+        self.geotransform = GeoTransform(ORIGIN_X, ORIGIN_Y, 10)
+        self.area_detector = self
+
+    def initialize_with_points(self, points) -> None:
+        pass
+
+    def detect_areas(self, simplification_tolerance: float = None) -> tuple:
+        return self.contours, self.hierarchy
+
+    def get_boundary_coordinates(self) -> list:
+        return self.convert_path_points_to_degrees(self.contours[0].reshape(-1, 2))
+
+    def get_vertex_counts(self) -> tuple[int, int]:
+        return 4, 4
+
+    def get_contours(self) -> list:
+        return self.contours
+
+    def get_hierarchy(self) -> np.array:
+        return self.hierarchy
+
+    def get_merged_map(self) -> np.array:
+        return self.merged_map
+
+    def get_points_img_merged_map(self, points) -> np.array:
+        return points.get_coordinates_pixels(self.geotransform)
+
+    def convert_path_points_to_degrees(self, path: np.array) -> list[dict]:
+        meters = self.geotransform.pixels_to_meters(path)
+        longitudes, latitudes = Projection('EPSG:3035').to_degrees(meters[:, 0], meters[:, 1])
+        return [{'lng': longitude, 'lat': latitude} for longitude, latitude in zip(longitudes.tolist(),
+                                                                                  latitudes.tolist())]
+
+
+@pytest.fixture(scope="module")
+def app_module(tmp_path_factory):
+    # local edge detection is selected, so the app is created without Earth Engine
+    scenes_path = tmp_path_factory.mktemp("scenes") / "scenes.json"
+    scenes_path.write_text(json.dumps({"periods": [], "origin_x": 0, "origin_y": 0}))
+    os.environ["LOCAL_EDGE_SCENES"] = str(scenes_path)
+    try:
+        import api.app
+    finally:
+        del os.environ["LOCAL_EDGE_SCENES"]
+    return api.app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+def post_fleet(client, fleet):
+    waypoints = [{"position": {"lng": 18.64, "lat": 54.14}}]
+    return client.post("/waypoints", json={"waypoints": waypoints, "fleet": fleet})
+
+
+@pytest.mark.parametrize("fleet", [
+    [],
+    None,
+    [{"velocity": 0, "time": 30}],
+    [{"velocity": 70, "time": 0}],
+    [{"velocity": 70, "time": 30}, {"velocity": -5, "time": 30}],
+    [{"velocity": "fast", "time": 30}],
+    [{"velocity": 70}],
+    [{"velocity": float("nan"), "time": 30}],
+])
+def test_invalid_fleet_is_rejected(client, fleet):
+    response = post_fleet(client, fleet)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_fleet_paths_are_planned(app_module, client, monkeypatch):
+    detected_field = DetectedField()
+    monkeypatch.setattr(app_module.uav_path_planner, "_UAVPathPlanner__area_detection_controller", detected_field)
+    # waypoints are the corners of the field, the first one is the start of every vehicle
+    corners = detected_field.convert_path_points_to_degrees([FIELD[:2], (FIELD[2], FIELD[1]), FIELD[2:],
+                                                             (FIELD[0], FIELD[3])])
+    fleet = [{"velocity": 70, "time": 30}, {"velocity": 50, "time": 20}]
+    response = client.post("/waypoints", json={"waypoints": [{"position": corner} for corner in corners],
+                                               "fleet": fleet})
+    assert response.status_code == 200
+    vehicles = response.get_json()["vehicles"]
+    assert len(vehicles) == 2
+    for vehicle, (velocity, travel_time) in zip(vehicles, [(70, 30), (50, 20)]):
+        path = np.array([[point["lng"], point["lat"]] for point in vehicle["path"]])
+        assert len(path) > 5
+        np.testing.assert_allclose(path[0], path[-1])
+        # planner stops when the next waypoint would use the travel time, so the last leg can exceed it a bit
+        assert 0.5 * travel_time < vehicle["time_travelled"] <= 1.05 * travel_time
+
+
+@pytest.mark.parametrize("options", [
+    {"strategy": "spiral"},
+    {"strategy": None},
+    {"strategy": "boustrophedon", "sweep": {"budget": 5}},
+])
+def test_invalid_strategy_is_rejected(client, options):
+    waypoints = [{"position": {"lng": 18.64, "lat": 54.14}}]
+    response = client.post("/waypoints", json=dict(options, waypoints=waypoints, velocity=70, time=30))
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_boustrophedon_path_is_planned(app_module, client, monkeypatch):
+    detected_field = DetectedField()
+    monkeypatch.setattr(app_module.uav_path_planner, "_UAVPathPlanner__area_detection_controller", detected_field)
+    corners = detected_field.convert_path_points_to_degrees([FIELD[:2], (FIELD[2], FIELD[1]), FIELD[2:],
+                                                             (FIELD[0], FIELD[3])])
+    response = client.post("/waypoints", json={"waypoints": [{"position": corner} for corner in corners],
+                                               "velocity": 70, "time": 30, "strategy": "boustrophedon"})
+    assert response.status_code == 200
+    assert len(response.get_json()["path"]) > 2
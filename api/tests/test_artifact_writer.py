@@ -0,0 +1,27 @@
+import numpy as np
+from api.src.artifacts.ArtifactVerbosity import ArtifactVerbosity
+from api.src.artifacts.ArtifactWriter import ArtifactWriter
+from api.src.path_planning.PathPlanner import PathPlanner
+
+
+def test_images_are_saved_with_the_given_extension(tmp_path):
+    artifact_writer = ArtifactWriter(ArtifactVerbosity.SUMMARY)
+    artifact_writer.write(str(tmp_path / 'Edge_map'), np.zeros((4, 4), dtype=np.uint8))
+    artifact_writer.write(str(tmp_path / 'Planned_path.jpg'), np.zeros((4, 4), dtype=np.uint8), extension='.jpg')
+    artifact_writer.write(str(tmp_path / 'Skipped'), np.zeros((4, 4)), ArtifactVerbosity.PER_TILE)
+    artifact_writer.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['Edge_map.png', 'Planned_path.jpg']
+
+
+def test_planned_path_keeps_its_name(monkeypatch):
+    written = []
+    artifact_writer = ArtifactWriter(ArtifactVerbosity.SUMMARY)
+    monkeypatch.setattr(artifact_writer, "write",
+                        lambda path, image, extension='.png': written.append((path, extension)))
+    path_planner = PathPlanner()
+    path_planner.artifact_writer = artifact_writer
+    path_planner.starting_point, path_planner.starting_direction = np.array([5.0, 5.0]), 0
+    path_planner._path = np.array([[5.0, 5.0], [20.0, 20.0], [5.0, 5.0]])
+    path_planner.draw_path(np.zeros((32, 32), dtype=np.uint8))
+    # frontend reads the path from static/Planned_path.jpg
+    assert [(path.endswith('static/Planned_path.jpg'), extension) for path, extension in written] == [(True, '.jpg')]
@@ -0,0 +1,124 @@
+import io
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import ee
+import numpy as np
+import pytest
+from api.src.area_detection.BulkEdgeMapSource import BulkEdgeMapSource
+from api.src.area_detection.EdgeMapSource import EdgeMapSource
+from api.src.area_detection.PointData import PointData
+from api.src.area_detection.Projection import Projection
+
+SCALE = 10
+BUFFER_RADIUS = 1270  # fragments of 255 x 255 pixels
+REGION = (4000000, 3000000, 4006000, 3004000)
+
+
+def edge_values(columns: np.array, rows: np.array) -> np.array:
+    """ Edge raster of the whole plane, value depends on absolute pixel coordinates """
+    return ((columns[None, :] * 7 + rows[:, None] * 13) % 256).astype(np.float32)
+
+
+class ChunkHandler(BaseHTTPRequestHandler):
+    """ Local stand-in of Earth Engine getDownloadURL, serves chunks of the edge raster as NPY files """
+    requests = []
+    failing = False
+
+    def do_GET(self):
+        query = {key: float(value[0]) for key, value in urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+                 .items()}
+        ChunkHandler.requests.append(query)
+        if ChunkHandler.failing:
+            self.send_error(500)
+            return
+        column, row = int(round(query['x'] / SCALE)), int(round(-query['y'] / SCALE))
+        chunk = edge_values(column + np.arange(int(query['width'])), row + np.arange(int(query['height'])))
+        content = io.BytesIO()
+        np.save(content, chunk)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.end_headers()
+        self.wfile.write(content.getvalue())
+
+    def log_message(self, *args):
+        pass
+
+
+class FallbackSource(EdgeMapSource):
+    """ Wrapped per-tile source, records fragments that weren't cut from the downloaded region """
+
+    def __init__(self):
+        self.calls = []
+
+    def load_fragment(self, center_point, buffer_radius, projection, scale):
+        self.calls.append(center_point.get_coordinates_meters())
+        return np.full((int(round(2 * buffer_radius / scale)) + 1,) * 2, -1.0)
+
+
+@pytest.fixture
+def server_url():
+    ChunkHandler.requests, ChunkHandler.failing = [], False
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ChunkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/'
+    server.shutdown()
+    server.server_close()
+
+
+def create_source(server_url: str, fallback: FallbackSource) -> BulkEdgeMapSource:
+    def url_provider(x, y, width, height, projection, scale):
+        return server_url + '?' + urllib.parse.urlencode(dict(x=x, y=y, width=width, height=height))
+    return BulkEdgeMapSource(fallback, REGION, url_provider=url_provider, max_chunk_size=300)
+
+
+def load(source: BulkEdgeMapSource, x: float, y: float) -> np.array:
+    projection = Projection('EPSG:3035')
+    return source.load_fragment(PointData.from_coordinates_meters(x, y, projection), BUFFER_RADIUS, projection, SCALE)
+
+
+def expected_fragment(x: float, y: float) -> np.array:
+    size = int(round(2 * BUFFER_RADIUS / SCALE)) + 1
+    return edge_values(int(round((x - BUFFER_RADIUS) / SCALE)) + np.arange(size),
+                       int(round((-y - BUFFER_RADIUS) / SCALE)) + np.arange(size))
+
+
+def test_fragments_are_cut_from_downloaded_chunks(server_url):
+    fallback = FallbackSource()
+    source = create_source(server_url, fallback)
+    for x, y in [(4001500, 3001500), (4003000, 3002000), (4004700, 3002500)]:
+        np.testing.assert_array_equal(load(source, x, y), expected_fragment(x, y))
+    assert fallback.calls == []
+    # region is downloaded once, in several chunks
+    assert len(ChunkHandler.requests) > 1
+    requests_number = len(ChunkHandler.requests)
+    load(source, 4002000, 3001800)
+    assert len(ChunkHandler.requests) == requests_number
+
+
+def test_fragments_outside_of_region_use_wrapped_source(server_url):
+    fallback = FallbackSource()
+    source = create_source(server_url, fallback)
+    load(source, 4003000, 3002000)
+    fragment = load(source, 4020000, 3002000)
+    assert fallback.calls == [(4020000, 3002000)]
+    assert np.all(fragment == -1)
+
+
+def test_failed_download_falls_back_to_single_tiles(server_url):
+    ChunkHandler.failing = True
+    fallback = FallbackSource()
+    source = create_source(server_url, fallback)
+    assert np.all(load(source, 4003000, 3002000) == -1)
+    assert np.all(load(source, 4001500, 3001500) == -1)
+    assert len(fallback.calls) == 2
+
+
+def test_refused_download_url_falls_back_to_single_tiles():
+    def url_provider(x, y, width, height, projection, scale):
+        raise ee.EEException("Total request size must be less than or equal to 50331648 bytes.")
+    fallback = FallbackSource()
+    source = BulkEdgeMapSource(fallback, REGION, url_provider=url_provider, max_chunk_size=300)
+    assert np.all(load(source, 4003000, 3002000) == -1)
+    assert fallback.calls == [(4003000, 3002000)]
@@ -0,0 +1,51 @@
+import numpy as np
+from scipy.spatial import distance_matrix
+from api.src.path_planning.CandidateIndex import CandidateIndex
+from api.src.path_planning.PathAlgorithm import PathAlgorithm
+from api.src.path_planning.PriorityMap import PriorityMap
+
+STEP = 5
+
+
+def create_grid(points_number: int, seed: int = 0) -> np.array:
+    """ Square lattice with jitter, so costs of the points aren't equal """
+    side = int(round(np.sqrt(points_number)))
+    xs, ys = np.meshgrid(np.arange(side) * STEP + STEP, np.arange(side) * STEP + STEP)
+    grid = np.stack([xs.ravel(), ys.ravel()], axis=1).astype(float)
+    return grid + np.random.default_rng(seed).uniform(-STEP / 10, STEP / 10, grid.shape)
+
+
+def compare_selection(grid_points: np.array, priority_factor: np.array) -> None:
+    """ Visits all points with the index and checks that every choice is the same as the exhaustive one """
+    algorithm = PathAlgorithm(scan_radius=2 * STEP, scan_accuracy=2, predator_weight=1.5, distance_weight=1.5,
+                              turn_weight=0.5)
+    predator_cost = distance_matrix(grid_points, [grid_points.mean(axis=0)])
+    predator_cost = (np.max(predator_cost) - predator_cost) / algorithm.scan_radius
+    candidate_index = CandidateIndex(grid_points, predator_cost, priority_factor, algorithm.scan_radius,
+                                     algorithm.distance_weight, algorithm.turn_weight, algorithm.predator_weight)
+    visited = np.zeros(len(grid_points), dtype=bool)
+    current_point, current_direction = np.array([0.0, 0.0]), np.pi / 4
+    for _ in range(len(grid_points)):
+        expected = algorithm.select_next_point(grid_points, visited, current_point, current_direction, predator_cost,
+                                               priority_factor)
+        selected = candidate_index.select(current_point, current_direction)
+        assert selected[0] == expected[0]
+        np.testing.assert_allclose(selected[1:], expected[1:])
+        candidate_index.remove(selected[0])
+        visited[selected[0]] = True
+        current_point, current_direction = grid_points[selected[0]], selected[1]
+    assert len(candidate_index) == 0
+
+
+def test_selection_matches_exhaustive_search():
+    for points_number in [1000, 4000]:
+        grid_points = create_grid(points_number)
+        compare_selection(grid_points, np.ones((len(grid_points), 1)))
+
+
+def test_selection_matches_exhaustive_search_with_priority_map():
+    grid_points = create_grid(1000)
+    priority_map = PriorityMap((200, 200))
+    priority_map.add_zone(np.array([[0, 0], [100, 0], [100, 100], [0, 100]]), 0.5)
+    priority_map.add_zone(np.array([[120, 40], [180, 40], [150, 160]]), 0.25)
+    compare_selection(grid_points, priority_map.get_weights(grid_points).reshape(-1, 1))
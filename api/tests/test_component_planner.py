@@ -0,0 +1,63 @@
+import cv2
+import numpy as np
+from api.src.path_planning.ComponentPlanner import ComponentPlanner
+from api.src.path_planning.PathAlgorithm import PathAlgorithm
+from api.src.path_planning.PriorityMap import PriorityMap
+
+
+def create_algorithm(travel_time: float) -> PathAlgorithm:
+    # the same configuration as UAVPathPlanner, velocity of 72 km/h
+    return PathAlgorithm(scan_radius=200, scan_accuracy=2, predator_weight=1.5, distance_weight=1.5, turn_weight=0,
+                         resolution=10, velocity=20, travel_time=travel_time, max_workers=2)
+
+
+def plan_squares(corners: list, travel_time: float) -> (np.array, float):
+    image = np.zeros((3000, 3000), dtype=np.uint8)
+    for x, y in corners:
+        cv2.rectangle(image, (x, y), (x + 800, y + 800), 255, -1)
+    contours, hierarchy = cv2.findContours(image, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    path, _, _, time_travelled = create_algorithm(travel_time).calculate_path(contours, hierarchy,
+                                                                              np.array([50.0, 50.0]), np.pi / 4, None)
+    return path, time_travelled
+
+
+def count_waypoints(path: np.array) -> int:
+    # first and last points of the path are the starting point
+    return len(path) - 2
+
+
+def test_distant_component_does_not_reduce_coverage():
+    for travel_time in [20, 40, 60]:
+        one_square, _ = plan_squares([(100, 100)], travel_time)
+        two_squares, time_travelled = plan_squares([(100, 100), (2000, 2000)], travel_time)
+        assert count_waypoints(two_squares) >= 0.9 * count_waypoints(one_square)
+        # joined tour is cut to the travel time
+        assert time_travelled <= travel_time
+
+
+def test_components_are_joined_into_one_tour():
+    path, _ = plan_squares([(100, 100), (2000, 100), (100, 2000)], 10 ** 4)
+    np.testing.assert_allclose(path[0], path[-1])
+    # with enough time all squares are covered
+    in_squares = [np.sum((path[:, 0] >= x) & (path[:, 0] <= x + 800) & (path[:, 1] >= y) & (path[:, 1] <= y + 800))
+                  for x, y in [(100, 100), (2000, 100), (100, 2000)]]
+    assert min(in_squares) > 0
+
+
+def test_workers_use_priority_map_of_the_initializer():
+    image = np.zeros((3000, 3000), dtype=np.uint8)
+    for x, y in [(100, 100), (2000, 2000)]:
+        cv2.rectangle(image, (x, y), (x + 800, y + 800), 255, -1)
+    contours, hierarchy = cv2.findContours(image, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    algorithm = create_algorithm(60)
+    components = algorithm.process_contours(contours, hierarchy)
+    priority_map = PriorityMap(image.shape)
+    priority_map.add_zone(np.array([[100, 500], [900, 500], [900, 900], [100, 900]]), 0.1)
+    component_planner = ComponentPlanner(algorithm, max_workers=2)
+    path = component_planner.plan(components, np.array([50.0, 50.0]), np.pi / 4, priority_map)[0]
+    # sub-tours planned one after another get the priority map directly
+    grids = [algorithm.create_grid(vertices_array, obstacles) for vertices_array, obstacles in components]
+    expected = component_planner.plan_grids(grids, np.array([50.0, 50.0]), np.pi / 4, priority_map)[0]
+    np.testing.assert_allclose(path, expected)
+    without_priority = component_planner.plan(components, np.array([50.0, 50.0]), np.pi / 4, None)[0]
+    assert len(path) != len(without_priority) or not np.allclose(path, without_priority)
@@ -0,0 +1,16 @@
+from api.src.area_detection.EdgeDetector import EdgeDetector
+from api.src.area_detection.PointData import PointData
+from api.src.area_detection.Projection import Projection
+
+
+def create_detector(latitude: float, longitude: float) -> EdgeDetector:
+    # hash doesn't use the points on the Earth Engine side, so they aren't needed
+    return EdgeDetector(None, PointData(latitude, longitude, Projection('EPSG:3035')))
+
+
+def test_period_hash_depends_on_map_center():
+    detector = create_detector(54.14, 18.64)
+    assert detector.get_period_parameters_hash(0) == create_detector(54.14, 18.64).get_period_parameters_hash(0)
+    # composites are filtered by the map center, so fragments of another center aren't reused
+    assert detector.get_period_parameters_hash(0) != create_detector(54.2, 18.64).get_period_parameters_hash(0)
+    assert detector.get_period_parameters_hash(0) != detector.get_period_parameters_hash(1)
@@ -0,0 +1,31 @@
+import cv2
+import numpy as np
+from api.src.path_planning.FleetPlanner import FleetPlanner
+from api.src.path_planning.PathAlgorithm import PathAlgorithm
+from api.src.path_planning.PriorityMap import PriorityMap
+
+
+def test_vehicles_cover_their_regions_with_priority_map():
+    image = np.zeros((2000, 2000), dtype=np.uint8)
+    cv2.rectangle(image, (100, 100), (1900, 1100), 255, -1)
+    contours, hierarchy = cv2.findContours(image, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    algorithm = PathAlgorithm(scan_radius=200, scan_accuracy=2, predator_weight=1.5, distance_weight=1.5,
+                              turn_weight=0, resolution=10)
+    components = algorithm.process_contours(contours, hierarchy)
+    priority_map = PriorityMap(image.shape)
+    priority_map.add_zone(np.array([[100, 100], [1000, 100], [1000, 1100], [100, 1100]]), 0.5)
+    vehicles = [(20, 10 ** 4), (10, 10 ** 4)]
+    results = FleetPlanner(algorithm, max_workers=2).plan(components, vehicles, np.array([50.0, 50.0]), np.pi / 4,
+                                                          priority_map)
+
+    grid = algorithm.create_grid(*components[0])
+    visited = [path[1:-1] for path, _, _, _ in results]
+    # with enough time every vehicle visits its whole region and regions don't overlap
+    assert sum(len(waypoints) for waypoints in visited) == len(grid)
+    np.testing.assert_array_equal(np.unique(np.concatenate(visited), axis=0), np.unique(grid, axis=0))
+    # faster vehicle gets the larger region
+    assert len(visited[0]) > len(visited[1])
+    for (path, _, _, time_travelled), (velocity, _) in zip(results, vehicles):
+        np.testing.assert_allclose(path[0], path[-1])
+        length = np.linalg.norm(np.diff(path, axis=0), axis=1).sum()
+        np.testing.assert_allclose(time_travelled, length * algorithm.resolution / velocity / 60)
@@ -0,0 +1,75 @@
+import cv2
+import numpy as np
+from api.src.path_planning.FleetPlanner import FleetPlanner
+from api.src.path_planning.ParameterSweep import ParameterSweep
+from api.src.path_planning.PathAlgorithm import PathAlgorithm
+
+
+def create_algorithm() -> PathAlgorithm:
+    return PathAlgorithm(scan_radius=200, scan_accuracy=2, predator_weight=1.5, distance_weight=1.5, turn_weight=0,
+                         resolution=10, velocity=20, travel_time=60, max_workers=2)
+
+
+def find_rotated_rectangles(rectangles: list) -> (list, np.array):
+    """ Returns contours of rectangles given as (centre, size, angle in degrees) """
+    image = np.zeros((3000, 3000), dtype=np.uint8)
+    for rectangle in rectangles:
+        cv2.fillPoly(image, [cv2.boxPoints(rectangle).astype(np.int32)], 255)
+    return cv2.findContours(image, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+
+
+def count_angle_searches(monkeypatch) -> list:
+    calls = []
+    find_grid_angle = PathAlgorithm.find_grid_angle
+
+    def counted_find_grid_angle(self, vertices_array, obstacles):
+        calls.append(vertices_array)
+        return find_grid_angle(self, vertices_array, obstacles)
+    monkeypatch.setattr(PathAlgorithm, "find_grid_angle", counted_find_grid_angle)
+    return calls
+
+
+def test_angle_of_the_planned_grid_is_recorded(monkeypatch):
+    calls = count_angle_searches(monkeypatch)
+    contours, hierarchy = find_rotated_rectangles([((1000, 1000), (1600, 700), 30)])
+    algorithm = create_algorithm()
+    algorithm.calculate_path(contours, hierarchy, np.array([50.0, 50.0]), np.pi / 4, None)
+    # angle is searched once, when the grid is created
+    assert len(calls) == 1
+    vertices_array, obstacles = algorithm.process_contours(contours, hierarchy)[0]
+    assert algorithm.grid_angles == [algorithm.find_grid_angle(vertices_array, obstacles)]
+    # lattice follows the sides of the rectangle
+    assert abs(np.degrees(algorithm.grid_angles[0]) - 30) < 1
+
+
+def test_angles_of_components_are_recorded_in_their_order():
+    contours, hierarchy = find_rotated_rectangles([((600, 600), (900, 500), 20), ((2200, 2200), (900, 500), 65)])
+    algorithm = create_algorithm()
+    algorithm.calculate_path(contours, hierarchy, np.array([50.0, 50.0]), np.pi / 4, None)
+    components = algorithm.process_contours(contours, hierarchy)
+    assert algorithm.grid_angles == [algorithm.find_grid_angle(vertices_array, obstacles)
+                                     for vertices_array, obstacles in components]
+
+
+def test_sweep_records_angles_of_the_best_accuracy():
+    contours, hierarchy = find_rotated_rectangles([((1000, 1000), (1600, 700), 30)])
+    algorithm = create_algorithm()
+    components = algorithm.process_contours(contours, hierarchy)
+    sweep = ParameterSweep(algorithm, distance_weights=(1.5,), turn_weights=(0,), predator_weights=(1.5,),
+                           starting_directions=(np.pi / 4,), scan_accuracies=(1, 2), latency_budget=60,
+                           max_workers=2)
+    _, parameters = sweep.plan(components, np.array([50.0, 50.0]), np.pi / 4, None)
+    grid_algorithm = create_algorithm()
+    grid_algorithm.scan_accuracy = parameters["scan_accuracy"]
+    assert algorithm.grid_angles == [grid_algorithm.create_grid_with_angle(*components[0])[1]]
+
+
+def test_fleet_records_angles_of_the_components():
+    contours, hierarchy = find_rotated_rectangles([((600, 600), (900, 500), 20), ((2200, 2200), (900, 500), 65)])
+    algorithm = create_algorithm()
+    components = algorithm.process_contours(contours, hierarchy)
+    results = FleetPlanner(algorithm, max_workers=2).plan(components, [(20, 60), (20, 60)], np.array([50.0, 50.0]),
+                                                          np.pi / 4, None)
+    assert all(path is not None for path, _, _, _ in results)
+    assert algorithm.grid_angles == [algorithm.find_grid_angle(vertices_array, obstacles)
+                                     for vertices_array, obstacles in components]
@@ -0,0 +1,44 @@
+import numpy as np
+from api.src.area_detection.LambertAzimuthalEqualArea import LambertAzimuthalEqualArea
+from api.src.area_detection.Projection import LOCAL_TRANSFORMS, Projection
+
+
+def create_etrs_laea() -> LambertAzimuthalEqualArea:
+    return LambertAzimuthalEqualArea(latitude_origin=52, longitude_origin=10, false_easting=4321000,
+                                     false_northing=3210000)
+
+
+def test_forward_matches_iogp_example():
+    # IOGP Guidance Note 7-2, example of the method 9820 for ETRS89 / LAEA Europe (EPSG:3035)
+    x, y = create_etrs_laea().forward(5, 50)
+    np.testing.assert_allclose([x, y], [3962799.45, 2999718.85], atol=0.01)
+
+
+def test_inverse_matches_iogp_example():
+    longitude, latitude = create_etrs_laea().inverse(3962799.45, 2999718.85)
+    np.testing.assert_allclose([longitude, latitude], [5, 50], atol=1e-7)
+
+
+def test_round_trip_of_arrays():
+    longitude, latitude = np.meshgrid(np.linspace(-10, 30, 41), np.linspace(35, 70, 36))
+    transform = create_etrs_laea()
+    x, y = transform.forward(longitude, latitude)
+    assert x.shape == longitude.shape and y.shape == latitude.shape
+    inverse_longitude, inverse_latitude = transform.inverse(x, y)
+    # 1e-8 degree is about a millimeter
+    np.testing.assert_allclose(inverse_longitude, longitude, atol=1e-8)
+    np.testing.assert_allclose(inverse_latitude, latitude, atol=1e-8)
+
+
+def test_origin_of_projection():
+    longitude, latitude = create_etrs_laea().inverse(np.array([4321000.0]), np.array([3210000.0]))
+    np.testing.assert_allclose([longitude[0], latitude[0]], [10, 52], atol=1e-9)
+
+
+def test_projection_uses_local_transform():
+    projection = Projection('EPSG:3035')
+    assert projection.is_supported_locally()
+    assert 'EPSG:3035' in LOCAL_TRANSFORMS
+    x, y = projection.to_meters(np.array([5.0, 10.0]), np.array([50.0, 52.0]))
+    np.testing.assert_allclose(x, [3962799.45, 4321000], atol=0.01)
+    np.testing.assert_allclose(y, [2999718.85, 3210000], atol=0.01)
@@ -0,0 +1,89 @@
+import numpy as np
+from api.src.area_detection.LocalEdgeDetector import LocalEdgeDetector, CLOUD_BIT_MASK
+from api.src.area_detection.PeriodEdgeMapSource import combine_period_edges, create_circular_kernel
+from api.src.area_detection.PointData import PointData
+from api.src.area_detection.Projection import Projection
+
+SIZE = 128
+BOUNDARY = 64  # column where the vegetation field ends and the bare soil starts
+ORIGIN_X, ORIGIN_Y = 4000005.0, 3001275.0
+
+
+def create_scene(seed: int, cloud: tuple = None) -> np.array:
+    """ Sentinel-2 scene (B8, B4, B3, B2, B11, QA60) with reflectance scaled by 10000 """
+    rng = np.random.default_rng(seed)
+    scene = np.zeros((6, SIZE, SIZE), dtype=np.float32)
+    vegetation = np.arange(SIZE)[np.newaxis, :] < BOUNDARY
+    scene[0] = np.where(vegetation, 4000, 2000)  # B8
+    scene[1] = np.where(vegetation, 500, 1500)  # B4
+    scene[2], scene[3], scene[4] = 800, 600, np.where(vegetation, 1500, 2500)
+    scene[:5] += rng.normal(0, 30, (5, SIZE, SIZE))
+    if cloud is not None:
+        y0, y1, x0, x1 = cloud
+        # pixels under the cloud have values of a bright surface without vegetation
+        scene[0, y0:y1, x0:x1], scene[1, y0:y1, x0:x1] = 100, 8000
+        scene[5, y0:y1, x0:x1] = CLOUD_BIT_MASK
+    return scene
+
+
+def save_scenes(directory, scenes: list) -> list[str]:
+    paths = []
+    for index, scene in enumerate(scenes):
+        path = str(directory / f'scene{index}.npy')
+        np.save(path, scene)
+        paths.append(path)
+    return paths
+
+
+def create_detector(periods: list, tile_size: int = 1024) -> LocalEdgeDetector:
+    return LocalEdgeDetector(periods, ORIGIN_X, ORIGIN_Y, tile_size=tile_size, tile_margin=16, max_workers=2)
+
+
+def test_circular_kernel_matches_earth_engine_circle():
+    # 25 m at 10 m resolution, pixels with centers further than 2.5 px aren't in the kernel
+    np.testing.assert_array_equal(create_circular_kernel(2.5), [[0, 1, 1, 1, 0],
+                                                                [1, 1, 1, 1, 1],
+                                                                [1, 1, 1, 1, 1],
+                                                                [1, 1, 1, 1, 1],
+                                                                [0, 1, 1, 1, 0]])
+    np.testing.assert_array_equal(create_circular_kernel(1), [[0, 1, 0], [1, 1, 1], [0, 1, 0]])
+
+
+def test_edges_are_detected_on_field_boundary(tmp_path):
+    paths = save_scenes(tmp_path, [create_scene(0), create_scene(1, cloud=(0, 40, 80, 120))])
+    for tile_size in [1024, 48]:
+        edges = create_detector([paths], tile_size).detect_period_edges(0)
+        assert edges.shape == (SIZE, SIZE)
+        rows, columns = np.nonzero(edges)
+        # masked cloud doesn't create edges, all of them are close to the boundary of the fields
+        assert np.all(np.abs(columns - BOUNDARY) <= 8)
+        inner_rows = np.unique(rows[(rows >= 8) & (rows < SIZE - 8)])
+        assert len(inner_rows) >= 0.9 * (SIZE - 16)
+
+
+def test_merged_band_combines_periods_with_closing(tmp_path):
+    (tmp_path / 'first').mkdir()
+    (tmp_path / 'second').mkdir()
+    first_period = save_scenes(tmp_path / 'first', [create_scene(0)])
+    second_scene = create_scene(1)
+    # in the second period the boundary of the fields is moved
+    second_scene[:2] = np.roll(second_scene[:2], 20, axis=2)
+    second_period = save_scenes(tmp_path / 'second', [second_scene])
+    detector = create_detector([first_period, second_period])
+
+    merged_band = detector.detect_and_return_merged_bands()
+    period_edges = [detector.detect_period_edges(period) for period in range(2)]
+    np.testing.assert_array_equal(merged_band, combine_period_edges(period_edges, 2.5))
+    assert np.any(np.abs(np.nonzero(merged_band)[1] - BOUNDARY) <= 8)
+    assert np.any(np.abs(np.nonzero(merged_band)[1] - BOUNDARY - 20) <= 8)
+
+
+def test_edge_map_source_cuts_fragments_of_merged_band(tmp_path):
+    detector = create_detector([save_scenes(tmp_path, [create_scene(0)])])
+    merged_band = detector.detect_and_return_merged_bands()
+    source = detector.create_edge_map_source()
+    projection = Projection('EPSG:3035')
+    # fragment of 21 x 21 pixels whose top left pixel is (50, 30)
+    center = PointData.from_coordinates_meters(ORIGIN_X + 60 * 10, ORIGIN_Y - 40 * 10, projection)
+    fragment = source.load_fragment(center, 100, projection, 10)
+    np.testing.assert_array_equal(fragment, merged_band[30:51, 50:71])
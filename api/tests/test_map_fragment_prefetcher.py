@@ -0,0 +1,54 @@
+import threading
+import time
+import numpy as np
+from api.src.area_detection.EdgeMapSource import EdgeMapSource
+from api.src.area_detection.MapFragmentPrefetcher import MapFragmentPrefetcher
+from api.src.area_detection.Projection import Projection
+from api.src.area_detection.TileIndex import TileIndex
+
+PATCH_SIZE, SCALE = 255, 10
+
+
+class CountingSource(EdgeMapSource):
+    """ Returns fragments filled with the x coordinate of their center and counts the loaded fragments """
+
+    def __init__(self):
+        self.loaded_centers = []
+
+    def load_fragment(self, center_point, buffer_radius, projection, scale):
+        time.sleep(0.01)
+        center_x, _ = center_point.get_coordinates_meters()
+        self.loaded_centers.append(center_x)
+        return np.full((PATCH_SIZE, PATCH_SIZE), center_x, dtype=np.float32)
+
+
+def count_worker_threads(prefetcher_threads: set) -> int:
+    return sum(thread.is_alive() for thread in prefetcher_threads)
+
+
+def test_threads_stop_after_shutdown():
+    threads_before = set(threading.enumerate())
+    source = CountingSource()
+    tile_index = TileIndex(PATCH_SIZE, SCALE)
+    prefetcher = MapFragmentPrefetcher(source, tile_index, Projection('EPSG:3035'), 1270, SCALE, max_workers=4)
+    corners = np.array([[4000000.0, 3000000.0], [4030000.0, 3030000.0]])
+    prefetcher.prefetch_area(corners)
+    # the first fragment of the area is requested, most of the others are still pending
+    col, row = tile_index.split_pixel_coordinates(tile_index.get_pixel_coordinates(corners))[:, :2].min(axis=0)
+    assert prefetcher.get(col, row)[0, 0] == tile_index.get_tile_center(col, row)[0]
+    workers = set(threading.enumerate()) - threads_before
+    assert len(workers) > 0
+
+    prefetcher.shutdown()
+    deadline = time.time() + 5
+    while count_worker_threads(workers) > 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert count_worker_threads(workers) == 0
+    # pending fragments aren't loaded after the shutdown
+    loaded_number = len(source.loaded_centers)
+    time.sleep(0.1)
+    assert len(source.loaded_centers) == loaded_number < 169
+
+    # fragments are still loaded on demand, in the calling thread
+    assert prefetcher.get(col + 5, row + 5)[0, 0] == tile_index.get_tile_center(col + 5, row + 5)[0]
+    assert set(threading.enumerate()) - threads_before == set()
@@ -0,0 +1,69 @@
+import multiprocessing
+import time
+import cv2
+import numpy as np
+import pytest
+from api.src.path_planning.ParameterSweep import ParameterSweep
+from api.src.path_planning.PathAlgorithm import PathAlgorithm
+
+
+def create_algorithm(travel_time: float) -> PathAlgorithm:
+    # the same configuration as UAVPathPlanner, velocity of 72 km/h
+    return PathAlgorithm(scan_radius=200, scan_accuracy=2, predator_weight=1.5, distance_weight=1.5, turn_weight=0,
+                         resolution=10, velocity=20, travel_time=travel_time, max_workers=2)
+
+
+def find_squares(corners: list, size: int = 800) -> (list, np.array):
+    image = np.zeros((3000, 3000), dtype=np.uint8)
+    for x, y in corners:
+        cv2.rectangle(image, (x, y), (x + size, y + size), 255, -1)
+    return cv2.findContours(image, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+
+
+def create_sweep(algorithm: PathAlgorithm, latency_budget: float) -> ParameterSweep:
+    # the only configuration is the one of the algorithm
+    return ParameterSweep(algorithm, distance_weights=(algorithm.distance_weight,),
+                          turn_weights=(algorithm.turn_weight,), predator_weights=(algorithm.predator_weight,),
+                          starting_directions=(np.pi / 4,), scan_accuracies=(algorithm.scan_accuracy,),
+                          latency_budget=latency_budget, max_workers=2)
+
+
+def test_components_are_planned_the_same_way_as_by_algorithm():
+    contours, hierarchy = find_squares([(100, 100), (2000, 2000)])
+    starting_point = np.array([50.0, 50.0])
+    for travel_time in [20, 60]:
+        algorithm = create_algorithm(travel_time)
+        expected = algorithm.calculate_path(contours, hierarchy, starting_point, np.pi / 4, None)
+        components = algorithm.process_contours(contours, hierarchy)
+        result, parameters = create_sweep(algorithm, 60).plan(components, starting_point, np.pi / 4, None)
+        np.testing.assert_allclose(result[0], expected[0])
+        assert result[3] == pytest.approx(expected[3])
+        assert parameters["scan_accuracy"] == algorithm.scan_accuracy
+
+
+def test_traversal_stops_at_deadline():
+    algorithm = create_algorithm(60)
+    algorithm.deadline = time.time() - 1
+    grid_points = np.stack(np.meshgrid(np.arange(10.0), np.arange(10.0)), axis=2).reshape(-1, 2) * 100
+    with pytest.raises(TimeoutError):
+        algorithm.traverse_the_grid(grid_points, np.zeros(2), np.pi / 4, None)
+
+
+def test_runs_after_budget_are_stopped():
+    contours, hierarchy = find_squares([(100, 100)], 2800)
+    algorithm = create_algorithm(10 ** 4)
+    components = algorithm.process_contours(contours, hierarchy)
+    start = time.perf_counter()
+    algorithm.traverse_the_grid(algorithm.create_grid(*components[0]), np.array([50.0, 50.0]), np.pi / 4, None)
+    run_time = time.perf_counter() - start
+
+    # with a budget shorter than one run only the configuration of the algorithm finishes
+    sweep = ParameterSweep(algorithm, latency_budget=run_time / 4, max_workers=2)
+    start = time.perf_counter()
+    result, parameters = sweep.plan(components, np.array([50.0, 50.0]), np.pi / 4, None)
+    sweep_time = time.perf_counter() - start
+    assert result[0] is not None
+    assert parameters == sweep.get_configurations(np.pi / 4)[0]
+    # other runs are stopped instead of being planned to the end in the background
+    assert multiprocessing.active_children() == []
+    assert sweep_time < 3 * run_time + 2
@@ -0,0 +1,75 @@
+import cv2
+import numpy as np
+from scipy.spatial import cKDTree
+from api.src.path_planning.BoustrophedonAlgorithm import BoustrophedonAlgorithm
+from api.src.path_planning.PathPlanner import PathPlanner
+from api.src.path_planning.TourRefiner import TourRefiner
+
+
+def create_tour(points_number: int, seed: int = 0) -> np.array:
+    """ Returns tour from the origin over a jittered grid in random order and back """
+    rng = np.random.default_rng(seed)
+    side = int(np.ceil(np.sqrt(points_number)))
+    grid = np.stack(np.meshgrid(np.arange(side), np.arange(side)), axis=2).reshape(-1, 2)[:points_number] * 100.0
+    grid += rng.normal(0, 10, grid.shape)
+    return np.concatenate([[[0.0, 0.0]], rng.permutation(grid), [[0.0, 0.0]]])
+
+
+def get_length(path: np.array) -> float:
+    return np.linalg.norm(np.diff(path, axis=0), axis=1).sum()
+
+
+def find_neighbours(path: np.array, tour_refiner: TourRefiner) -> np.array:
+    return cKDTree(path).query(path, tour_refiner.neighbours_number + 1)[1][:, 1:]
+
+
+def test_refined_tour_visits_the_same_waypoints():
+    path = create_tour(500)
+    tour_refiner = TourRefiner(time_budget=60)
+    refined = tour_refiner.refine(path)
+    np.testing.assert_array_equal(refined[[0, -1]], path[[0, -1]])
+    np.testing.assert_array_equal(np.unique(refined, axis=0), np.unique(path, axis=0))
+    # gains of the moves applied in the same scan add up to the saved length
+    np.testing.assert_allclose(get_length(path) - get_length(refined), tour_refiner.get_saved_length())
+    assert get_length(refined) < 0.5 * get_length(path)
+
+
+def test_refined_tour_has_no_improving_moves():
+    tour_refiner = TourRefiner(time_budget=60)
+    refined = tour_refiner.refine(create_tour(500, seed=1))
+    tour = np.arange(len(refined))
+    neighbours = find_neighbours(refined, tour_refiner)
+    assert tour_refiner.find_two_opt(refined, tour, tour, neighbours)[0].size == 0
+    assert tour_refiner.find_or_opt(refined, tour, tour, neighbours)[0].size == 0
+
+
+def test_several_moves_are_applied_in_one_scan():
+    path = create_tour(2000, seed=2)
+    tour_refiner = TourRefiner()
+    tour = np.arange(len(path))
+    gains, first, last = tour_refiner.find_two_opt(path, tour, tour, find_neighbours(path, tour_refiner))
+    spans = np.stack([first - 1, last + 1], axis=1)
+    selected = tour_refiner.select_moves(gains, spans)
+    assert len(selected) > 1
+    assert selected[0] == np.argmax(gains)
+    # selected spans only share their ends
+    ordered = spans[selected][np.argsort(spans[selected][:, 0])]
+    assert np.all(ordered[1:, 0] >= ordered[:-1, 1])
+
+
+def test_lanes_of_boustrophedon_path_are_kept():
+    image = np.zeros((1200, 1200), dtype=np.uint8)
+    cv2.rectangle(image, (100, 100), (1100, 1100), 255, -1)
+    cv2.rectangle(image, (450, 450), (750, 750), 0, -1)
+    contours, hierarchy = cv2.findContours(image, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    path_planner = PathPlanner()
+    path_planner.algorithm = BoustrophedonAlgorithm(scan_radius=100, resolution=10, travel_time=10 ** 4, velocity=20)
+    path_planner.starting_point, path_planner.starting_direction = np.array([50.0, 50.0]), np.pi / 4
+    path_planner._path, path_planner._directions, path_planner._turns, path_planner.time_travelled = \
+        path_planner.algorithm.calculate_path(contours, hierarchy, path_planner.starting_point, np.pi / 4, None)
+    path = path_planner._path.copy()
+    # lanes are the longest segments of the path, so TourRefiner alone would replace them
+    assert get_length(TourRefiner(time_budget=5).refine(path)) < get_length(path)
+    path_planner.refine_path(5)
+    np.testing.assert_array_equal(path_planner._path, path)
+    assert path_planner.saved_length == 0
@@ -2,4 +2,9 @@ export default interface ApiResponse {
   path: google.maps.LatLngLiteral[];
   area: google.maps.LatLngLiteral[];
   time_travelled: number;
+  vertices?: { before: number; after: number };
+  length_saved?: number;
+  grid_angles?: number[];
+  sweep?: { best: Record<string, number>; table: Record<string, number>[] | null };
+  vehicles?: { path: google.maps.LatLngLiteral[]; time_travelled: number }[];
 }